@@ -0,0 +1,167 @@
+"""
+Conditional GET (ETag / Last-Modified) support for read-only API views.
+
+Validators are derived from a single aggregate over the rows that make up the
+response: the latest ``updated_at`` and the row count, so edits, inserts and
+deletes all change the ETag. Page-number lists aggregate the whole filtered
+set, as their count does; paginators with a get_window_queryset() (keyset
+pagination) narrow it to the rows of the requested page, so a deep cursor
+page costs the same as the first. When the client's If-None-Match or
+If-Modified-Since matches, the view answers 304 Not Modified before running
+its handler, so nothing is serialized.
+
+Lists (list() and conditional_action()) send only the ETag: a row deleted
+from, or filtered out of, a list does not move its latest updated_at, so
+If-Modified-Since alone would answer 304 for a stale list. Responses that
+also depend on the requesting user mix a per-user value into the ETag and
+send no Last-Modified either.
+
+The validators' digest, without the per-user part, is kept on the view as
+``conditional_digest`` before the handler runs; a response cache keys its
+entries by it (see questions.cache), so a cached body is only ever served,
+and approved by a 304, under validators computed from the same rows.
+"""
+
+import functools
+import hashlib
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+Validators = namedtuple('Validators', ['etag', 'last_modified', 'row_count', 'digest'])
+
+
+def compute_validators(request, queryset, aggregates=None, timestamp_field='updated_at', vary=()):
+    """
+    Return the Validators (etag, last_modified, row_count, digest) for ``queryset``.
+
+    ``aggregates`` adds extra aggregate expressions (e.g. the latest
+    ``updated_at`` of joined rows the serializer reads); every datetime result
+    counts towards Last-Modified. ``vary`` values are mixed into the ETag only,
+    so ``digest`` is the same for every user.
+    """
+    values = queryset.order_by().aggregate(
+        _last_modified=Max(timestamp_field),
+        _count=Count('pk', distinct=True),
+        **(aggregates or {}),
+    )
+
+    timestamps = [
+        value for value in values.values()
+        if hasattr(value, 'timestamp')
+    ]
+    last_modified = int(max(timestamps).timestamp()) if timestamps else None
+
+    renderer = getattr(request, 'accepted_renderer', None)
+    digest = hashlib.sha1(repr((
+        request.path,
+        sorted(request.query_params.lists()),
+        getattr(renderer, 'format', None),
+        sorted((key, str(value)) for key, value in values.items()),
+    )).encode()).hexdigest()
+    etag = hashlib.sha1(repr((digest, vary)).encode()).hexdigest() if vary else digest
+    return Validators(f'W/"{etag}"', last_modified, values['_count'], digest)
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified validators to list() and retrieve(), answering
+    304 Not Modified when the client's copy is current. Custom actions can use
+    conditional_response() with their own queryset (or a callable returning one).
+    """
+    conditional_timestamp_field = 'updated_at'
+    conditional_digest = None
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        # Keyset pages are validated by the rows they read, not the whole filtered set
+        get_window_queryset = getattr(self.paginator, 'get_window_queryset', None)
+        if get_window_queryset is not None:
+            queryset = get_window_queryset(queryset, self.request, self)
+        return queryset
+
+    def get_conditional_aggregates(self):
+        return {}
+
+    def use_conditional_get(self, request):
+        """Views whose responses depend on more than the queryset can opt out per request"""
+        return True
+
+    def get_conditional_vary(self, request):
+        """
+        Values outside the queryset the response depends on (e.g. the
+        requesting user's state), or () for none
+        """
+        return ()
+
+    def conditional_response(self, handler, request, *args, queryset=None, aggregates=None,
+                             require_rows=False, send_last_modified=True, **kwargs):
+        if request.method not in ('GET', 'HEAD') or not self.use_conditional_get(request):
+            return handler(request, *args, **kwargs)
+
+        if aggregates is None:
+            aggregates = self.get_conditional_aggregates()
+
+        try:
+            if queryset is None:
+                queryset = self.get_conditional_queryset()
+            elif callable(queryset):
+                queryset = queryset()
+            vary = self.get_conditional_vary(request)
+            etag, last_modified, row_count, self.conditional_digest = compute_validators(
+                request, queryset, aggregates, self.conditional_timestamp_field, vary
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup values; the handler reports them as usual
+            return handler(request, *args, **kwargs)
+        if require_rows and row_count == 0:
+            # Let the handler produce its 404
+            return handler(request, *args, **kwargs)
+        if vary or not send_last_modified:
+            # The queryset's timestamps do not cover the varying values or removed rows
+            last_modified = None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, send_last_modified=False, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, require_rows=True, **kwargs
+        )
+
+
+def conditional_action(get_queryset, aggregates=None):
+    """
+    Decorator adding conditional GET to a ConditionalGetMixin view action
+    returning a list (validated by ETag only, see above).
+    ``get_queryset(view, **kwargs)`` returns the rows the action serializes.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            return self.conditional_response(
+                functools.partial(method, self), request, *args,
+                queryset=lambda: get_queryset(self, **kwargs),
+                aggregates=aggregates or {},
+                send_last_modified=False,
+                **kwargs
+            )
+        return wrapper
+    return decorator
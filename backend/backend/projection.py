@@ -0,0 +1,151 @@
+"""
+Fast serialization for hot list endpoints.
+
+A Projection reads a ModelSerializer's fields once and compiles each of them
+into a mapper over ``.values()`` rows, so no model instances are built and no
+per-field get_attribute() / to_representation() dispatch happens per row:
+
+- columns the serializer field passes through unchanged (text, choices,
+  integers, booleans, primary keys) are copied straight from the row;
+- columns the field reformats (dates, decimals, floats) go through that
+  field's to_representation();
+- anything else comes from the serializer's Meta.projection_annotations
+  (queryset expressions, e.g. counts) or Meta.projection_computed
+  (``name: (function(row), [value paths it reads])``).
+
+Rendered output is identical to the serializer's. Fields that cannot be
+projected raise ImproperlyConfigured when the projection is compiled.
+"""
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose to_representation() returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.ChoiceField,
+    serializers.EmailField, serializers.IntegerField, serializers.PrimaryKeyRelatedField,
+    serializers.SlugField, serializers.URLField,
+)
+
+_projections = {}
+
+
+def _column(path, convert=None):
+    if convert is None:
+        return lambda row: row[path]
+
+    def mapper(row):
+        value = row[path]
+        return None if value is None else convert(value)
+    return mapper
+
+
+class Projection:
+    """Compiled mapping from ``.values()`` rows to a serializer's output"""
+
+    def __init__(self, serializer):
+        meta = serializer.Meta
+        annotations = getattr(meta, 'projection_annotations', {})
+        computed = getattr(meta, 'projection_computed', {})
+
+        self.annotations = {}
+        self.columns = []
+        self.mappers = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in computed:
+                function, paths = computed[name]
+                self.columns.extend(paths)
+                self.mappers.append((name, function))
+            elif name in annotations:
+                self.annotations[name] = annotations[name]
+                self.mappers.append((name, _column(name)))
+            else:
+                path = self._resolve(meta.model, name, field)
+                self.columns.append(path)
+                convert = None if type(field) in PASSTHROUGH_FIELDS else field.to_representation
+                self.mappers.append((name, _column(path, convert)))
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """Return the (cached) projection for a serializer instance's fields"""
+        key = (type(serializer), tuple(serializer.fields))
+        projection = _projections.get(key)
+        if projection is None:
+            projection = _projections[key] = cls(serializer)
+        return projection
+
+    def _resolve(self, model, name, field):
+        """Map a serializer field's source to a ``.values()`` path"""
+        error = ImproperlyConfigured(
+            f'{model.__name__} field "{name}" cannot be projected; add it to '
+            'Meta.projection_annotations or Meta.projection_computed.'
+        )
+        if field.source == '*' or isinstance(field, serializers.BaseSerializer):
+            raise error
+
+        *relations, attr = field.source_attrs
+        try:
+            for relation in relations:
+                model_field = model._meta.get_field(relation)
+                # A null relation makes DRF skip the field, which rows can't express
+                if not (model_field.many_to_one or model_field.one_to_one) or model_field.null:
+                    raise error
+                model = model_field.related_model
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise error
+
+        if not model_field.concrete:
+            raise error
+        if model_field.is_relation and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            raise error
+        return '__'.join(field.source_attrs)
+
+    def values(self, queryset, *extra):
+        """
+        ``queryset`` as ``.values()`` rows carrying every projected column,
+        existing annotations (e.g. ordering keys) and ``extra`` paths.
+        """
+        if self.annotations:
+            # Aggregate annotations make Django drop Meta.ordering; keep it explicitly
+            if not queryset.query.order_by and queryset.query.default_ordering:
+                queryset = queryset.order_by(*queryset.model._meta.ordering)
+            queryset = queryset.annotate(**self.annotations)
+        names = dict.fromkeys([*self.columns, *queryset.query.annotations, *extra])
+        return queryset.values(*names)
+
+    def to_representation(self, rows):
+        mappers = self.mappers
+        return [{name: mapper(row) for name, mapper in mappers} for row in rows]
+
+    def iter_representation(self, rows):
+        """Lazy to_representation() for streamed rows"""
+        mappers = self.mappers
+        for row in rows:
+            yield {name: mapper(row) for name, mapper in mappers}
+
+    def serialize(self, queryset):
+        return self.to_representation(self.values(queryset))
+
+
+class ProjectionListMixin:
+    """
+    Serves list() through a Projection of the view's serializer.
+    ``projection_extra_values`` lists row values read outside the serializer
+    (e.g. cursor pagination keys).
+    """
+    projection_extra_values = ()
+
+    def list(self, request, *args, **kwargs):
+        projection = Projection.for_serializer(self.get_serializer())
+        queryset = projection.values(
+            self.filter_queryset(self.get_queryset()), *self.projection_extra_values
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.to_representation(page))
+        return Response(projection.to_representation(queryset))
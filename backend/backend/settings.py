@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -39,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party apps
     'rest_framework',
@@ -55,7 +57,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'questions.snapshots.SnapshotWhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -109,6 +111,35 @@ if 'test' in sys.argv or 'test_coverage' in sys.argv:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Question response caching keeps its invalidation counters and rebuild locks
+# in the cache, and the web workers and the commands writing questions
+# (flush_question_stats, import_json) must all see them, so the cache has to
+# be shared between processes. The default is the database cache (create its
+# table with ``python manage.py createcachetable``, which the start commands
+# run); django.core.cache.backends.redis.RedisCache works too.
+
+PER_PROCESS_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+)
+
+CACHE_BACKEND = config('CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache')
+if CACHE_BACKEND in PER_PROCESS_CACHE_BACKENDS:
+    raise ImproperlyConfigured(f'CACHE_BACKEND must be shared between processes, not {CACHE_BACKEND}')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': config('CACHE_LOCATION', default='django_cache'),
+    }
+}
+
+# Seconds a cached question response may be served before it is rebuilt
+QUESTIONS_CACHE_TIMEOUT = config('QUESTIONS_CACHE_TIMEOUT', default=300, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -146,6 +177,10 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Offline question-bank snapshots (python manage.py build_question_snapshot)
+QUESTION_SNAPSHOT_ROOT = config('QUESTION_SNAPSHOT_ROOT', default=str(BASE_DIR / 'snapshots'))
+QUESTION_SNAPSHOT_URL = '/snapshots/questions/'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -13,6 +13,14 @@ DATABASES = {
     }
 }
 
+# Tests run in one process, so a per-process cache is shared enough
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'scibowl-org-tests',
+    }
+}
+
 # Disable password validators for faster tests
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -1,6 +1,10 @@
 from django.contrib import admin
 from django import forms
-from .models import Question, UserQuestionHistory, Bookmark
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
+from .dedup import DEFAULT_THRESHOLD, near_duplicate_clusters
+from .models import Question, UserQuestionHistory, UserQuestionSummary, Bookmark, ReviewState, UserCategoryRating
 
 
 class QuestionAdminForm(forms.ModelForm):
@@ -99,9 +103,48 @@ class QuestionAdmin(admin.ModelAdmin):
             '''
         }),
         ('Metadata', {
-            'fields': ('source', 'times_answered', 'times_correct')
+            'fields': ('source', 'times_answered', 'times_correct', 'rating', 'difficulty', 'discrimination')
         }),
     )
+    readonly_fields = ['rating', 'difficulty', 'discrimination']
+
+    def get_urls(self):
+        return [
+            path(
+                'near-duplicates/',
+                self.admin_site.admin_view(self.near_duplicates_view),
+                name='questions_question_near_duplicates',
+            ),
+        ] + super().get_urls()
+
+    def near_duplicates_view(self, request):
+        """Clusters of near-duplicate questions from the LSH index (see questions.dedup)"""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            threshold = float(request.GET.get('threshold', DEFAULT_THRESHOLD))
+        except ValueError:
+            threshold = DEFAULT_THRESHOLD
+        threshold = min(max(threshold, 0.05), 1.0)
+
+        clusters = near_duplicate_clusters(threshold)
+        questions = Question.objects.in_bulk(
+            [pk for cluster in clusters for pk in cluster['question_ids']]
+        )
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Near-duplicate questions',
+            'threshold': threshold,
+            'clusters': [
+                {
+                    'similarity': cluster['similarity'],
+                    'questions': [questions[pk] for pk in cluster['question_ids']],
+                }
+                for cluster in clusters
+            ],
+        }
+        return TemplateResponse(request, 'admin/questions/question/near_duplicates.html', context)
 
 
 @admin.register(UserQuestionHistory)
@@ -113,6 +156,14 @@ class UserQuestionHistoryAdmin(admin.ModelAdmin):
     readonly_fields = ['answered_at']
 
 
+@admin.register(UserQuestionSummary)
+class UserQuestionSummaryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'question', 'attempts', 'correct', 'last_answered_at']
+    search_fields = ['user__username', 'question__question_text']
+    ordering = ['-last_answered_at']
+    readonly_fields = ['first_answered_at', 'first_is_correct', 'last_answered_at']
+
+
 @admin.register(Bookmark)
 class BookmarkAdmin(admin.ModelAdmin):
     list_display = ['user', 'question', 'created_at']
@@ -120,3 +171,21 @@ class BookmarkAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'question__question_text', 'notes']
     ordering = ['-created_at']
     readonly_fields = ['created_at']
+
+
+@admin.register(ReviewState)
+class ReviewStateAdmin(admin.ModelAdmin):
+    list_display = ['user', 'question', 'due_at', 'interval_days', 'repetitions', 'ease_factor', 'lapses']
+    list_filter = ['due_at']
+    search_fields = ['user__username', 'question__question_text']
+    ordering = ['due_at']
+    readonly_fields = ['last_reviewed_at']
+
+
+@admin.register(UserCategoryRating)
+class UserCategoryRatingAdmin(admin.ModelAdmin):
+    list_display = ['user', 'category', 'rating', 'attempts', 'updated_at']
+    list_filter = ['category']
+    search_fields = ['user__username']
+    ordering = ['-rating']
+    readonly_fields = ['updated_at']
@@ -0,0 +1,173 @@
+"""
+Server-side response caching for question reads.
+
+Cache keys embed a question generation counter. Any write to a question (or
+an import) bumps the counter, so every cached response becomes unreachable at
+once without having to enumerate keys. Stat-only saves from the answer path
+bump a per-question version instead, which only the detail view depends on.
+
+Views that also validate requests with backend.conditional key their
+entries by the validators' digest as well, so a cached body always matches
+the rows it was validated against, whichever process wrote them. The
+counters only reach other processes through a shared cache backend, which
+settings require outside DEBUG.
+
+Rebuilding a missing key is guarded by a short-lived lock so that only one
+worker runs the query while the others wait for its result.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+GENERATION_KEY = 'questions:generation'
+QUESTION_VERSION_KEY = 'questions:version:{pk}'
+
+# How long a worker may hold the rebuild lock, and how long others wait for it
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _initial_counter():
+    # Never restart at a small number after eviction, or old keys could match again
+    return time.time_ns()
+
+
+def _get_counter(key):
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, _initial_counter(), None)
+        value = cache.get(key)
+    return value
+
+
+def _bump_counter(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_counter(), None)
+
+
+def get_question_generation():
+    """Return the current question generation"""
+    return _get_counter(GENERATION_KEY)
+
+
+def bump_question_generation():
+    """Invalidate every cached question response"""
+    _bump_counter(GENERATION_KEY)
+
+
+def invalidate_question_caches():
+    """
+    Bump the generation now and again once the surrounding transaction
+    commits, so a reader cannot cache pre-commit data under the new generation.
+    """
+    bump_question_generation()
+    transaction.on_commit(bump_question_generation)
+
+
+def get_question_version(pk):
+    return _get_counter(QUESTION_VERSION_KEY.format(pk=pk))
+
+
+def bump_question_version(pk):
+    """Invalidate cached responses for a single question"""
+    _bump_counter(QUESTION_VERSION_KEY.format(pk=pk))
+
+
+def get_or_build(key, build, timeout=None):
+    """
+    Return the cached value for ``key``, calling ``build`` to compute and
+    store it on a miss. Concurrent misses wait for the worker holding the
+    rebuild lock instead of all running ``build``.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    if timeout is None:
+        timeout = settings.QUESTIONS_CACHE_TIMEOUT
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = build()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    # The lock holder is too slow (or died); serve this request uncached
+    return build()
+
+
+def normalize_query_params(query_params):
+    """Stable representation of query params, ignoring order and empty values"""
+    return sorted(
+        (key, values)
+        for key, values in (
+            (key, [v for v in query_params.getlist(key) if v != ''])
+            for key in query_params
+        )
+        if values
+    )
+
+
+class CachedResponseMixin:
+    """
+    Caches the serialized data of list() and retrieve() responses.
+    Keys cover the host, path and normalized query params, plus the
+    conditional GET digest when a ConditionalGetMixin ahead of this one
+    computed it for the request.
+    """
+    cache_prefix = 'questions:response'
+
+    def should_cache_response(self, request):
+        return request.method == 'GET'
+
+    def get_cache_versions(self):
+        versions = [get_question_generation()]
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        if lookup is not None:
+            versions.append(get_question_version(lookup))
+        digest = getattr(self, 'conditional_digest', None)
+        if digest is not None:
+            versions.append(digest)
+        return versions
+
+    def get_response_cache_key(self, request):
+        digest = hashlib.sha1(repr((
+            request.get_host(),
+            request.path,
+            normalize_query_params(request.query_params),
+        )).encode()).hexdigest()
+        versions = ':'.join(str(v) for v in self.get_cache_versions())
+        return f'{self.cache_prefix}:{versions}:{digest}'
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if not self.should_cache_response(request):
+            return handler(request, *args, **kwargs)
+        data = get_or_build(
+            self.get_response_cache_key(request),
+            lambda: handler(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,136 @@
+"""
+Change feed for clients that keep a local copy of the question bank.
+
+Questions are read in (updated_at, id) order and deletions from the
+tombstone table in (deleted_at, id) order; both walks are keyset scans over
+an index and the two streams are merged by time. The opaque ``since`` token
+holds the position reached in each stream.
+
+Rows are held back until every transaction that could still commit one
+with an earlier timestamp has finished: updated_at is set when a row is
+written, not when its transaction commits, so a newer timestamp can become
+visible after an older one, and a token that had moved past it would skip
+the older row for good. On PostgreSQL the cutoff is the start of the oldest
+open transaction that has written anything (from pg_stat_activity), so a
+long import_json run holds the feed back until it commits. SETTLE_SECONDS
+is subtracted on top, for clock differences between the application
+servers stamping updated_at and the database; on other databases it is the
+whole window, which then has to outlast the longest write transaction.
+"""
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from backend.projection import Projection
+from .models import Question, QuestionTombstone
+from .serializers import QuestionListSerializer
+
+SETTLE_SECONDS = 5
+DEFAULT_LIMIT = 500
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def encode_token(position):
+    """Opaque token for ``(question_time, question_id, tombstone_time, tombstone_id)``"""
+    question_time, question_id, tombstone_time, tombstone_id = position
+    data = json.dumps([question_time.isoformat(), question_id, tombstone_time.isoformat(), tombstone_id])
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_token(token):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        question_time, question_id, tombstone_time, tombstone_id = data
+        return (
+            datetime.fromisoformat(question_time), int(question_id),
+            datetime.fromisoformat(tombstone_time), int(tombstone_id),
+        )
+    except (TypeError, ValueError):
+        raise InvalidToken(token)
+
+
+def _after(time_field, time, pk):
+    return Q(**{f'{time_field}__gt': time}) | Q(**{time_field: time, 'id__gt': pk})
+
+
+def oldest_write_start():
+    """
+    Start of the oldest other open transaction that has written, on
+    PostgreSQL; None elsewhere or when there is none. Only sessions of the
+    application's own database role are visible without pg_read_all_stats.
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT min(xact_start) FROM pg_stat_activity '
+            'WHERE backend_xid IS NOT NULL AND pid <> pg_backend_pid()'
+        )
+        return cursor.fetchone()[0]
+
+
+def settled_before():
+    """Rows timestamped at or before this have committed (or never will)"""
+    settled = timezone.now()
+    oldest = oldest_write_start()
+    if oldest is not None:
+        settled = min(settled, oldest)
+    return settled - timedelta(seconds=SETTLE_SECONDS)
+
+
+def get_changes(since=None, limit=DEFAULT_LIMIT):
+    """
+    Return ``(changes, next_token, has_more)`` for changes after ``since``
+    (None for a full sync). Each change is
+    ``{'type': 'created' | 'updated', 'id', 'question'}`` or
+    ``{'type': 'deleted', 'id'}``.
+    """
+    if since is None:
+        # A full sync has no use for earlier deletions
+        latest = QuestionTombstone.objects.order_by('-deleted_at', '-id').values_list('deleted_at', 'id').first()
+        position = (EPOCH, 0, *(latest or (EPOCH, 0)))
+    else:
+        position = decode_token(since)
+    question_time, question_id, tombstone_time, tombstone_id = position
+    settled = settled_before()
+
+    projection = Projection.for_serializer(QuestionListSerializer())
+    questions = projection.values(
+        Question.objects.filter(_after('updated_at', question_time, question_id), updated_at__lte=settled)
+        .order_by('updated_at', 'id'),
+        'created_at', 'updated_at',
+    )[:limit + 1]
+    tombstones = QuestionTombstone.objects.filter(
+        _after('deleted_at', tombstone_time, tombstone_id), deleted_at__lte=settled
+    ).order_by('deleted_at', 'id').values_list('deleted_at', 'id', 'question_id')[:limit + 1]
+
+    events = [(row['updated_at'], 0, row['id'], row) for row in questions]
+    events += [(deleted_at, 1, pk, question_pk) for deleted_at, pk, question_pk in tombstones]
+    events.sort(key=lambda event: event[:3])
+    has_more = len(events) > limit
+
+    changes = []
+    for time, kind, pk, value in events[:limit]:
+        if kind == 0:
+            question_time, question_id = time, pk
+            changes.append({
+                'type': 'created' if value['created_at'] > position[0] else 'updated',
+                'id': pk,
+                'question': projection.to_representation([value])[0],
+            })
+        else:
+            tombstone_time, tombstone_id = time, pk
+            changes.append({'type': 'deleted', 'id': value})
+
+    next_token = encode_token((question_time, question_id, tombstone_time, tombstone_id))
+    return changes, next_token, has_more
@@ -0,0 +1,97 @@
+"""
+Contention-free question answer counters.
+
+Recording an answer appends a QuestionStatDelta row instead of updating the
+question: inserts never block each other, whereas every answer to a popular
+question used to queue on its row lock (and a read-modify-write save could
+lose concurrent increments). flush_stat_deltas() later folds pending deltas
+into Question's times_answered, times_correct and rating, one UPDATE per
+batch, so reading accuracy_rate stays a plain column read.
+
+Run ``python manage.py flush_question_stats --loop`` as a background worker
+(or flush from a scheduled job); counters lag by at most one interval.
+"""
+
+import functools
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.utils import timezone
+
+from .cache import bump_question_version
+from .models import Question, QuestionStatDelta
+
+FLUSH_BATCH_SIZE = 2000
+
+
+def add_stat_deltas(histories, rating_changes=None):
+    """Queue the counter changes for new UserQuestionHistory rows, one delta per question"""
+    rating_changes = rating_changes or {}
+    deltas = {}
+    for history in histories:
+        delta = deltas.setdefault(history.question_id, QuestionStatDelta(
+            question_id=history.question_id,
+            answered=0,
+            correct=0,
+            rating_change=rating_changes.get(history.question_id, 0.0),
+        ))
+        delta.answered += 1
+        delta.correct += int(history.is_correct)
+    return QuestionStatDelta.objects.bulk_create(deltas.values())
+
+
+def _increment(field, totals, output_field):
+    return F(field) + Case(
+        *(When(pk=pk, then=Value(total)) for pk, total in totals.items()),
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+def _bump_versions(question_ids):
+    for pk in question_ids:
+        bump_question_version(pk)
+
+
+def flush_stat_deltas(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Apply pending deltas to their questions and delete them.
+    Returns the number of deltas applied.
+
+    Each batch claims its rows with SKIP LOCKED, so concurrent flushers split
+    the backlog instead of applying it twice.
+    """
+    flushed = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                QuestionStatDelta.objects.select_for_update(skip_locked=True)
+                .order_by('id')
+                .values_list('id', 'question_id', 'answered', 'correct', 'rating_change')[:batch_size]
+            )
+            if not rows:
+                return flushed
+
+            answered, correct, rating = defaultdict(int), defaultdict(int), defaultdict(float)
+            for _, question_id, delta_answered, delta_correct, rating_change in rows:
+                answered[question_id] += delta_answered
+                correct[question_id] += delta_correct
+                rating[question_id] += rating_change
+
+            Question.objects.filter(pk__in=answered).update(
+                times_answered=_increment('times_answered', answered, IntegerField()),
+                times_correct=_increment('times_correct', correct, IntegerField()),
+                rating=_increment('rating', rating, FloatField()),
+                # Not updated_at: counter folds must not show in the change feed or list ETags
+                stats_updated_at=timezone.now(),
+            )
+            QuestionStatDelta.objects.filter(id__in=[row[0] for row in rows]).delete()
+
+            # Again after commit, so a reader cannot cache pre-commit counters
+            _bump_versions(answered)
+            transaction.on_commit(functools.partial(_bump_versions, list(answered)))
+
+        flushed += len(rows)
+        if len(rows) < batch_size:
+            return flushed
@@ -0,0 +1,232 @@
+"""
+Near-duplicate question detection with MinHash and locality-sensitive hashing.
+
+Each question's text and options are split into word shingles and reduced to
+a MinHash signature of NUM_PERM values; the fraction of positions two
+signatures agree on estimates the Jaccard similarity of their shingle sets.
+Signatures are cut into NUM_BANDS bands of ROWS_PER_BAND values and every
+band is hashed into a bucket. Questions sharing any bucket are candidates,
+so finding duplicates never compares all pairs: with 20 bands of 6 rows a
+pair at Jaccard 0.8 shares a bucket with probability > 0.99, one at 0.3
+with probability < 0.02.
+
+Signatures and buckets are kept up to date by the question post_save
+signal; ``python manage.py find_duplicates --rebuild`` recomputes them all.
+"""
+
+import hashlib
+import random
+import re
+import struct
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+
+from .models import Question, QuestionLSHBucket, QuestionSignature
+
+NUM_BANDS = 20
+ROWS_PER_BAND = 6
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+SHINGLE_SIZE = 3
+
+DEFAULT_THRESHOLD = 0.8
+
+# Fields making up a question's text, as read by index_questions()
+DOCUMENT_FIELDS = ['question_text', 'option_1', 'option_2', 'option_3', 'option_4']
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+# Universal hashing a * x + b mod a Mersenne prime; seeded so signatures are stable
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5CB0)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(NUM_PERM)]
+_PACK = struct.Struct(f'>{NUM_PERM}Q')
+
+
+def question_document(question_text, *options):
+    """The text compared for near-duplicates: question text and options"""
+    return ' '.join(part for part in (question_text, *options) if part)
+
+
+def shingles(text):
+    """Word SHINGLE_SIZE-grams of normalized ``text`` (the whole text if shorter)"""
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def minhash(text):
+    """MinHash signature of ``text`` as a tuple of NUM_PERM ints, or None if it has no words"""
+    hashes = [_hash64(shingle.encode()) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def band_buckets(signature):
+    """Yield ``(band, bucket)`` for each band of ``signature``"""
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        data = struct.pack(f'>{ROWS_PER_BAND}Q', *rows)
+        # Signed so it fits a BigIntegerField
+        yield band, int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def pack_signature(signature):
+    return _PACK.pack(*signature)
+
+
+def unpack_signature(data):
+    return _PACK.unpack(bytes(data))
+
+
+def _index_rows(question_id, signature):
+    return (
+        QuestionSignature(question_id=question_id, minhash=pack_signature(signature)),
+        [QuestionLSHBucket(question_id=question_id, band=band, bucket=bucket)
+         for band, bucket in band_buckets(signature)],
+    )
+
+
+def index_question(question):
+    """Recompute the signature and buckets of a saved question"""
+    signature = minhash(question_document(*(getattr(question, field) for field in DOCUMENT_FIELDS)))
+    with transaction.atomic():
+        QuestionLSHBucket.objects.filter(question_id=question.pk).delete()
+        QuestionSignature.objects.filter(question_id=question.pk).delete()
+        if signature is not None:
+            row, buckets = _index_rows(question.pk, signature)
+            row.save(force_insert=True)
+            QuestionLSHBucket.objects.bulk_create(buckets)
+
+
+def index_questions(queryset=None, batch_size=500):
+    """Rebuild signatures and buckets for ``queryset`` (all questions by default)"""
+    if queryset is None:
+        queryset = Question.objects.all()
+    indexed = 0
+    with transaction.atomic():
+        QuestionLSHBucket.objects.filter(question__in=queryset).delete()
+        QuestionSignature.objects.filter(question__in=queryset).delete()
+
+        signatures, buckets = [], []
+        rows = queryset.order_by('pk').values_list('pk', *DOCUMENT_FIELDS)
+        for pk, *document in rows.iterator(chunk_size=batch_size):
+            signature = minhash(question_document(*document))
+            if signature is None:
+                continue
+            row, question_buckets = _index_rows(pk, signature)
+            signatures.append(row)
+            buckets.extend(question_buckets)
+            if len(signatures) >= batch_size:
+                QuestionSignature.objects.bulk_create(signatures)
+                QuestionLSHBucket.objects.bulk_create(buckets)
+                indexed += len(signatures)
+                signatures, buckets = [], []
+
+        QuestionSignature.objects.bulk_create(signatures)
+        QuestionLSHBucket.objects.bulk_create(buckets)
+        indexed += len(signatures)
+    return indexed
+
+
+def _signatures(question_ids):
+    return {
+        pk: unpack_signature(data)
+        for pk, data in QuestionSignature.objects.filter(question_id__in=question_ids)
+        .values_list('question_id', 'minhash')
+    }
+
+
+def find_similar(text, threshold=DEFAULT_THRESHOLD, exclude=None):
+    """
+    Return ``[(question_id, similarity)]`` for indexed questions whose
+    estimated similarity to ``text`` is at least ``threshold``, most similar first.
+    """
+    signature = minhash(text)
+    if signature is None:
+        return []
+
+    in_any_bucket = Q()
+    for band, bucket in band_buckets(signature):
+        in_any_bucket |= Q(band=band, bucket=bucket)
+    candidates = QuestionLSHBucket.objects.filter(in_any_bucket)
+    if exclude is not None:
+        candidates = candidates.exclude(question_id=exclude)
+
+    matches = [
+        (pk, similarity(signature, other))
+        for pk, other in _signatures(candidates.values('question_id')).items()
+    ]
+    return sorted(
+        (match for match in matches if match[1] >= threshold),
+        key=lambda match: (-match[1], match[0]),
+    )
+
+
+def near_duplicate_clusters(threshold=DEFAULT_THRESHOLD):
+    """
+    Group indexed questions into clusters of near-duplicates.
+
+    Returns a list of ``{'question_ids': [...], 'similarity': s}`` (s being
+    the lowest similarity among the pairs joining the cluster), largest first.
+    Only questions sharing a bucket with another question are read.
+    """
+    shared = QuestionLSHBucket.objects.filter(
+        Exists(
+            QuestionLSHBucket.objects.filter(band=OuterRef('band'), bucket=OuterRef('bucket'))
+            .exclude(question_id=OuterRef('question_id'))
+        )
+    ).order_by('band', 'bucket', 'question_id').values_list('band', 'bucket', 'question_id')
+
+    pairs = set()
+    current, members = None, []
+    for band, bucket, question_id in shared.iterator():
+        if (band, bucket) != current:
+            current, members = (band, bucket), []
+        pairs.update((other, question_id) for other in members)
+        members.append(question_id)
+
+    signatures = _signatures({pk for pair in pairs for pk in pair})
+    scored = [(a, b, similarity(signatures[a], signatures[b])) for a, b in pairs]
+    joined = [(a, b, score) for a, b, score in scored if score >= threshold]
+
+    parent = {}
+
+    def find(pk):
+        parent.setdefault(pk, pk)
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    for a, b, _ in joined:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    lowest = {}
+    for a, _, score in joined:
+        root = find(a)
+        lowest[root] = min(score, lowest.get(root, 1.0))
+
+    clusters = {}
+    for pk in parent:
+        clusters.setdefault(find(pk), []).append(pk)
+    return sorted(
+        (
+            {'question_ids': sorted(ids), 'similarity': lowest[root]}
+            for root, ids in clusters.items()
+        ),
+        key=lambda cluster: (-len(cluster['question_ids']), cluster['question_ids'][0]),
+    )
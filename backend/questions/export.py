@@ -0,0 +1,51 @@
+"""
+Newline-delimited JSON export of the question bank.
+
+Rows are streamed from ``.values().iterator()`` through the question list
+projection (see backend.projection), so memory use stays flat however large
+the bank is. Each line is one question as the list endpoint renders it.
+"""
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from backend.projection import Projection
+from .serializers import QuestionListSerializer
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _encoder():
+    return JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Renders non-streamed responses (errors) as a single NDJSON line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (_encoder().encode(data) + '\n').encode(self.charset)
+
+
+def export_ndjson(queryset, serializer=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield ``queryset`` as NDJSON text, one chunk of up to ``chunk_size``
+    lines at a time. ``serializer`` (default QuestionListSerializer) picks
+    the fields, including any ?fields= / ?omit= trimming.
+    """
+    projection = Projection.for_serializer(serializer or QuestionListSerializer())
+    encode = _encoder().encode
+
+    rows = projection.values(queryset).iterator(chunk_size=chunk_size)
+    lines = []
+    for data in projection.iter_representation(rows):
+        lines.append(encode(data) + '\n')
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
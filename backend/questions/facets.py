@@ -0,0 +1,40 @@
+"""
+Facet counts for the question browser filters.
+
+All facets come from one GROUP BY over (category, question_type,
+question_style, source). Each facet's counts apply every selected filter
+except its own, so the browser can show how many questions each alternative
+value would return.
+"""
+
+from collections import Counter
+
+from django.db.models import Count
+
+FACET_FIELDS = ('category', 'question_type', 'question_style', 'source')
+
+
+def facet_counts(queryset, selected=None):
+    """
+    Return ``(total, counts)`` for ``queryset``.
+
+    ``selected`` maps facet fields to the set of allowed values. ``total`` is
+    the number of rows matching every selection; ``counts`` maps each facet
+    field to a Counter of value -> rows matching the other selections.
+    """
+    selected = selected or {}
+    rows = queryset.order_by().values_list(*FACET_FIELDS).annotate(count=Count('id'))
+
+    total = 0
+    counts = {field: Counter() for field in FACET_FIELDS}
+    for *values, count in rows:
+        matches = [
+            field not in selected or value in selected[field]
+            for field, value in zip(FACET_FIELDS, values)
+        ]
+        if all(matches):
+            total += count
+        for i, field in enumerate(FACET_FIELDS):
+            if all(match for j, match in enumerate(matches) if j != i):
+                counts[field][values[i]] += count
+    return total, counts
@@ -0,0 +1,158 @@
+import random
+
+import django_filters
+from django.db.models import Case, Exists, F, OuterRef, Q, When
+from rest_framework import filters
+
+from .models import SHUFFLE_KEY_SPACE, Question, UserQuestionHistory, UserQuestionSummary
+from .search import full_text_search, fuzzy_search
+
+SHUFFLE_SEED_PARAM = 'shuffle_seed'
+
+
+def get_shuffle_seed(request):
+    """Return the ?shuffle_seed= value, or None when not shuffling"""
+    return request.query_params.get(SHUFFLE_SEED_PARAM, '').strip()[:64] or None
+
+
+def shuffle_offset(seed):
+    return random.Random(seed).randrange(SHUFFLE_KEY_SPACE)
+
+
+def shuffle_rank(seed):
+    """
+    Expression ranking rows in a seed-dependent pseudo-random order.
+
+    Every question stores a random shuffle_key; the seed picks an offset on
+    the key circle and the rank is the key's distance past it, so the order
+    is the stored random order rotated to start at the seed's offset. It is
+    deterministic and (with id as tie-breaker) total, and keyset pagination
+    over the rank stays consistent between page requests.
+    """
+    offset = shuffle_offset(seed)
+    return Case(
+        When(shuffle_key__gte=offset, then=F('shuffle_key') - offset),
+        default=F('shuffle_key') + (SHUFFLE_KEY_SPACE - offset),
+    )
+
+
+def shuffle_window(queryset, seed, limit, position=None, descending=False):
+    """
+    Narrow ``queryset`` to the first ``limit`` rows in shuffled order (or in
+    reverse with ``descending``) whose rank lies past ``position``.
+
+    The rank cannot be indexed, but in shuffle_key order it is two runs of
+    the questions_shuffle_key_idx index: keys from the seed's offset up, then
+    keys below it. Each run is read as its own LIMITed range scan and only
+    those rows are left for the rank to sort, so a shuffled page costs the
+    same as an unshuffled one.
+    """
+    offset = shuffle_offset(seed)
+    above, below = Q(shuffle_key__gte=offset), Q(shuffle_key__lt=offset)
+    if position is not None:
+        # rank = key - offset above the offset, key - offset + SHUFFLE_KEY_SPACE below it
+        lookup = 'lt' if descending else 'gt'
+        above &= Q(**{f'shuffle_key__{lookup}': offset + position})
+        below &= Q(**{f'shuffle_key__{lookup}': offset + position - SHUFFLE_KEY_SPACE})
+
+    ordering = ('-shuffle_key', '-id') if descending else ('shuffle_key', 'id')
+    runs = [
+        queryset.model.objects.filter(pk__in=queryset.filter(run).order_by(*ordering).values('pk')[:limit])
+        .order_by().values('pk')
+        for run in (above, below)
+    ]
+    return queryset.filter(pk__in=runs[0].union(runs[1], all=True))
+
+
+class AnswerHistoryFilter(filters.BaseFilterBackend):
+    """
+    Per-user filters for authenticated requests (ignored for anonymous ones):
+    ?unseen=true keeps questions the user has never answered and
+    ?answered_incorrectly=true those they have answered wrong at least once.
+
+    Both are correlated EXISTS subqueries that probe the (user, question,
+    is_correct) history index once per question, so their cost does not
+    grow with the length of the user's history. Attempts rolled up out of
+    history (see questions.partitions) are found by a second probe of the
+    unique (user, question) summary index.
+    """
+    unseen_param = 'unseen'
+    answered_incorrectly_param = 'answered_incorrectly'
+    true_values = ('true', '1', 'yes')
+
+    def _enabled(self, request, param):
+        return request.query_params.get(param, '').lower() in self.true_values
+
+    def is_active(self, request):
+        return request.user.is_authenticated and (
+            self._enabled(request, self.unseen_param)
+            or self._enabled(request, self.answered_incorrectly_param)
+        )
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.is_active(request):
+            return queryset
+
+        attempts = UserQuestionHistory.objects.filter(user=request.user, question=OuterRef('pk'))
+        summaries = UserQuestionSummary.objects.filter(user=request.user, question=OuterRef('pk'))
+        if self._enabled(request, self.unseen_param):
+            queryset = queryset.filter(~Exists(attempts), ~Exists(summaries))
+        if self._enabled(request, self.answered_incorrectly_param):
+            queryset = queryset.filter(
+                Exists(attempts.filter(is_correct=False))
+                | Exists(summaries.filter(correct__lt=F('attempts')))
+            )
+        return queryset
+
+
+class QuestionSearchFilter(filters.SearchFilter):
+    """
+    ?search= backed by the question search engine (see questions.search)
+    instead of ILIKE over search_fields. ?search_mode=fuzzy tolerates typos.
+    """
+    search_mode_param = 'search_mode'
+
+    def is_active(self, request):
+        return bool(request.query_params.get(self.search_param, '').strip())
+
+    def filter_queryset(self, request, queryset, view):
+        if not self.is_active(request):
+            return queryset
+        text = request.query_params[self.search_param].strip()
+        if request.query_params.get(self.search_mode_param) == 'fuzzy':
+            return fuzzy_search(queryset, text)
+        return full_text_search(queryset, text)
+
+
+class QuestionOrderingFilter(filters.OrderingFilter):
+    """
+    Orders search results by relevance unless ?ordering= is given.
+    ?shuffle_seed= takes precedence and orders by a seeded shuffle.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        seed = get_shuffle_seed(request)
+        if seed is not None:
+            return queryset.annotate(shuffle_rank=shuffle_rank(seed)).order_by('shuffle_rank', 'id')
+        return super().filter_queryset(request, queryset, view)
+
+    def get_default_ordering(self, view):
+        if QuestionSearchFilter().is_active(view.request):
+            return ['-search_rank', '-created_at']
+        return super().get_default_ordering(view)
+
+
+class UserQuestionHistoryFilter(django_filters.FilterSet):
+    """
+    Filters for the history list. Each is a range scan on a (user, ...,
+    answered_at) history index: category is copied onto history rows, so
+    no join with questions is needed.
+    """
+    answered_after = django_filters.IsoDateTimeFilter(field_name='answered_at', lookup_expr='gte')
+    answered_before = django_filters.IsoDateTimeFilter(field_name='answered_at', lookup_expr='lt')
+    category = django_filters.ChoiceFilter(choices=Question.CATEGORY_CHOICES)
+    is_correct = django_filters.BooleanFilter()
+
+    class Meta:
+        model = UserQuestionHistory
+        fields = ['answered_after', 'answered_before', 'category', 'is_correct']
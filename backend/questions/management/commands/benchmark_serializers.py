@@ -0,0 +1,138 @@
+"""
+Django management command comparing DRF serializers with their projections
+(backend.projection) on list pages.
+
+Synthetic questions, teams and games are created inside a transaction that
+is rolled back afterwards, so the command is safe to run against any
+database. Each timing covers the query plus building the response data,
+best of --repeat runs.
+
+Usage:
+    python manage.py benchmark_serializers [--rows 500] [--repeat 5]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from backend.projection import Projection
+from questions.models import Question
+from questions.serializers import QuestionListSerializer
+from tournaments.models import Tournament, Team, Player, Coach, Room, Round, Game
+from tournaments.serializers import TeamSerializer, GameSerializer
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = 'Benchmark DRF serializers against fast projections on list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=500,
+            help='Rows per page (default: 500)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per measurement; the best one is reported (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+
+        with transaction.atomic():
+            cases = self.create_fixtures(rows)
+            for label, serializer_class, queryset in cases:
+                self.benchmark(label, serializer_class, queryset, repeat)
+            transaction.set_rollback(True)
+
+    def create_fixtures(self, rows):
+        # bulk_create skips the cache invalidation signals; everything is rolled back
+        questions = Question.objects.bulk_create([
+            Question(
+                question_text=f'Benchmark question {i} ' + 'lorem ipsum ' * 20,
+                category='PHYSICS',
+                question_type='TOSSUP',
+                question_style='MULTIPLE_CHOICE',
+                correct_answer=f'Answer {i}',
+                option_1='W', option_2='X', option_3='Y', option_4='Z',
+                source='MIT_2025',
+            )
+            for i in range(rows)
+        ])
+
+        tournament = Tournament.objects.create(
+            name='Serializer benchmark', tournament_date=timezone.now().date()
+        )
+        teams = Team.objects.bulk_create([
+            Team(tournament=tournament, name=f'Team {i}', school=f'School {i}', pool='ABCD'[i % 4])
+            for i in range(rows)
+        ])
+        Player.objects.bulk_create([
+            Player(team=team, name=f'{team.name} player {j}')
+            for team in teams for j in range(4)
+        ])
+        Coach.objects.bulk_create([Coach(team=team, name=f'{team.name} coach') for team in teams])
+
+        round_count = max(1, rows // 10)
+        rounds = Round.objects.bulk_create([
+            Round(tournament=tournament, round_number=n + 1) for n in range(round_count)
+        ])
+        rooms = Room.objects.bulk_create([
+            Room(tournament=tournament, name=f'Room {n}') for n in range(10)
+        ])
+        Game.objects.bulk_create([
+            Game(
+                tournament=tournament,
+                round=rounds[i // 10 % round_count],
+                room=rooms[i % 10],
+                team1=teams[i],
+                team2=teams[(i + 1) % rows],
+                team1_score=i % 7 * 10,
+                team2_score=i % 5 * 10,
+                is_complete=i % 2 == 0,
+                started_at=timezone.now(),
+            )
+            for i in range(rows)
+        ])
+
+        return [
+            ('QuestionListSerializer', QuestionListSerializer,
+             Question.objects.filter(pk__in=[q.pk for q in questions]).order_by('-created_at')),
+            ('TeamSerializer', TeamSerializer, Team.objects.filter(tournament=tournament)),
+            ('GameSerializer', GameSerializer, Game.objects.filter(tournament=tournament)),
+        ]
+
+    def benchmark(self, label, serializer_class, queryset, repeat):
+        projection = Projection.for_serializer(serializer_class())
+        renderer = JSONRenderer()
+
+        serializer_data = serializer_class(queryset, many=True).data
+        projected_data = projection.serialize(queryset)
+        identical = renderer.render(serializer_data) == renderer.render(projected_data)
+
+        drf = best_time(lambda: serializer_class(queryset.all(), many=True).data, repeat)
+        fast = best_time(lambda: projection.serialize(queryset.all()), repeat)
+
+        style = self.style.SUCCESS if identical else self.style.ERROR
+        self.stdout.write(style(
+            f'{label}: {len(projected_data)} rows, serializer {drf * 1000:.1f} ms, '
+            f'projection {fast * 1000:.1f} ms ({drf / fast:.1f}x), '
+            f'output {"identical" if identical else "DIFFERS"}'
+        ))
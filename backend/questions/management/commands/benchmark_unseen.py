@@ -0,0 +1,108 @@
+"""
+Django management command measuring the ?unseen= / ?answered_incorrectly=
+question filters for a user with a long answer history.
+
+Synthetic questions, a user and their history are created inside a
+transaction that is rolled back afterwards. The command prints the query
+plan of each filtered page query and its best time over --repeat runs.
+
+Usage:
+    python manage.py benchmark_unseen [--questions 20000] [--history 50000]
+"""
+
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.client import RequestFactory
+from rest_framework.request import Request
+
+from questions.filters import AnswerHistoryFilter
+from questions.models import Question, UserQuestionHistory
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the unseen / answered_incorrectly filters on a large history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--questions',
+            type=int,
+            default=20000,
+            help='Questions in the synthetic bank (default: 20000)'
+        )
+        parser.add_argument(
+            '--history',
+            type=int,
+            default=50000,
+            help='History rows for the benchmark user (default: 50000)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs per measurement; the best one is reported (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.create_fixtures(options['questions'], options['history'])
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE questions; ANALYZE user_question_history')
+
+            for params in ({'unseen': 'true'}, {'answered_incorrectly': 'true'}):
+                request = Request(RequestFactory().get('/', params))
+                request.user = user
+                queryset = AnswerHistoryFilter().filter_queryset(
+                    request, Question.objects.order_by('-created_at', 'id'), None
+                )[:50]
+
+                best = None
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    list(queryset.values_list('id', flat=True))
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+
+                self.stdout.write(self.style.SUCCESS(
+                    f'{"&".join(params)}: first page in {best * 1000:.1f} ms'
+                ))
+                self.stdout.write(queryset.explain())
+            transaction.set_rollback(True)
+
+    def create_fixtures(self, question_count, history_count):
+        # bulk_create skips the cache invalidation signals; everything is rolled back
+        Question.objects.bulk_create(
+            [
+                Question(
+                    question_text=f'Benchmark question {i}',
+                    category='PHYSICS',
+                    question_type='TOSSUP',
+                    question_style='SHORT_ANSWER',
+                    correct_answer='Answer',
+                )
+                for i in range(question_count)
+            ],
+            batch_size=2000,
+        )
+        question_ids = list(Question.objects.values_list('id', flat=True))
+
+        user = get_user_model().objects.create(username='benchmark-unseen-user')
+        rng = random.Random(0)
+        UserQuestionHistory.objects.bulk_create(
+            [
+                UserQuestionHistory(
+                    user=user,
+                    question_id=rng.choice(question_ids),
+                    category='PHYSICS',
+                    user_answer='Answer',
+                    is_correct=rng.random() < 0.7,
+                )
+                for _ in range(history_count)
+            ],
+            batch_size=2000,
+        )
+        return user
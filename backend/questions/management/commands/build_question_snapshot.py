@@ -0,0 +1,80 @@
+"""
+Django management command to build the offline question-bank snapshot
+served at /api/questions/snapshot/manifest/.
+
+Does nothing if the bank is unchanged since the last snapshot, so it is
+cheap to run from a scheduled job, or with --loop as a background process
+next to the web server. QUESTION_SNAPSHOT_ROOT must be persistent storage
+the web process can read: deltas and ?since= rely on earlier manifests.
+
+Usage:
+    python manage.py build_question_snapshot [--split-by-category] [--keep 10]
+    python manage.py build_question_snapshot --loop [--interval 900]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from questions.snapshots import DEFAULT_KEEP, build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Build a versioned, compressed snapshot of the question bank with deltas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--split-by-category',
+            action='store_true',
+            help='Write one file per category instead of a single file'
+        )
+        parser.add_argument(
+            '--keep',
+            type=int,
+            default=DEFAULT_KEEP,
+            help=f'Number of previous versions to write deltas from (default: {DEFAULT_KEEP})'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep rebuilding every --interval seconds until interrupted'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=900.0,
+            help='Seconds between builds with --loop (default: 900)'
+        )
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.build(options)
+            return
+
+        self.stdout.write(f'Building question snapshots every {options["interval"]}s')
+        try:
+            while True:
+                try:
+                    self.build(options)
+                except Exception as exc:
+                    # A failed build keeps the previous snapshot; try again next interval
+                    self.stderr.write(f'Snapshot build failed: {exc!r}')
+                close_old_connections()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+    def build(self, options):
+        manifest, built = build_snapshot(
+            split_by_category=options['split_by_category'],
+            keep=options['keep'],
+        )
+        if not built:
+            self.stdout.write(f'Snapshot {manifest["version"]} is up to date')
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Built snapshot {manifest["version"]}: {manifest["count"]} questions in '
+            f'{len(manifest["files"])} files, {len(manifest["deltas"])} deltas'
+        ))
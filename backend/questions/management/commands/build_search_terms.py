@@ -0,0 +1,23 @@
+"""
+Django management command to rebuild the question autocomplete dictionary.
+
+import_json rebuilds it automatically; run this after editing questions
+through the admin or any other bulk change.
+
+Usage:
+    python manage.py build_search_terms
+"""
+
+from django.core.management.base import BaseCommand
+
+from questions.search import rebuild_search_terms
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search term dictionary used by question autocomplete'
+
+    def handle(self, *args, **options):
+        term_count = rebuild_search_terms()
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt search term dictionary: {term_count} terms')
+        )
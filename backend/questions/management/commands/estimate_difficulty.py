@@ -0,0 +1,163 @@
+"""
+Django management command fitting an IRT model to answer history and
+writing each question's difficulty and discrimination.
+
+Unlike accuracy_rate, the estimates account for who answered: a question
+missed only by beginners is not rated as hard as one strong players miss.
+Only each user's first attempt at a question is used, since later attempts
+measure recall of the answer. Needs NumPy (see requirements.txt).
+
+History rolled up by partition_history is read from UserQuestionSummary,
+whose first_is_correct stands in for the pair's first attempt. Summaries
+rolled up before that was recorded only know it when all their attempts
+had the same result; the command refuses to run while any others exist
+unless --skip-unknown-first-attempts leaves those pairs out of the fit.
+
+Usage:
+    python manage.py estimate_difficulty [--model 2pl] [--min-responses 10]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from questions.models import Question, UserQuestionHistory, UserQuestionSummary
+
+
+class Command(BaseCommand):
+    help = (
+        'Estimate question difficulty and discrimination from answer history (IRT). '
+        'Rolled-up history counts through each summary\'s first result; summaries '
+        'without one stop the command unless --skip-unknown-first-attempts is given'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=['1pl', '2pl'],
+            default='2pl',
+            help='1pl (Rasch, difficulty only) or 2pl (adds discrimination) (default: 2pl)'
+        )
+        parser.add_argument(
+            '--min-responses',
+            type=int,
+            default=10,
+            help='Questions with fewer first attempts are left unrated (default: 10)'
+        )
+        parser.add_argument(
+            '--max-iterations',
+            type=int,
+            default=100,
+            help='Upper bound on fitting iterations (default: 100)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=20000,
+            help='History rows fetched per database round trip (default: 20000)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Questions written per UPDATE (default: 1000)'
+        )
+        parser.add_argument(
+            '--skip-unknown-first-attempts',
+            action='store_true',
+            help='Leave out (user, question) pairs whose rolled-up first result is unknown '
+                 'instead of failing'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            import numpy as np
+        except ImportError:
+            raise CommandError(
+                "numpy is required. Install it with: pip install numpy"
+            )
+        from questions.irt import Responses, fit
+
+        start = time.perf_counter()
+        rows = UserQuestionHistory.objects.order_by().values_list(
+            'id', 'user_id', 'question_id', 'is_correct'
+        ).iterator(chunk_size=options['chunk_size'])
+        dtype = [('id', 'i8'), ('user', 'i8'), ('question', 'i8'), ('correct', '?')]
+        attempts = np.fromiter(rows, dtype=dtype)
+
+        # Summaries hold attempts older than any raw history for their pair, so
+        # negative ids make first_attempts prefer them
+        summaries = UserQuestionSummary.objects.order_by().filter(
+            first_is_correct__isnull=False
+        ).values_list('id', 'user_id', 'question_id', 'first_is_correct').iterator(
+            chunk_size=options['chunk_size']
+        )
+        rolled_up = np.fromiter(summaries, dtype=dtype)
+        rolled_up['id'] = -rolled_up['id']
+
+        unknown = np.fromiter(
+            UserQuestionSummary.objects.order_by().filter(first_is_correct__isnull=True).values_list(
+                'user_id', 'question_id'
+            ).iterator(chunk_size=options['chunk_size']),
+            dtype=[('user', 'i8'), ('question', 'i8')]
+        )
+        if len(unknown):
+            if not options['skip_unknown_first_attempts']:
+                raise CommandError(
+                    f'{len(unknown)} rolled-up (user, question) pairs have no recorded first result, '
+                    'so their raw history would be fitted as first attempts; '
+                    'rerun with --skip-unknown-first-attempts to leave them out'
+                )
+            span = int(max(attempts['question'].max(initial=0), unknown['question'].max())) + 1
+            skipped = np.isin(
+                attempts['user'] * span + attempts['question'], unknown['user'] * span + unknown['question']
+            )
+            attempts = attempts[~skipped]
+            self.stdout.write(
+                f'Skipped {len(unknown)} rolled-up pairs with no recorded first result '
+                f'({skipped.sum()} raw attempts)'
+            )
+
+        attempts = np.concatenate([rolled_up, attempts])
+        del rolled_up
+        if not len(attempts):
+            raise CommandError('No answer history to fit')
+
+        responses = Responses.first_attempts(
+            attempts['id'], attempts['user'], attempts['question'], attempts['correct']
+        )
+        del attempts
+        self.stdout.write(
+            f'Loaded {len(responses.correct)} first attempts by {responses.user_count} users '
+            f'at {responses.question_count} questions in {time.perf_counter() - start:.1f}s'
+        )
+
+        start = time.perf_counter()
+        difficulty, discrimination, _, iterations = fit(
+            responses, options['model'], max_iterations=options['max_iterations']
+        )
+        self.stdout.write(
+            f'Fitted {options["model"].upper()} model in {iterations} iterations '
+            f'({time.perf_counter() - start:.1f}s)'
+        )
+
+        rated = responses.question_counts() >= options['min_responses']
+        questions = [
+            Question(pk=int(pk), difficulty=float(b), discrimination=float(a))
+            for pk, b, a in zip(
+                responses.question_ids[rated], difficulty[rated], discrimination[rated]
+            )
+        ]
+        with transaction.atomic():
+            # Estimates from an earlier fit would no longer be on the same scale
+            Question.objects.exclude(difficulty=None).update(difficulty=None, discrimination=None)
+            Question.objects.bulk_update(
+                questions, ['difficulty', 'discrimination'], batch_size=options['batch_size']
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rated {len(questions)} questions '
+            f'({responses.question_count - len(questions)} with fewer than '
+            f'{options["min_responses"]} responses left unrated)'
+        ))
@@ -0,0 +1,64 @@
+"""
+Django management command to export questions as NDJSON (one JSON object per
+line), in the same format as /api/questions/export.ndjson.
+
+Usage:
+    python manage.py export_questions [--output <path>] [--category PHYSICS] ...
+
+Examples:
+    # Export the whole bank
+    python manage.py export_questions --output questions.ndjson
+
+    # Export physics tossups to stdout
+    python manage.py export_questions --category PHYSICS --question-type TOSSUP
+"""
+
+from django.core.management.base import BaseCommand
+
+from questions.export import EXPORT_CHUNK_SIZE, export_ndjson
+from questions.models import Question
+
+FILTER_OPTIONS = ('category', 'question_type', 'question_style', 'source')
+
+
+class Command(BaseCommand):
+    help = 'Export questions as newline-delimited JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='File to write (default: stdout)'
+        )
+        for field in FILTER_OPTIONS:
+            parser.add_argument(
+                f'--{field.replace("_", "-")}',
+                dest=field,
+                type=str,
+                help=f'Only export questions with this {field.replace("_", " ")}'
+            )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f'Rows fetched per database round trip (default: {EXPORT_CHUNK_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        filters = {field: options[field] for field in FILTER_OPTIONS if options[field]}
+        queryset = Question.objects.filter(**filters).order_by('-created_at', 'id')
+
+        chunks = export_ndjson(queryset, chunk_size=options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        count = 0
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            for chunk in chunks:
+                output.write(chunk)
+                count += chunk.count('\n')
+        self.stdout.write(
+            self.style.SUCCESS(f'Exported {count} questions to {options["output"]}')
+        )
@@ -0,0 +1,61 @@
+"""
+Django management command listing clusters of near-duplicate questions.
+
+Candidates come from the LSH bucket table (see questions.dedup), so the cost
+grows with the number of questions rather than the number of pairs.
+
+Usage:
+    python manage.py find_duplicates [--threshold 0.8] [--rebuild]
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from questions.dedup import DEFAULT_THRESHOLD, index_questions, near_duplicate_clusters
+from questions.models import Question
+
+
+class Command(BaseCommand):
+    help = 'List clusters of near-duplicate questions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help=f'Minimum estimated Jaccard similarity (default: {DEFAULT_THRESHOLD})'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute every signature first (e.g. after bulk loads that skip signals)'
+        )
+
+    def handle(self, *args, **options):
+        threshold = options['threshold']
+        if not 0 < threshold <= 1:
+            raise CommandError('--threshold must be between 0 and 1')
+
+        if options['rebuild']:
+            indexed = index_questions()
+            self.stdout.write(f'Indexed {indexed} questions')
+
+        clusters = near_duplicate_clusters(threshold)
+        questions = Question.objects.only('question_text', 'category', 'source').in_bulk(
+            [pk for cluster in clusters for pk in cluster['question_ids']]
+        )
+        for number, cluster in enumerate(clusters, 1):
+            self.stdout.write(self.style.WARNING(
+                f'\nCluster {number}: {len(cluster["question_ids"])} questions, '
+                f'similarity >= {cluster["similarity"]:.0%}'
+            ))
+            for pk in cluster['question_ids']:
+                question = questions[pk]
+                self.stdout.write(
+                    f'  #{pk} [{question.category}] {question.source or "-"}: '
+                    f'{question.question_text[:80]}'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\nFound {len(clusters)} clusters covering '
+            f'{sum(len(cluster["question_ids"]) for cluster in clusters)} questions'
+        ))
@@ -0,0 +1,55 @@
+"""
+Django management command folding queued answer counters into questions.
+
+Answers append QuestionStatDelta rows (see questions.counters); question
+times_answered, times_correct and rating only change when this runs. Run it
+with --loop as a long-lived worker, or without from a scheduled job.
+
+Usage:
+    python manage.py flush_question_stats [--loop] [--interval 5]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from questions.counters import FLUSH_BATCH_SIZE, flush_stat_deltas
+
+
+class Command(BaseCommand):
+    help = 'Apply queued answer counters to question statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep flushing every --interval seconds until interrupted'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds between flushes with --loop (default: 5)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=FLUSH_BATCH_SIZE,
+            help=f'Deltas applied per transaction (default: {FLUSH_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            flushed = flush_stat_deltas(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Applied {flushed} answer counter updates'))
+            return
+
+        self.stdout.write(f'Flushing answer counters every {options["interval"]}s')
+        try:
+            while True:
+                flushed = flush_stat_deltas(options['batch_size'])
+                if flushed:
+                    self.stdout.write(f'Applied {flushed} answer counter updates')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
@@ -15,6 +15,9 @@ Examples:
 
     # Preview what would be imported without saving
     python manage.py import_json question_pdfs/Round_1_final.json --dry-run
+
+    # Skip questions reworded from ones already in the bank
+    python manage.py import_json question_pdfs/Round_1_final.json --skip-near-duplicates
 """
 
 import json
@@ -23,7 +26,11 @@ from pathlib import Path
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
+from questions.cache import bump_question_generation
+from questions.dedup import DEFAULT_THRESHOLD, find_similar, question_document
+from questions.facets import facet_counts
 from questions.models import Question
+from questions.search import rebuild_search_terms
 
 
 class Command(BaseCommand):
@@ -50,6 +57,17 @@ class Command(BaseCommand):
             action='store_true',
             help='Skip questions that already exist in the database'
         )
+        parser.add_argument(
+            '--skip-near-duplicates',
+            action='store_true',
+            help='Skip questions whose text closely matches an existing question'
+        )
+        parser.add_argument(
+            '--similarity',
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help=f'Jaccard similarity for --skip-near-duplicates (default: {DEFAULT_THRESHOLD})'
+        )
         parser.add_argument(
             '--yes',
             action='store_true',
@@ -61,6 +79,7 @@ class Command(BaseCommand):
         clear_existing = options['clear']
         dry_run = options['dry_run']
         skip_duplicates = options['skip_duplicates']
+        skip_near_duplicates = options['skip_near_duplicates']
         auto_confirm = options['yes']
 
         # Validate file exists
@@ -111,18 +130,20 @@ class Command(BaseCommand):
         skipped_count = 0
         error_count = 0
 
+        # Load every existing exact match in one query instead of one per row
+        existing = set()
+        if skip_duplicates:
+            existing = set(Question.objects.filter(
+                question_text__in={q_data.get('question_text') for q_data in questions_data}
+            ).values_list('question_text', 'category', 'question_type'))
+
         with transaction.atomic():
             for i, q_data in enumerate(questions_data, 1):
                 try:
                     # Check for duplicates if requested
                     if skip_duplicates:
-                        exists = Question.objects.filter(
-                            question_text=q_data['question_text'],
-                            category=q_data['category'],
-                            question_type=q_data['question_type']
-                        ).exists()
-
-                        if exists:
+                        key = (q_data['question_text'], q_data['category'], q_data['question_type'])
+                        if key in existing:
                             skipped_count += 1
                             self.stdout.write(
                                 f'  [{i}/{len(questions_data)}] Skipped duplicate: '
@@ -130,6 +151,22 @@ class Command(BaseCommand):
                             )
                             continue
 
+                    # Near-duplicates are looked up in the LSH index, see questions.dedup
+                    if skip_near_duplicates:
+                        document = question_document(
+                            q_data['question_text'],
+                            *(q_data.get(f'option_{n}') for n in range(1, 5))
+                        )
+                        matches = find_similar(document, options['similarity'])
+                        if matches:
+                            skipped_count += 1
+                            match_id, score = matches[0]
+                            self.stdout.write(
+                                f'  [{i}/{len(questions_data)}] Skipped near-duplicate of '
+                                f'#{match_id} ({score:.0%} similar)'
+                            )
+                            continue
+
                     # Create question
                     question = Question.objects.create(
                         question_text=q_data['question_text'],
@@ -145,6 +182,7 @@ class Command(BaseCommand):
                         explanation=q_data.get('explanation'),
                     )
                     created_count += 1
+                    existing.add((question.question_text, question.category, question.question_type))
 
                     self.stdout.write(
                         f'  [{i}/{len(questions_data)}] Created: '
@@ -159,6 +197,14 @@ class Command(BaseCommand):
                         )
                     )
 
+        # Drop cached question responses now that the import has committed
+        bump_question_generation()
+
+        # Refresh the autocomplete dictionary with the new questions
+        if created_count > 0 or clear_existing:
+            term_count = rebuild_search_terms()
+            self.stdout.write(f'Rebuilt search term dictionary: {term_count} terms')
+
         # Summary
         self.stdout.write('\n' + '='*80)
         self.stdout.write(self.style.SUCCESS('IMPORT SUMMARY'))
@@ -181,29 +227,21 @@ class Command(BaseCommand):
         self.stdout.write('DATABASE STATISTICS')
         self.stdout.write('='*80)
 
-        total = Question.objects.count()
+        # One grouped query for every breakdown
+        total, counts = facet_counts(Question.objects.all())
         self.stdout.write(f'Total questions in database: {total}')
 
-        # Breakdown by category
-        self.stdout.write('\nBy Category:')
-        for category, label in Question.CATEGORY_CHOICES:
-            count = Question.objects.filter(category=category).count()
-            if count > 0:
-                self.stdout.write(f'  {label}: {count}')
-
-        # Breakdown by type
-        self.stdout.write('\nBy Type:')
-        for q_type, label in Question.QUESTION_TYPE_CHOICES:
-            count = Question.objects.filter(question_type=q_type).count()
-            if count > 0:
-                self.stdout.write(f'  {label}: {count}')
-
-        # Breakdown by style
-        self.stdout.write('\nBy Style:')
-        for style, label in Question.QUESTION_STYLE_CHOICES:
-            count = Question.objects.filter(question_style=style).count()
-            if count > 0:
-                self.stdout.write(f'  {label}: {count}')
+        breakdowns = [
+            ('By Category', 'category', Question.CATEGORY_CHOICES),
+            ('By Type', 'question_type', Question.QUESTION_TYPE_CHOICES),
+            ('By Style', 'question_style', Question.QUESTION_STYLE_CHOICES),
+        ]
+        for title, field, choices in breakdowns:
+            self.stdout.write(f'\n{title}:')
+            for value, label in choices:
+                count = counts[field][value]
+                if count > 0:
+                    self.stdout.write(f'  {label}: {count}')
 
     def _display_questions(self, questions_data):
         """Display questions for dry-run mode."""
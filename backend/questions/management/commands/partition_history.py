@@ -0,0 +1,87 @@
+"""
+Django management command maintaining monthly partitions of answer history
+and rolling old history up into per-question summaries.
+
+Without options it creates partitions for the current month and the next
+--months-ahead months (a no-op unless the table has been converted with
+--convert, which needs PostgreSQL). It runs on every deploy; also run it
+from a scheduled job at least monthly. --rollup-after N then summarizes
+history older than N whole months into UserQuestionSummary rows and
+detaches those partitions (dropping them with --drop).
+
+Usage:
+    python manage.py partition_history [--convert] [--months-ahead 3]
+    python manage.py partition_history --rollup-after 12 [--drop]
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from questions.partitions import (
+    ROLLUP_BATCH_SIZE, add_months, convert_to_partitioned, ensure_partitions,
+    is_partitioned, month_start, rollup_history,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create monthly answer history partitions and roll up old history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert',
+            action='store_true',
+            help='Convert the history table to a partitioned one (PostgreSQL; locks the table while copying)'
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Months of partitions to create after the current one (default: 3)'
+        )
+        parser.add_argument(
+            '--rollup-after',
+            type=int,
+            metavar='MONTHS',
+            help='Roll up history from before the last MONTHS whole months'
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Drop rolled-up partitions instead of leaving them detached'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ROLLUP_BATCH_SIZE,
+            help=f'Summaries written per batch when rolling up (default: {ROLLUP_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        if options['convert']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('Partitioning answer history requires PostgreSQL')
+            if is_partitioned():
+                raise CommandError('Answer history is already partitioned')
+            convert_to_partitioned(options['months_ahead'])
+            self.stdout.write(self.style.SUCCESS('Converted answer history to monthly partitions'))
+        elif is_partitioned():
+            created = ensure_partitions(options['months_ahead'])
+            self.stdout.write(self.style.SUCCESS(f'Created {len(created)} answer history partitions'))
+            for name in created:
+                self.stdout.write(f'  {name}')
+
+        if options['rollup_after'] is not None:
+            if options['rollup_after'] < 1:
+                raise CommandError('--rollup-after must be at least 1')
+            before = add_months(month_start(datetime.datetime.now(datetime.timezone.utc)), -options['rollup_after'])
+            rolled_up = rollup_history(before, drop=options['drop'], batch_size=options['batch_size'])
+            total = sum(count for _, count in rolled_up)
+            self.stdout.write(self.style.SUCCESS(
+                f'Rolled up {total} answers from before {before:%Y-%m-%d}'
+            ))
+            for name, count in rolled_up:
+                if name:
+                    action = 'dropped' if options['drop'] else 'detached'
+                    self.stdout.write(f'  {name}: {count} answers, {action}')
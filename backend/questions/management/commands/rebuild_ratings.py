@@ -0,0 +1,68 @@
+"""
+Django management command to rebuild Elo ratings by replaying answer history.
+
+New answers update ratings as they are recorded; run this once to backfill
+ratings for history recorded before ratings existed, or after changing the
+rating rules. Only raw history is replayed, not attempts rolled up by
+partition_history.
+
+Usage:
+    python manage.py rebuild_ratings [--batch-size 2000]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from questions.counters import flush_stat_deltas
+from questions.models import Question, UserCategoryRating, UserQuestionHistory
+from questions.ratings import INITIAL_RATING, rate
+
+
+class Command(BaseCommand):
+    help = 'Rebuild user and question Elo ratings from answer history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows read and written per batch (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        # Queued rating changes would otherwise land on top of the rebuilt ratings
+        flush_stat_deltas()
+        history = UserQuestionHistory.objects.order_by('answered_at', 'id').values_list(
+            'user_id', 'question_id', 'question__category', 'is_correct'
+        )
+
+        # [rating, answers] per (user, category) and per question
+        users = {}
+        questions = {}
+        for user_id, question_id, category, is_correct in history.iterator(chunk_size=batch_size):
+            user = users.setdefault((user_id, category), [INITIAL_RATING, 0])
+            question = questions.setdefault(question_id, [INITIAL_RATING, 0])
+            user[0], question[0] = rate(user[0], user[1], question[0], question[1], is_correct)
+            user[1] += 1
+            question[1] += 1
+
+        with transaction.atomic():
+            UserCategoryRating.objects.all().delete()
+            UserCategoryRating.objects.bulk_create(
+                [
+                    UserCategoryRating(user_id=user_id, category=category, rating=rating, attempts=attempts)
+                    for (user_id, category), (rating, attempts) in users.items()
+                ],
+                batch_size=batch_size,
+            )
+            Question.objects.exclude(rating=INITIAL_RATING).update(rating=INITIAL_RATING)
+            Question.objects.bulk_update(
+                [Question(pk=pk, rating=rating) for pk, (rating, _) in questions.items()],
+                ['rating'],
+                batch_size=batch_size,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {len(users)} user ratings and {len(questions)} question ratings'
+        ))
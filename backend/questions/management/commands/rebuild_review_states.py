@@ -0,0 +1,61 @@
+"""
+Django management command to rebuild spaced-repetition review states by
+replaying answer history.
+
+New answers update review states as they are recorded; run this once to
+backfill states for history recorded before scheduling existed, or after
+changing the scheduling rules. Only raw history is replayed, not attempts
+rolled up by partition_history.
+
+Usage:
+    python manage.py rebuild_review_states [--batch-size 2000]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from questions.models import ReviewState, UserQuestionHistory
+from questions.scheduling import answer_quality, apply_review, new_review_state
+
+
+class Command(BaseCommand):
+    help = 'Rebuild spaced-repetition review states from answer history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows read and written per batch (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        history = UserQuestionHistory.objects.order_by(
+            'user_id', 'question_id', 'answered_at', 'id'
+        ).values_list('user_id', 'question_id', 'is_correct', 'time_taken', 'answered_at')
+
+        state_count = 0
+        with transaction.atomic():
+            ReviewState.objects.all().delete()
+
+            batch = []
+            state = None
+            for user_id, question_id, is_correct, time_taken, answered_at in history.iterator(chunk_size=batch_size):
+                if state is None or (state.user_id, state.question_id) != (user_id, question_id):
+                    if state is not None:
+                        batch.append(state)
+                    state = new_review_state(user_id, question_id)
+                apply_review(state, answer_quality(is_correct, time_taken), answered_at)
+
+                if len(batch) >= batch_size:
+                    ReviewState.objects.bulk_create(batch)
+                    state_count += len(batch)
+                    batch = []
+
+            if state is not None:
+                batch.append(state)
+            ReviewState.objects.bulk_create(batch)
+            state_count += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {state_count} review states'))
@@ -0,0 +1,71 @@
+"""
+Django management command to repair users' total_questions_answered and
+correct_answers from answer history.
+
+New answers update both with atomic increments as they are recorded; run
+this once to backfill totals for history recorded before that, or to fix
+drift after history rows are deleted or bulk loaded. Attempts rolled up out
+of history are counted from the question summaries. Answers recorded while
+it runs can be overwritten, so run it when traffic is quiet.
+
+Usage:
+    python manage.py reconcile_user_stats [--dry-run] [--batch-size 2000]
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from questions.models import UserQuestionHistory, UserQuestionSummary
+
+
+class Command(BaseCommand):
+    help = "Recompute users' answer totals from answer history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report users whose totals are off without saving'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Users read and written per batch (default: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+
+        # One grouped pass over history for every user
+        totals = {
+            row['user_id']: (row['answered'], row['correct'])
+            for row in UserQuestionHistory.objects.order_by().values('user_id').annotate(
+                answered=Count('id'), correct=Count('id', filter=Q(is_correct=True))
+            )
+        }
+        for row in UserQuestionSummary.objects.order_by().values('user_id').annotate(
+            answered=Sum('attempts'), correct=Sum('correct')
+        ):
+            answered, correct = totals.get(row['user_id'], (0, 0))
+            totals[row['user_id']] = (answered + row['answered'], correct + row['correct'])
+
+        drifted = []
+        users = User.objects.order_by().only('id', 'total_questions_answered', 'correct_answers')
+        for user in users.iterator(chunk_size=options['batch_size']):
+            answered, correct = totals.get(user.pk, (0, 0))
+            if (user.total_questions_answered, user.correct_answers) != (answered, correct):
+                user.total_questions_answered, user.correct_answers = answered, correct
+                drifted.append(user)
+
+        if not options['dry_run']:
+            with transaction.atomic():
+                User.objects.bulk_update(
+                    drifted, ['total_questions_answered', 'correct_answers'],
+                    batch_size=options['batch_size']
+                )
+
+        verb = 'Would fix' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} answer totals for {len(drifted)} users'))
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0008_alter_question_category_alter_question_option_1_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['-created_at', 'id'], name='questions_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:59
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('english', coalesce({row}question_text, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}correct_answer, '')), 'B') ||
+    setweight(to_tsvector('english', concat_ws(' ',
+        {row}option_1, {row}option_2, {row}option_3, {row}option_4)), 'C')
+"""
+
+CREATE_SEARCH_VECTOR_SQL = [
+    f"""
+    CREATE OR REPLACE FUNCTION questions_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row='NEW.')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER questions_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF question_text, correct_answer, option_1, option_2, option_3, option_4
+    ON questions
+    FOR EACH ROW EXECUTE FUNCTION questions_search_vector_update();
+    """,
+    f"UPDATE questions SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='')};",
+    "CREATE INDEX questions_search_vector_gin ON questions USING gin (search_vector);",
+]
+
+DROP_SEARCH_VECTOR_SQL = [
+    "DROP INDEX IF EXISTS questions_search_vector_gin;",
+    "DROP TRIGGER IF EXISTS questions_search_vector_trigger ON questions;",
+    "DROP FUNCTION IF EXISTS questions_search_vector_update();",
+]
+
+
+def create_search_vector_trigger(apps, schema_editor):
+    # Full-text search is PostgreSQL only; other databases use the fallback search
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in CREATE_SEARCH_VECTOR_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_vector_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in DROP_SEARCH_VECTOR_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0009_question_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_trigger, drop_search_vector_trigger),
+    ]
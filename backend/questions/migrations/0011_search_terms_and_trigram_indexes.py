@@ -0,0 +1,52 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:00
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+TRIGRAM_INDEXES = [
+    ('questions_question_text_trgm', 'questions', 'question_text'),
+    ('questions_correct_answer_trgm', 'questions', 'correct_answer'),
+    ('question_search_terms_term_trgm', 'question_search_terms', 'term'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm is PostgreSQL only; other databases use the term dictionary fallback
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX {name} ON {table} USING gin ({column} gin_trgm_ops);'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name};')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0010_question_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True)),
+                ('frequency', models.PositiveIntegerField(default=0, help_text='Number of questions containing the term')),
+            ],
+            options={
+                'db_table': 'question_search_terms',
+                'ordering': ['-frequency', 'term'],
+            },
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0011_search_terms_and_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'question_tombstones',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['updated_at', 'id'], name='questions_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='questiontombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='question_tombstones_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0012_question_tombstones_and_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repetitions', models.PositiveIntegerField(default=0, help_text='Consecutive successful reviews')),
+                ('ease_factor', models.FloatField(default=2.5)),
+                ('interval_days', models.PositiveIntegerField(default=0)),
+                ('lapses', models.PositiveIntegerField(default=0, help_text='Times the question was forgotten')),
+                ('due_at', models.DateTimeField()),
+                ('last_reviewed_at', models.DateTimeField()),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_states', to='questions.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'question_review_states',
+                'ordering': ['due_at'],
+                'indexes': [models.Index(fields=['user', 'due_at'], name='review_states_user_due_idx')],
+                'unique_together': {('user', 'question')},
+            },
+        ),
+    ]
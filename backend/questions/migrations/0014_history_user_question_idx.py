@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0013_review_states'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userquestionhistory',
+            index=models.Index(fields=['user', 'question', 'is_correct'], name='history_user_question_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0014_history_user_question_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSignature',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='questions.question')),
+                ('minhash', models.BinaryField(help_text='Packed 64-bit MinHash values')),
+            ],
+            options={
+                'db_table': 'question_signatures',
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionLSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='questions.question')),
+            ],
+            options={
+                'db_table': 'question_lsh_buckets',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='question_lsh_band_bucket_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0015_question_signatures_and_lsh_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='difficulty',
+            field=models.FloatField(blank=True, help_text='IRT difficulty (logit scale, higher is harder)', null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='discrimination',
+            field=models.FloatField(blank=True, help_text='IRT discrimination', null=True),
+        ),
+    ]
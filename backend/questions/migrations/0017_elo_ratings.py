@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0016_question_irt_estimates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserCategoryRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('BIOLOGY', 'Biology'), ('CHEMISTRY', 'Chemistry'), ('PHYSICS', 'Physics'), ('EARTH_SPACE', 'Earth and Space'), ('MATH', 'Math'), ('ENERGY', 'Energy'), ('OTHER', 'Other')], max_length=20)),
+                ('rating', models.FloatField(default=1500)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'user_category_ratings',
+                'ordering': ['category'],
+            },
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='rating',
+            field=models.FloatField(default=1500, help_text='Elo difficulty rating'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['category', 'rating'], name='questions_category_rating_idx'),
+        ),
+        migrations.AddField(
+            model_name='usercategoryrating',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_ratings', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='usercategoryrating',
+            unique_together={('user', 'category')},
+        ),
+    ]
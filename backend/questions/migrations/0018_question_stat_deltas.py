@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0017_elo_ratings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStatDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answered', models.IntegerField(default=1)),
+                ('correct', models.IntegerField(default=0)),
+                ('rating_change', models.FloatField(default=0)),
+                ('question', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stat_deltas', to='questions.question')),
+            ],
+            options={
+                'db_table': 'question_stat_deltas',
+                'ordering': ['id'],
+            },
+        ),
+    ]
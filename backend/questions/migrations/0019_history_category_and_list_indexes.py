@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_question_categories(apps, schema_editor):
+    UserQuestionHistory = apps.get_model('questions', 'UserQuestionHistory')
+    Question = apps.get_model('questions', 'Question')
+    UserQuestionHistory.objects.update(category=Subquery(
+        Question.objects.filter(pk=OuterRef('question_id')).values('category')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0018_question_stat_deltas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userquestionhistory',
+            name='category',
+            field=models.CharField(blank=True, choices=[('BIOLOGY', 'Biology'), ('CHEMISTRY', 'Chemistry'), ('PHYSICS', 'Physics'), ('EARTH_SPACE', 'Earth and Space'), ('MATH', 'Math'), ('ENERGY', 'Energy'), ('OTHER', 'Other')], editable=False, max_length=20),
+        ),
+        migrations.RunPython(copy_question_categories, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userquestionhistory',
+            index=models.Index(fields=['user', 'category', 'answered_at'], name='history_user_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userquestionhistory',
+            index=models.Index(fields=['user', 'is_correct', 'answered_at'], name='history_user_correct_idx'),
+        ),
+    ]
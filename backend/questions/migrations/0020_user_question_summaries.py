@@ -0,0 +1,35 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0019_history_category_and_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserQuestionSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('total_time_taken', models.PositiveBigIntegerField(default=0, help_text='Seconds, over timed attempts')),
+                ('timed_attempts', models.PositiveIntegerField(default=0)),
+                ('first_answered_at', models.DateTimeField()),
+                ('last_answered_at', models.DateTimeField()),
+                ('last_is_correct', models.BooleanField()),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_summaries', to='questions.question')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_question_summaries',
+                'unique_together': {('user', 'question')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0020_user_question_summaries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='stats_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
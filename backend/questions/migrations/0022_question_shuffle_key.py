@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:03
+
+import questions.models
+from django.db import migrations, models
+
+
+def draw_shuffle_keys(apps, schema_editor):
+    # AddField gives every existing row the same default
+    Question = apps.get_model('questions', 'Question')
+    batch = []
+    for question in Question.objects.only('id').iterator(chunk_size=2000):
+        question.shuffle_key = questions.models.random_shuffle_key()
+        batch.append(question)
+        if len(batch) >= 2000:
+            Question.objects.bulk_update(batch, ['shuffle_key'])
+            batch = []
+    Question.objects.bulk_update(batch, ['shuffle_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0021_question_stats_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='shuffle_key',
+            field=models.IntegerField(default=questions.models.random_shuffle_key, editable=False),
+        ),
+        migrations.RunPython(draw_shuffle_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['shuffle_key', 'id'], name='questions_shuffle_key_idx'),
+        ),
+    ]
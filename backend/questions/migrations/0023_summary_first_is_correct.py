@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-17 05:07
+
+from django.db import migrations, models
+from django.db.models import F, Q
+
+
+def backfill_first_is_correct(apps, schema_editor):
+    # Older rollups only kept totals; the first result is known only when
+    # every rolled-up attempt had the same outcome
+    UserQuestionSummary = apps.get_model('questions', 'UserQuestionSummary')
+    UserQuestionSummary.objects.filter(Q(attempts=1) | Q(correct=F('attempts'))).update(
+        first_is_correct=F('last_is_correct')
+    )
+    UserQuestionSummary.objects.filter(correct=0).update(first_is_correct=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0022_question_shuffle_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userquestionsummary',
+            name='first_is_correct',
+            field=models.BooleanField(help_text='Unknown (null) for older rollups of mixed results', null=True),
+        ),
+        migrations.RunPython(backfill_first_is_correct, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,15 @@
+import random
+
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
+
+# Question.shuffle_key is drawn uniformly from [0, SHUFFLE_KEY_SPACE)
+SHUFFLE_KEY_SPACE = 2 ** 31 - 1
+
+
+def random_shuffle_key():
+    return random.randrange(SHUFFLE_KEY_SPACE)
 
 
 class Question(models.Model):
@@ -69,15 +80,37 @@ class Question(models.Model):
     times_answered = models.IntegerField(default=0)
     times_correct = models.IntegerField(default=0)
 
+    # IRT estimates from answer history (see questions.irt), null until fitted
+    difficulty = models.FloatField(null=True, blank=True, help_text="IRT difficulty (logit scale, higher is harder)")
+    discrimination = models.FloatField(null=True, blank=True, help_text="IRT discrimination")
+    # Online Elo difficulty, updated on every answer (see questions.ratings)
+    rating = models.FloatField(default=1500, help_text="Elo difficulty rating")
+
+    # Random sort key seeded shuffles rotate (see questions.filters.shuffle_rank)
+    shuffle_key = models.IntegerField(default=random_shuffle_key, editable=False)
+
+    # Full-text search document, maintained by a database trigger on PostgreSQL
+    search_vector = SearchVectorField(null=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set when answer counters are folded in (see questions.counters); updated_at tracks content only
+    stats_updated_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         db_table = 'questions'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['category', 'question_type']),
+            # Keyset for cursor pagination (see questions.pagination)
+            models.Index(fields=['-created_at', 'id'], name='questions_created_id_idx'),
+            # Keyset for the change feed (see questions.changes)
+            models.Index(fields=['updated_at', 'id'], name='questions_updated_id_idx'),
+            # Nearest-rating lookups for recommendations
+            models.Index(fields=['category', 'rating'], name='questions_category_rating_idx'),
+            # Range scans for seeded shuffles (see questions.filters.shuffle_window)
+            models.Index(fields=['shuffle_key', 'id'], name='questions_shuffle_key_idx'),
         ]
 
     def __str__(self):
@@ -101,6 +134,8 @@ class UserQuestionHistory(models.Model):
     user_answer = models.TextField()
     is_correct = models.BooleanField()
     time_taken = models.IntegerField(help_text="Time taken in seconds", null=True, blank=True)
+    # Copy of question.category so category filters are served by a history index
+    category = models.CharField(max_length=20, choices=Question.CATEGORY_CHOICES, blank=True, editable=False)
 
     answered_at = models.DateTimeField(auto_now_add=True)
 
@@ -110,11 +145,48 @@ class UserQuestionHistory(models.Model):
         indexes = [
             models.Index(fields=['user', 'answered_at']),
             models.Index(fields=['question', 'is_correct']),
+            # Index-only probes for the unseen / answered_incorrectly filters
+            models.Index(fields=['user', 'question', 'is_correct'], name='history_user_question_idx'),
+            # History list filters, each a range scan in answered_at order
+            models.Index(fields=['user', 'category', 'answered_at'], name='history_user_category_idx'),
+            models.Index(fields=['user', 'is_correct', 'answered_at'], name='history_user_correct_idx'),
         ]
 
     def __str__(self):
         return f"{self.user.username} - {self.question.id} - {'✓' if self.is_correct else '✗'}"
 
+    def save(self, *args, **kwargs):
+        if not self.category:
+            self.category = self.question.category
+        super().save(*args, **kwargs)
+
+
+class UserQuestionSummary(models.Model):
+    """
+    Compacted answer history for one user and question.
+    Old history partitions are rolled up into these rows (see
+    questions.partitions); reads that need every attempt combine both.
+    """
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='question_summaries')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='user_summaries')
+
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    total_time_taken = models.PositiveBigIntegerField(default=0, help_text="Seconds, over timed attempts")
+    timed_attempts = models.PositiveIntegerField(default=0)
+    first_answered_at = models.DateTimeField()
+    last_answered_at = models.DateTimeField()
+    # The first attempt is what difficulty estimates use (see estimate_difficulty)
+    first_is_correct = models.BooleanField(null=True, help_text="Unknown (null) for older rollups of mixed results")
+    last_is_correct = models.BooleanField()
+
+    class Meta:
+        db_table = 'user_question_summaries'
+        unique_together = ['user', 'question']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.question_id}: {self.correct}/{self.attempts}"
+
 
 class Bookmark(models.Model):
     """
@@ -133,3 +205,145 @@ class Bookmark(models.Model):
 
     def __str__(self):
         return f"{self.user.username} bookmarked Q{self.question.id}"
+
+
+class ReviewState(models.Model):
+    """
+    Spaced-repetition (SM-2) state for one user and question.
+    Updated on every answer (see questions.scheduling) so the due queue is a
+    single (user, due_at) index range scan.
+    """
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='review_states')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='review_states')
+
+    repetitions = models.PositiveIntegerField(default=0, help_text="Consecutive successful reviews")
+    ease_factor = models.FloatField(default=2.5)
+    interval_days = models.PositiveIntegerField(default=0)
+    lapses = models.PositiveIntegerField(default=0, help_text="Times the question was forgotten")
+
+    due_at = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'question_review_states'
+        unique_together = ['user', 'question']
+        ordering = ['due_at']
+        indexes = [
+            models.Index(fields=['user', 'due_at'], name='review_states_user_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} Q{self.question_id} due {self.due_at}"
+
+
+class UserCategoryRating(models.Model):
+    """
+    Elo rating of a user in one category, played against question ratings.
+    Updated on every answer (see questions.ratings).
+    """
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='category_ratings')
+    category = models.CharField(max_length=20, choices=Question.CATEGORY_CHOICES)
+
+    rating = models.FloatField(default=1500)
+    attempts = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'user_category_ratings'
+        unique_together = ['user', 'category']
+        ordering = ['category']
+
+    def __str__(self):
+        return f"{self.user.username} {self.category}: {self.rating:.0f}"
+
+
+class QuestionStatDelta(models.Model):
+    """
+    Pending change to a question's answer counters and rating.
+    Answers only append rows here; questions.counters folds them into
+    Question in the background, so concurrent answers never wait on the
+    question row.
+    """
+    # Unindexed: the table only holds the unflushed backlog and is read in id order
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='stat_deltas', db_index=False)
+    answered = models.IntegerField(default=1)
+    correct = models.IntegerField(default=0)
+    rating_change = models.FloatField(default=0)
+
+    class Meta:
+        db_table = 'question_stat_deltas'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Q{self.question_id} +{self.answered} answered, +{self.correct} correct"
+
+
+class SearchTerm(models.Model):
+    """
+    Term dictionary for question autocomplete.
+    Rebuilt from question text and answers at import time (see questions.search).
+    """
+    term = models.CharField(max_length=64, unique=True)
+    frequency = models.PositiveIntegerField(default=0, help_text="Number of questions containing the term")
+
+    class Meta:
+        db_table = 'question_search_terms'
+        ordering = ['-frequency', 'term']
+
+    def __str__(self):
+        return f"{self.term} ({self.frequency})"
+
+
+class QuestionTombstone(models.Model):
+    """
+    Records a deleted question so the change feed can report it.
+    Written by the post_delete signal (see questions.signals).
+    """
+    question_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'question_tombstones'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='question_tombstones_keyset_idx'),
+        ]
+
+    def __str__(self):
+        return f"Question {self.question_id} deleted at {self.deleted_at}"
+
+
+class QuestionSignature(models.Model):
+    """
+    MinHash signature of a question's text, for near-duplicate detection.
+    Maintained with the LSH buckets by questions.dedup.
+    """
+    question = models.OneToOneField(
+        Question, on_delete=models.CASCADE, primary_key=True, related_name='signature'
+    )
+    minhash = models.BinaryField(help_text="Packed 64-bit MinHash values")
+
+    class Meta:
+        db_table = 'question_signatures'
+
+    def __str__(self):
+        return f"Signature for Q{self.question_id}"
+
+
+class QuestionLSHBucket(models.Model):
+    """
+    One LSH band of a question's MinHash signature. Questions sharing a
+    (band, bucket) pair are near-duplicate candidates.
+    """
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='lsh_buckets')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        db_table = 'question_lsh_buckets'
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='question_lsh_band_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f"Q{self.question_id} band {self.band}: {self.bucket}"
@@ -0,0 +1,133 @@
+import functools
+
+from django.core.paginator import Paginator
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+
+from .filters import get_shuffle_seed, shuffle_window
+
+
+class ShuffledPaginator(Paginator):
+    """
+    Counts the whole shuffled list but reads a page through shuffle_window(),
+    so only the rows up to that page are sorted by their shuffle rank
+    """
+
+    def __init__(self, object_list, per_page, seed, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.seed = seed
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        window = shuffle_window(self.object_list, self.seed, top)
+        return self._get_page(window[bottom:top], number, self)
+
+
+class QuestionPageNumberPagination(PageNumberPagination):
+    """Page-number pagination reading ?shuffle_seed= pages through ShuffledPaginator"""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        seed = get_shuffle_seed(request)
+        if seed is not None:
+            self.django_paginator_class = functools.partial(ShuffledPaginator, seed=seed)
+        return super().paginate_queryset(queryset, request, view)
+
+
+class QuestionCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (-created_at, id), or over the seeded shuffle
+    rank when ?shuffle_seed= is given.
+
+    No COUNT(*) or OFFSET is issued, so deep pages cost the same as the
+    first one; unshuffled pages are a single index range scan, shuffled
+    ones two (see questions.filters.shuffle_window).
+    """
+    ordering = ('-created_at', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        # The keyset must match the index, so client-supplied ?ordering is ignored
+        if get_shuffle_seed(request) is not None:
+            return ('shuffle_rank', 'id')
+        return self.ordering
+
+    def get_shuffle_window(self, queryset, request):
+        """Narrow a shuffled queryset to the rows the requested page can read"""
+        cursor = self.decode_cursor(request)
+        offset, reverse, position = cursor if cursor is not None else (0, False, None)
+        if position is not None:
+            try:
+                position = int(position)
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+        return shuffle_window(
+            queryset, get_shuffle_seed(request), offset + self.get_page_size(request) + 1,
+            position, descending=reverse,
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if get_shuffle_seed(request) is not None:
+            queryset = self.get_shuffle_window(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_window_queryset(self, queryset, request, view=None):
+        """
+        The rows paginate_queryset() reads for this request's page, plus the
+        one after it, so conditional GET validators cost the same as the page
+        """
+        if get_shuffle_seed(request) is not None:
+            queryset = self.get_shuffle_window(queryset, request)
+        page_size = self.get_page_size(request)
+        ordering = self.get_ordering(request, queryset, view)
+        cursor = self.decode_cursor(request)
+        offset, reverse, position = cursor if cursor is not None else (0, False, None)
+
+        window = queryset.order_by(*(_reverse_ordering(ordering) if reverse else ordering))
+        if position is not None:
+            order = ordering[0]
+            lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+            window = window.filter(**{f'{order.lstrip("-")}__{lookup}': position})
+        return queryset.filter(pk__in=window.values('pk')[offset:offset + page_size + 1])
+
+
+class HistoryCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a user's history, newest first, walking the
+    (user, answered_at) index.
+    """
+    ordering = ('-answered_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class OptionalCursorPaginationMixin:
+    """
+    Lets clients opt in to cursor pagination with ?pagination=cursor.
+
+    Requests without the parameter keep the default page-number pagination,
+    so existing clients see no change.
+    """
+    cursor_pagination_class = None
+    cursor_query_param = 'pagination'
+
+    def use_cursor_pagination(self):
+        return (
+            self.cursor_pagination_class is not None
+            and self.request.query_params.get(self.cursor_query_param) == 'cursor'
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
@@ -0,0 +1,272 @@
+"""
+Monthly partitions and rollups of answer history.
+
+On PostgreSQL, user_question_history can be converted once into a table
+range-partitioned by answered_at, with one partition per calendar month
+(UTC) named user_question_history_pYYYY_MM and a default partition that
+catches rows outside them. Inserts then only touch the indexes of the
+current month, and scans of recent history for a user are pruned to the
+partitions they cover. ensure_partitions() creates partitions ahead of time
+so the default one stays empty.
+
+rollup_history() compacts old history into one UserQuestionSummary row per
+(user, question) and removes the raw rows: partitions wholly before the
+cutoff are detached (and optionally dropped) rather than deleted row by row.
+Unpartitioned tables, including SQLite ones, are rolled up with a DELETE.
+Reads that need every attempt combine history with the summaries.
+
+Both run from ``python manage.py partition_history``.
+"""
+
+import datetime
+import re
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Min, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import UserQuestionHistory, UserQuestionSummary
+
+TABLE = UserQuestionHistory._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_RE = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+
+ROLLUP_BATCH_SIZE = 2000
+
+SUMMARY_TOTALS = ['attempts', 'correct', 'total_time_taken', 'timed_attempts']
+
+
+def month_start(moment):
+    """First instant (UTC) of the month containing ``moment``"""
+    moment = moment.astimezone(datetime.timezone.utc)
+    return datetime.datetime(moment.year, moment.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month.year:04d}_{month.month:02d}'
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [TABLE])
+        return cursor.fetchone() is not None
+
+
+def monthly_partitions():
+    """``[(name, month)]`` of the attached monthly partitions, oldest first"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s)',
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = []
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            month = datetime.datetime(int(match[1]), int(match[2]), 1, tzinfo=datetime.timezone.utc)
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def _create_partition(cursor, month):
+    """
+    Create and attach the partition for ``month``, moving any rows the
+    default partition holds for it (attaching fails while they are there).
+    """
+    name, start, end = partition_name(month), month, add_months(month, 1)
+    qn = connection.ops.quote_name
+    cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} '
+        f'WHERE answered_at >= %s AND answered_at < %s RETURNING *) '
+        f'INSERT INTO {qn(name)} SELECT * FROM moved',
+        [start, end],
+    )
+    cursor.execute(
+        f'ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)',
+        [start, end],
+    )
+    return name
+
+
+def ensure_partitions(months_ahead=3, now=None):
+    """
+    Create any missing partitions from the current month through
+    ``months_ahead`` months after it. Returns the names created.
+    """
+    start = month_start(now or datetime.datetime.now(datetime.timezone.utc))
+    existing = {month for _, month in monthly_partitions()}
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(start, offset)
+            if month not in existing:
+                created.append(_create_partition(cursor, month))
+    return created
+
+
+def convert_to_partitioned(months_ahead=3, now=None):
+    """
+    Rebuild the unpartitioned history table as a partitioned one, with a
+    partition for every month holding rows. Copies every row and takes an
+    exclusive lock on the table until done, so run it in a maintenance window.
+
+    The primary key becomes (id, answered_at), as PostgreSQL requires the
+    partition key in unique constraints; ids stay unique through the sequence.
+    """
+    qn = connection.ops.quote_name
+    legacy = f'{TABLE}_unpartitioned'
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {qn(TABLE)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s "
+            "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'p')",
+            [TABLE, TABLE],
+        )
+        # Definitions name the table, so they apply unchanged to the new one
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f'SELECT min(answered_at), max(id) FROM {qn(TABLE)}')
+        oldest, max_id = cursor.fetchone()
+
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} RENAME TO {qn(legacy)}')
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {qn(name)}')
+        cursor.execute(
+            f'CREATE TABLE {qn(TABLE)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING IDENTITY '
+            f'INCLUDING CONSTRAINTS) PARTITION BY RANGE (answered_at)'
+        )
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} ADD PRIMARY KEY (id, answered_at)')
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(name)} {definition}')
+
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id'), pg_get_serial_sequence(%s, 'id')", [TABLE, legacy])
+        sequence, legacy_sequence = cursor.fetchone()
+        if sequence is None:
+            # A serial column: the copied default still uses the old table's sequence
+            cursor.execute(f'ALTER SEQUENCE {legacy_sequence} OWNED BY {qn(TABLE)}.id')
+        elif max_id is not None:
+            cursor.execute('SELECT setval(%s, %s)', [sequence, max_id])
+
+        cursor.execute(f'CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(TABLE)} DEFAULT')
+        month = month_start(oldest) if oldest else None
+        last = add_months(month_start(now or datetime.datetime.now(datetime.timezone.utc)), months_ahead)
+        month = min(month, last) if month else last
+        while month <= last:
+            cursor.execute(
+                f'CREATE TABLE {qn(partition_name(month))} PARTITION OF {qn(TABLE)} '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [month, add_months(month, 1)],
+            )
+            month = add_months(month, 1)
+
+        cursor.execute(f'INSERT INTO {qn(TABLE)} SELECT * FROM {qn(legacy)}')
+        cursor.execute(f'DROP TABLE {qn(legacy)}')
+        for _, definition in indexes:
+            cursor.execute(definition)
+        cursor.execute(f'ANALYZE {qn(TABLE)}')
+
+
+def _summaries(rows):
+    """Per-(user, question) totals of the history rows in ``rows``"""
+    same = rows.filter(user_id=OuterRef('user_id'), question_id=OuterRef('question_id'))
+    return rows.order_by().values('user_id', 'question_id').annotate(
+        attempts=Count('id'),
+        correct=Count('id', filter=Q(is_correct=True)),
+        total_time_taken=Coalesce(Sum('time_taken'), 0),
+        timed_attempts=Count('time_taken'),
+        first_answered_at=Min('answered_at'),
+        last_answered_at=Max('answered_at'),
+        first_is_correct=Subquery(same.order_by('answered_at', 'id').values('is_correct')[:1]),
+        last_is_correct=Subquery(same.order_by('-answered_at', '-id').values('is_correct')[:1]),
+    )
+
+
+def _merge(groups):
+    existing = {
+        (summary.user_id, summary.question_id): summary
+        for summary in UserQuestionSummary.objects.select_for_update().filter(
+            user_id__in={group['user_id'] for group in groups},
+            question_id__in={group['question_id'] for group in groups},
+        )
+    }
+    created, updated = [], []
+    for group in groups:
+        summary = existing.get((group['user_id'], group['question_id']))
+        if summary is None:
+            created.append(UserQuestionSummary(**group))
+            continue
+        for field in SUMMARY_TOTALS:
+            setattr(summary, field, getattr(summary, field) + group[field])
+        if group['first_answered_at'] < summary.first_answered_at:
+            summary.first_answered_at = group['first_answered_at']
+            summary.first_is_correct = group['first_is_correct']
+        if group['last_answered_at'] >= summary.last_answered_at:
+            summary.last_answered_at = group['last_answered_at']
+            summary.last_is_correct = group['last_is_correct']
+        updated.append(summary)
+    UserQuestionSummary.objects.bulk_create(created)
+    UserQuestionSummary.objects.bulk_update(
+        updated, SUMMARY_TOTALS + ['first_answered_at', 'first_is_correct', 'last_answered_at', 'last_is_correct']
+    )
+
+
+def summarize(rows, batch_size=ROLLUP_BATCH_SIZE):
+    """Add the history rows in ``rows`` to the summaries; returns how many rows were read"""
+    rolled_up, batch = 0, []
+    for group in _summaries(rows).iterator(chunk_size=batch_size):
+        batch.append(group)
+        rolled_up += group['attempts']
+        if len(batch) >= batch_size:
+            _merge(batch)
+            batch = []
+    if batch:
+        _merge(batch)
+    return rolled_up
+
+
+def rollup_history(before, drop=False, batch_size=ROLLUP_BATCH_SIZE):
+    """
+    Summarize and remove history answered before ``before`` (a month start
+    when partitioned; only whole partitions are rolled up). Each partition
+    is summarized and detached in one transaction, oldest first, so an
+    interrupted run resumes where it stopped.
+
+    Returns ``[(partition or None, rows rolled up)]``.
+    """
+    history = UserQuestionHistory.objects.all()
+    if not is_partitioned():
+        with transaction.atomic():
+            rows = history.filter(answered_at__lt=before)
+            count = summarize(rows, batch_size)
+            rows.delete()
+        return [(None, count)] if count else []
+
+    qn = connection.ops.quote_name
+    done = []
+    for name, month in monthly_partitions():
+        if add_months(month, 1) > before:
+            break
+        with transaction.atomic():
+            rows = history.filter(answered_at__gte=month, answered_at__lt=add_months(month, 1))
+            count = summarize(rows, batch_size)
+            with connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}')
+                if drop:
+                    cursor.execute(f'DROP TABLE {qn(name)}')
+        done.append((name, count))
+    return done
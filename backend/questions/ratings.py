@@ -0,0 +1,131 @@
+"""
+Online Elo ratings for users (per category) and questions.
+
+Every answer is a game between the user's rating in the question's category
+and the question's own rating: a correct answer moves the user up and the
+question down by K * (1 - expected), a miss the other way. K starts high so
+new users and questions settle quickly and shrinks towards MIN_K as their
+answer counts grow, a cheap stand-in for Glicko's rating deviation.
+
+Each update touches one user rating row and queues the question's change
+as a counter delta, so it costs the same however long the history is.
+Recommendations then look for questions whose rating is near the user's
+with a range scan over the (category, rating) index.
+"""
+
+import math
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Question, UserCategoryRating, UserQuestionHistory, UserQuestionSummary
+
+INITIAL_RATING = 1500.0
+SCALE = 400.0
+
+MAX_K = 64.0
+MIN_K = 16.0
+PROVISIONAL_ANSWERS = 20
+
+# Recommend questions the user answers correctly this often
+TARGET_SUCCESS = 0.6
+
+
+def expected_score(user_rating, question_rating):
+    """Probability that a user at ``user_rating`` answers the question correctly"""
+    return 1 / (1 + 10 ** ((question_rating - user_rating) / SCALE))
+
+
+def k_factor(answers):
+    return max(MIN_K, MAX_K * PROVISIONAL_ANSWERS / (PROVISIONAL_ANSWERS + answers))
+
+
+def rate(user_rating, user_answers, question_rating, question_answers, is_correct):
+    """Return the ``(user_rating, question_rating)`` after one answer"""
+    surprise = (1.0 if is_correct else 0.0) - expected_score(user_rating, question_rating)
+    return (
+        user_rating + k_factor(user_answers) * surprise,
+        question_rating - k_factor(question_answers) * surprise,
+    )
+
+
+def target_rating(user_rating, success=TARGET_SUCCESS):
+    """Question rating a user at ``user_rating`` answers correctly with probability ``success``"""
+    return user_rating - SCALE * math.log10(success / (1 - success))
+
+
+def get_rating(user, category):
+    rating = UserCategoryRating.objects.filter(user=user, category=category).values_list('rating', flat=True).first()
+    return INITIAL_RATING if rating is None else rating
+
+
+def record_ratings(histories):
+    """
+    Update users' category ratings for new UserQuestionHistory rows, in list
+    order, and return the total change to each question's rating
+    (``{question_id: change}``, queued by the caller with its other
+    counters, see questions.counters).
+    """
+    with transaction.atomic():
+        states = {
+            (state.user_id, state.category): state
+            # Locked in pk order, so overlapping batches cannot deadlock
+            for state in UserCategoryRating.objects.select_for_update().filter(
+                user_id__in={history.user_id for history in histories},
+                category__in={history.question.category for history in histories},
+            ).order_by('pk')
+        }
+        existing = set(states)
+        changes = defaultdict(float)
+        answers = defaultdict(int)
+        for history in histories:
+            question = history.question
+            key = (history.user_id, question.category)
+            if key not in states:
+                states[key] = UserCategoryRating(user_id=history.user_id, category=question.category, rating=INITIAL_RATING)
+            state = states[key]
+
+            question_rating = question.rating + changes[question.pk]
+            state.rating, new_question_rating = rate(
+                state.rating, state.attempts,
+                question_rating, question.times_answered + answers[question.pk],
+                history.is_correct,
+            )
+            state.attempts += 1
+            changes[question.pk] += new_question_rating - question_rating
+            answers[question.pk] += 1
+
+        try:
+            with transaction.atomic():
+                UserCategoryRating.objects.bulk_create([state for key, state in states.items() if key not in existing])
+        except IntegrityError:
+            # A concurrent answer created one of the rows first; rate these on top of it
+            return record_ratings(histories)
+        now = timezone.now()
+        for key in existing:
+            states[key].updated_at = now
+        UserCategoryRating.objects.bulk_update(
+            [states[key] for key in existing], ['rating', 'attempts', 'updated_at']
+        )
+        return dict(changes)
+
+
+def recommend(user, category, count, queryset=None):
+    """
+    Return up to ``count`` questions in ``category`` rated nearest the
+    user's target, skipping questions they have already answered correctly.
+    Walks the (category, rating) index outwards from the target in both directions.
+    """
+    if queryset is None:
+        queryset = Question.objects.all()
+    target = target_rating(get_rating(user, category))
+
+    candidates = queryset.filter(category=category).filter(
+        ~Exists(UserQuestionHistory.objects.filter(user=user, question=OuterRef('pk'), is_correct=True)),
+        ~Exists(UserQuestionSummary.objects.filter(user=user, question=OuterRef('pk'), correct__gt=0)),
+    )
+    harder = list(candidates.filter(rating__gte=target).order_by('rating', 'id')[:count])
+    easier = list(candidates.filter(rating__lt=target).order_by('-rating', 'id')[:count])
+    return sorted(harder + easier, key=lambda question: abs(question.rating - target))[:count]
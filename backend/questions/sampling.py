@@ -0,0 +1,117 @@
+"""
+Uniform random sampling of questions without ORDER BY RANDOM().
+
+Question ids are grouped into buckets keyed by every filterable field
+(category, question_type, question_style, source). The index is built once per
+process with a single streaming query and reused until its version changes,
+at which point the next request rebuilds it. The version combines the
+question generation (see questions.cache), bumped by writes that go through
+the ORM signals, with the question table's latest updated_at and row count,
+read at most every VERSION_CHECK_INTERVAL seconds, which also catch bulk
+writes from other processes.
+
+Drawing n questions is then O(buckets + n): pick n distinct positions in the
+concatenation of the matching buckets and map each one back to its bucket
+with a binary search over the cumulative bucket sizes.
+"""
+
+import bisect
+import random
+import threading
+import time
+from array import array
+
+from django.db.models import Count, Max
+
+from .cache import get_question_generation
+
+BUCKET_FIELDS = ('category', 'question_type', 'question_style', 'source')
+
+# Seconds between reads of the question table's version
+VERSION_CHECK_INTERVAL = 10
+
+_index = None
+_index_lock = threading.Lock()
+# (table version, time.monotonic() it was read at)
+_table_version = (None, None)
+
+
+class SamplingIndex:
+    """Question ids grouped by (category, question_type, question_style, source)"""
+
+    def __init__(self, version, buckets):
+        self.version = version
+        self.buckets = buckets
+
+    @classmethod
+    def build(cls, version, chunk_size=5000):
+        from .models import Question
+
+        buckets = {}
+        rows = Question.objects.order_by().values_list(*BUCKET_FIELDS, 'id')
+        for *key, question_id in rows.iterator(chunk_size=chunk_size):
+            key = tuple(key)
+            if key not in buckets:
+                buckets[key] = array('q')
+            buckets[key].append(question_id)
+        return cls(version, buckets)
+
+    def sample(self, filters, n, rng=random):
+        """
+        Return up to ``n`` distinct question ids drawn uniformly from the buckets
+        matching ``filters``, a mapping of bucket field to allowed values.
+        """
+        matching = [
+            ids for key, ids in self.buckets.items()
+            if all(
+                key[i] in filters[field]
+                for i, field in enumerate(BUCKET_FIELDS) if field in filters
+            )
+        ]
+
+        offsets = []
+        total = 0
+        for ids in matching:
+            offsets.append(total)
+            total += len(ids)
+
+        positions = rng.sample(range(total), min(n, total))
+        sampled = []
+        for position in positions:
+            bucket = bisect.bisect_right(offsets, position) - 1
+            sampled.append(matching[bucket][position - offsets[bucket]])
+        return sampled
+
+
+def get_table_version():
+    """The question table's latest updated_at and row count, re-read at most every VERSION_CHECK_INTERVAL seconds"""
+    global _table_version
+    from .models import Question
+
+    version, checked_at = _table_version
+    now = time.monotonic()
+    if checked_at is None or now - checked_at >= VERSION_CHECK_INTERVAL:
+        values = Question.objects.order_by().aggregate(last=Max('updated_at'), count=Count('id'))
+        version = (values['last'], values['count'])
+        _table_version = (version, now)
+    return version
+
+
+def get_sampling_index():
+    """Return this process's sampling index, rebuilding it if it is stale"""
+    global _index
+
+    version = (get_question_generation(), get_table_version())
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = SamplingIndex.build(version)
+        return _index
+
+
+def sample_question_ids(filters, n):
+    """Sample up to ``n`` question ids matching ``filters`` (see SamplingIndex.sample)"""
+    return get_sampling_index().sample(filters, n)
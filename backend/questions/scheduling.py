@@ -0,0 +1,100 @@
+"""
+SM-2 spaced-repetition scheduling.
+
+Every answer is graded 0-5 from its correctness and answer time and moves the
+user's ReviewState for that question to its next due date: successful
+reviews space out by the ease factor (1 day, 6 days, then interval x ease),
+failures come back after RELEARN_DELAY and lower the ease.
+
+State is updated incrementally as answers arrive, so reading the due queue
+never has to replay history.
+"""
+
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+
+from .models import ReviewState
+
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_QUALITY = 3
+RELEARN_DELAY = timedelta(minutes=10)
+
+# Correct answers faster / slower than these grade as easy / hard
+FAST_ANSWER_SECONDS = 5
+SLOW_ANSWER_SECONDS = 20
+
+
+def answer_quality(is_correct, time_taken=None):
+    """SM-2 quality (0-5) for an answer"""
+    if not is_correct:
+        return 1
+    if time_taken is None:
+        return 4
+    if time_taken <= FAST_ANSWER_SECONDS:
+        return 5
+    if time_taken >= SLOW_ANSWER_SECONDS:
+        return 3
+    return 4
+
+
+def apply_review(state, quality, reviewed_at):
+    """Advance ``state`` (saved or not) by one review of the given quality"""
+    if quality >= PASSING_QUALITY:
+        if state.repetitions == 0:
+            state.interval_days = 1
+        elif state.repetitions == 1:
+            state.interval_days = 6
+        else:
+            state.interval_days = round(state.interval_days * state.ease_factor)
+        state.repetitions += 1
+        state.due_at = reviewed_at + timedelta(days=state.interval_days)
+    else:
+        if state.repetitions > 0:
+            state.lapses += 1
+        state.repetitions = 0
+        state.interval_days = 0
+        state.due_at = reviewed_at + RELEARN_DELAY
+
+    state.ease_factor = max(
+        MIN_EASE,
+        state.ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02),
+    )
+    state.last_reviewed_at = reviewed_at
+    return state
+
+
+def new_review_state(user_id, question_id):
+    return ReviewState(user_id=user_id, question_id=question_id, ease_factor=INITIAL_EASE)
+
+
+def record_reviews(histories):
+    """Update review states for new UserQuestionHistory rows, applied in list order"""
+    with transaction.atomic():
+        states = {
+            (state.user_id, state.question_id): state
+            # Locked in pk order, so overlapping batches cannot deadlock
+            for state in ReviewState.objects.select_for_update().filter(
+                user_id__in={history.user_id for history in histories},
+                question_id__in={history.question_id for history in histories},
+            ).order_by('pk')
+        }
+        existing = set(states)
+        for history in histories:
+            key = (history.user_id, history.question_id)
+            if key not in states:
+                states[key] = new_review_state(*key)
+            apply_review(states[key], answer_quality(history.is_correct, history.time_taken), history.answered_at)
+
+        try:
+            with transaction.atomic():
+                ReviewState.objects.bulk_create([state for key, state in states.items() if key not in existing])
+        except IntegrityError:
+            # A concurrent answer created one of the rows first; apply these on top of it
+            return record_reviews(histories)
+        ReviewState.objects.bulk_update(
+            [states[key] for key in existing],
+            ['repetitions', 'ease_factor', 'interval_days', 'lapses', 'due_at', 'last_reviewed_at'],
+        )
+        return list(states.values())
@@ -0,0 +1,189 @@
+"""
+Search engine for questions.
+
+On PostgreSQL, questions are matched against the GIN-indexed ``search_vector``
+column (kept up to date by a database trigger, see migration 0010) and ranked
+with ``ts_rank``. Fuzzy mode uses pg_trgm word similarity so misspelled terms
+still match. Other databases (SQLite in the test settings) fall back to
+case-insensitive substring matching, with typos corrected against the
+autocomplete term dictionary.
+"""
+
+import difflib
+import re
+from collections import Counter
+
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank, TrigramSimilarity, TrigramWordSimilarity,
+)
+from django.db import connections, transaction
+from django.db.models import F, FloatField, Q, TextField, Value
+from django.db.models.functions import Greatest
+
+SEARCH_CONFIG = 'english'
+
+# Columns covered by search_vector, in weight order (A, B, C)
+SEARCH_FIELDS = [
+    'question_text', 'correct_answer',
+    'option_1', 'option_2', 'option_3', 'option_4',
+]
+
+
+# Words shorter than this are not worth suggesting
+MIN_TERM_LENGTH = 3
+MAX_TERM_LENGTH = 64
+
+TERM_RE = re.compile(r"[a-z][a-z0-9'-]*[a-z0-9]")
+
+STOP_WORDS = frozenset("""
+    about above after again against all also and any are because been before being
+    below between both but can could did does doing down during each few for from
+    further had has have having her here hers him his how into its itself just more
+    most much not now off once only other our ours out over own same she should
+    some such than that the their theirs them then there these they this those
+    through too under until very was were what when where which while who whom why
+    will with would you your following
+""".split())
+
+
+def supports_full_text_search(queryset):
+    """Return True if the queryset's database has PostgreSQL full-text search"""
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def full_text_search(queryset, text):
+    """
+    Filter a Question queryset by ``text`` and annotate ``search_rank`` and
+    ``search_snippet`` (question text with matches wrapped in <mark> tags).
+    """
+    if not supports_full_text_search(queryset):
+        return _fallback_search(queryset, text)
+
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F('search_vector'), query),
+        search_snippet=SearchHeadline(
+            'question_text', query,
+            config=SEARCH_CONFIG,
+            start_sel='<mark>', stop_sel='</mark>',
+            max_fragments=2,
+        ),
+    )
+
+
+def _fallback_search(queryset, text):
+    """Every term must appear in at least one searchable column"""
+    for term in text.replace('"', ' ').split():
+        term_q = Q()
+        for field in SEARCH_FIELDS:
+            term_q |= Q(**{f'{field}__icontains': term})
+        queryset = queryset.filter(term_q)
+    return queryset.annotate(
+        search_rank=Value(None, output_field=FloatField()),
+        search_snippet=Value(None, output_field=TextField()),
+    )
+
+
+def fuzzy_search(queryset, text):
+    """
+    Typo-tolerant search over question text and answers, annotated like
+    full_text_search (search_snippet is always None).
+    """
+    if not supports_full_text_search(queryset):
+        corrected = ' '.join(correct_terms(text)) or text
+        return _fallback_search(queryset, corrected)
+
+    return queryset.filter(
+        Q(question_text__trigram_word_similar=text) | Q(correct_answer__trigram_word_similar=text)
+    ).annotate(
+        search_rank=Greatest(
+            TrigramWordSimilarity(text, 'question_text'),
+            TrigramWordSimilarity(text, 'correct_answer'),
+        ),
+        search_snippet=Value(None, output_field=TextField()),
+    )
+
+
+def extract_terms(text):
+    """Return the set of dictionary-worthy terms in ``text``"""
+    if not text:
+        return set()
+    return {
+        term for term in TERM_RE.findall(text.lower())
+        if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH and term not in STOP_WORDS
+    }
+
+
+def rebuild_search_terms(chunk_size=2000):
+    """
+    Rebuild the autocomplete term dictionary from every question.
+    Returns the number of distinct terms.
+    """
+    from .models import Question, SearchTerm
+
+    frequencies = Counter()
+    rows = Question.objects.values_list('question_text', 'correct_answer')
+    for question_text, correct_answer in rows.iterator(chunk_size=chunk_size):
+        frequencies.update(extract_terms(question_text) | extract_terms(correct_answer))
+
+    with transaction.atomic():
+        SearchTerm.objects.all().delete()
+        SearchTerm.objects.bulk_create(
+            [SearchTerm(term=term, frequency=count) for term, count in frequencies.items()],
+            batch_size=1000,
+        )
+    return len(frequencies)
+
+
+def autocomplete(prefix, limit=10):
+    """
+    Return up to ``limit`` dictionary terms for ``prefix`` as (term, frequency)
+    pairs, most frequent first. When there are too few prefix matches, the
+    closest misspelling matches are appended.
+    """
+    from .models import SearchTerm
+
+    prefix = prefix.strip().lower()
+    if not prefix:
+        return []
+
+    terms = SearchTerm.objects.all()
+    matches = list(
+        terms.filter(term__startswith=prefix).values_list('term', 'frequency')[:limit]
+    )
+    if len(matches) >= limit or len(prefix) < MIN_TERM_LENGTH:
+        return matches
+
+    seen = {term for term, _frequency in matches}
+    if supports_full_text_search(terms):
+        similar = terms.annotate(
+            similarity=TrigramSimilarity('term', prefix),
+        ).filter(
+            term__trigram_similar=prefix,
+        ).exclude(
+            term__in=seen,
+        ).order_by('-similarity', '-frequency').values_list('term', 'frequency')[:limit - len(matches)]
+        return matches + list(similar)
+
+    frequencies = dict(terms.values_list('term', 'frequency'))
+    close = difflib.get_close_matches(prefix, frequencies, n=limit, cutoff=0.75)
+    matches.extend((term, frequencies[term]) for term in close if term not in seen)
+    return matches[:limit]
+
+
+def correct_terms(text):
+    """
+    Replace each word in ``text`` with its closest dictionary term.
+    Used by the non-PostgreSQL fuzzy search fallback.
+    """
+    from .models import SearchTerm
+
+    dictionary = set(SearchTerm.objects.values_list('term', flat=True))
+    corrected = []
+    for word in text.lower().split():
+        if word in dictionary:
+            corrected.append(word)
+            continue
+        close = difflib.get_close_matches(word, dictionary, n=1, cutoff=0.75)
+        corrected.append(close[0] if close else word)
+    return corrected
@@ -1,8 +1,110 @@
+from operator import itemgetter
+
+from django.db import transaction
 from rest_framework import serializers
-from .models import Question, UserQuestionHistory, Bookmark
+from .models import Question, UserQuestionHistory, Bookmark, ReviewState, UserCategoryRating
+from .services import record_attempt, record_attempts
+from .user_state import USER_STATE_FIELDS
+
+# Per-user annotations added by questions.user_state.annotate_user_state
+USER_STATE_DEPENDENCIES = {name: [] for name in USER_STATE_FIELDS}
+USER_STATE_PROJECTION = {name: (itemgetter(name), []) for name in USER_STATE_FIELDS}
+
+
+def is_root_serializer(serializer):
+    """True for the serializer (or list child) rendering the response itself"""
+    parent = serializer.parent
+    if isinstance(parent, serializers.ListSerializer):
+        parent = parent.parent
+    return parent is None
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients trim a response with ?fields=id,category or ?omit=explanation.
+
+    Only the top-level serializer of a request is trimmed; nested serializers
+    keep every field. Names that are not fields of the serializer are
+    rejected with a 400 listing them. Meta.field_dependencies maps non-model
+    fields to the model columns they read (empty for queryset annotations).
+    """
+    fields_param = 'fields'
+    omit_param = 'omit'
+
+    def _param_names(self, request, param):
+        value = request.query_params.get(param, '')
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or not is_root_serializer(self):
+            return fields
+
+        requested = self._param_names(request, self.fields_param)
+        omitted = self._param_names(request, self.omit_param)
+        # Declared fields left out for this request (e.g. user state when signed out) are still known
+        known = set(fields) | set(self.Meta.fields)
+        errors = {
+            param: [f"Unknown fields: {', '.join(sorted(names - known))}"]
+            for param, names in ((self.fields_param, requested), (self.omit_param, omitted))
+            if names - known
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+        return {
+            name: field for name, field in fields.items()
+            if (not requested or name in requested) and name not in omitted
+        }
+
+    def get_model_field_names(self):
+        """
+        Model columns needed to render the selected fields, for
+        QuerySet.only(); None if some field's needs are unknown.
+        """
+        model_fields = {f.name for f in self.Meta.model._meta.concrete_fields}
+        dependencies = getattr(self.Meta, 'field_dependencies', {})
+
+        needed = {'id'}
+        for name, field in self.fields.items():
+            if field.source in model_fields:
+                needed.add(field.source)
+            elif name in dependencies:
+                needed.update(dependencies[name])
+            else:
+                return None
+        return needed
+
+    def narrow_queryset(self, queryset, *always):
+        """Restrict ``queryset`` to the columns this serializer renders"""
+        names = self.get_model_field_names()
+        if names is None:
+            return queryset
+        return queryset.only(*names, *always)
 
 
-class QuestionSerializer(serializers.ModelSerializer):
+class UserStateSerializer(serializers.Serializer):
+    """
+    The requesting user's state for a question: is_bookmarked,
+    last_attempt_correct (null if never answered) and attempt_count.
+    Only rendered at the top level of authenticated requests whose context
+    sets ``user_state`` (the queryset is then annotated with it).
+    """
+    is_bookmarked = serializers.BooleanField(read_only=True)
+    last_attempt_correct = serializers.BooleanField(read_only=True, allow_null=True)
+    attempt_count = serializers.IntegerField(read_only=True)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if (request is None or not request.user.is_authenticated or not self.context.get('user_state')
+                or not is_root_serializer(self)):
+            for name in USER_STATE_FIELDS:
+                fields.pop(name, None)
+        return fields
+
+
+class QuestionSerializer(SparseFieldsetMixin, UserStateSerializer, serializers.ModelSerializer):
     """Serializer for Question model - includes answers (for admin/review)"""
 
     accuracy_rate = serializers.ReadOnlyField()
@@ -14,11 +116,12 @@ class QuestionSerializer(serializers.ModelSerializer):
             'correct_answer', 'option_1', 'option_2', 'option_3', 'option_4',
             'source', 'explanation', 'times_answered', 'times_correct',
             'accuracy_rate', 'created_at', 'updated_at'
-        ]
+        ] + USER_STATE_FIELDS
         read_only_fields = ['id', 'times_answered', 'times_correct', 'created_at', 'updated_at']
+        field_dependencies = {'accuracy_rate': ['times_answered', 'times_correct'], **USER_STATE_DEPENDENCIES}
 
 
-class QuestionListSerializer(serializers.ModelSerializer):
+class QuestionListSerializer(SparseFieldsetMixin, UserStateSerializer, serializers.ModelSerializer):
     """Simplified serializer for question lists (with answers) - for practice/quiz"""
 
     class Meta:
@@ -26,7 +129,38 @@ class QuestionListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'question_text', 'category', 'question_type', 'question_style',
             'correct_answer', 'option_1', 'option_2', 'option_3', 'option_4', 'source'
-        ]
+        ] + USER_STATE_FIELDS
+        field_dependencies = USER_STATE_DEPENDENCIES
+        projection_computed = USER_STATE_PROJECTION
+
+
+class QuestionSearchResultSerializer(QuestionListSerializer):
+    """Question list entry with search relevance and a highlighted snippet"""
+
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = serializers.CharField(read_only=True)
+
+    class Meta(QuestionListSerializer.Meta):
+        fields = QuestionListSerializer.Meta.fields + ['search_rank', 'search_snippet']
+        field_dependencies = {**USER_STATE_DEPENDENCIES, 'search_rank': [], 'search_snippet': []}
+        # Both are queryset annotations added by QuestionSearchFilter
+        projection_computed = {
+            **USER_STATE_PROJECTION,
+            'search_rank': (itemgetter('search_rank'), []),
+            'search_snippet': (itemgetter('search_snippet'), []),
+        }
+
+
+class QuestionBulkRequestSerializer(serializers.Serializer):
+    """Validates the id list for the bulk question endpoint"""
+
+    MAX_IDS = 200
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
 
 
 class UserQuestionHistorySerializer(serializers.ModelSerializer):
@@ -45,16 +179,63 @@ class UserQuestionHistorySerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
-        history = super().create(validated_data)
+        with transaction.atomic():
+            history = super().create(validated_data)
+            # Question statistics and review scheduling
+            record_attempt(history)
+        return history
 
-        # Update question statistics
-        question = history.question
-        question.times_answered += 1
-        if history.is_correct:
-            question.times_correct += 1
-        question.save()
 
-        return history
+class UserQuestionHistoryBatchSerializer(serializers.Serializer):
+    """Records a whole practice session's answers at once, in the order given"""
+
+    MAX_ATTEMPTS = 100
+
+    attempts = UserQuestionHistorySerializer(many=True, allow_empty=False, max_length=MAX_ATTEMPTS)
+
+    def validate_attempts(self, attempts):
+        question_ids = {attempt['question_id'] for attempt in attempts}
+        questions = Question.objects.in_bulk(question_ids)
+        missing = sorted(question_ids - set(questions))
+        if missing:
+            raise serializers.ValidationError(
+                f"Unknown question ids: {', '.join(str(pk) for pk in missing)}"
+            )
+        for attempt in attempts:
+            attempt['question'] = questions[attempt.pop('question_id')]
+        return attempts
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        histories = [
+            UserQuestionHistory(user=user, category=attempt['question'].category, **attempt)
+            for attempt in validated_data['attempts']
+        ]
+        with transaction.atomic():
+            UserQuestionHistory.objects.bulk_create(histories)
+            record_attempts(histories)
+        return histories
+
+
+class ReviewStateSerializer(serializers.ModelSerializer):
+    """Serializer for a question in the user's spaced-repetition queue"""
+
+    question = QuestionListSerializer(read_only=True)
+
+    class Meta:
+        model = ReviewState
+        fields = [
+            'question', 'due_at', 'last_reviewed_at', 'interval_days',
+            'repetitions', 'ease_factor', 'lapses'
+        ]
+
+
+class UserCategoryRatingSerializer(serializers.ModelSerializer):
+    """Serializer for a user's rating in one category"""
+
+    class Meta:
+        model = UserCategoryRating
+        fields = ['category', 'rating', 'attempts', 'updated_at']
 
 
 class BookmarkSerializer(serializers.ModelSerializer):
@@ -0,0 +1,48 @@
+"""
+Side effects of recording an answer.
+
+Every path that creates UserQuestionHistory rows goes through
+record_attempt() or record_attempts() so question statistics and per-user
+state stay in step with the history table.
+"""
+
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+
+from .counters import add_stat_deltas
+from .ratings import record_ratings
+from .scheduling import record_reviews
+
+
+def update_user_stats(histories):
+    """Count answers on the users' profile totals without reading them first"""
+    totals = defaultdict(lambda: [0, 0])
+    for history in histories:
+        totals[history.user_id][0] += 1
+        totals[history.user_id][1] += int(history.is_correct)
+    for user_id, (answered, correct) in totals.items():
+        get_user_model().objects.filter(pk=user_id).update(
+            total_questions_answered=F('total_questions_answered') + answered,
+            correct_answers=F('correct_answers') + correct,
+        )
+
+
+def record_attempts(histories):
+    """
+    Apply everything that follows from newly created history rows, in list
+    order. Costs a fixed number of statements however many rows there are
+    (per distinct user for the profile totals).
+    """
+    with transaction.atomic():
+        # Question counters and ratings are queued, never updated in place
+        add_stat_deltas(histories, record_ratings(histories))
+        update_user_stats(histories)
+        record_reviews(histories)
+
+
+def record_attempt(history):
+    """Apply everything that follows from a newly created history row"""
+    record_attempts([history])
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_question_version, invalidate_question_caches
+from .dedup import index_question
+from .models import Question, QuestionTombstone, UserQuestionHistory
+
+# Saves that only touch these fields leave lists, search and sampling unchanged
+STAT_FIELDS = frozenset({'times_answered', 'times_correct', 'rating', 'updated_at', 'stats_updated_at'})
+
+
+@receiver(post_save, sender=Question)
+def question_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created and update_fields and set(update_fields) <= STAT_FIELDS:
+        bump_question_version(instance.pk)
+        return
+    index_question(instance)
+    if not created:
+        # History rows keep a copy of the category for their list filters
+        UserQuestionHistory.objects.filter(question=instance).exclude(
+            category=instance.category
+        ).update(category=instance.category)
+    invalidate_question_caches()
+
+
+@receiver(post_delete, sender=Question)
+def question_deleted(sender, instance, **kwargs):
+    # Lets the change feed report the deletion
+    QuestionTombstone.objects.create(question_id=instance.pk)
+    invalidate_question_caches()
@@ -0,0 +1,280 @@
+"""
+Versioned offline snapshots of the question bank.
+
+build_snapshot() writes the bank as content-hashed JSON files (optionally one
+per category) with .gz and, when the brotli package is installed, .br
+siblings that WhiteNoise hands to clients accepting those encodings. A file
+never changes once written, so it is served with immutable cache headers.
+
+Every build also records a digest per question for its version. Comparing it
+with the digests of earlier versions yields small delta files (upserted
+records and deleted ids), so a client that synced once only downloads what
+changed. manifest.json lists the current files and the deltas to reach them.
+
+Builds take an exclusive lock on QUESTION_SNAPSHOT_ROOT/.build.lock (where
+fcntl is available) for the whole build and prune, so two builders sharing
+the directory run one after the other instead of pruning each other's files.
+
+Layout under QUESTION_SNAPSHOT_ROOT:
+    files/      public, served at QUESTION_SNAPSHOT_URL
+    index/      per-version question digests used to compute deltas
+    manifest.json
+"""
+
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.utils import timezone
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.string_utils import ensure_leading_trailing_slash
+
+from backend.projection import Projection
+from .export import EXPORT_CHUNK_SIZE
+from .models import Question
+from .serializers import QuestionListSerializer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: builds are not serialized
+    fcntl = None
+
+SNAPSHOT_FORMAT = 1
+HASH_LENGTH = 16
+DEFAULT_KEEP = 10
+HASHED_NAME_RE = re.compile(rf'\.[0-9a-f]{{{HASH_LENGTH}}}\.json$')
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def _root():
+    return settings.QUESTION_SNAPSHOT_ROOT
+
+
+def _files_dir():
+    return os.path.join(_root(), 'files')
+
+
+def _index_path(version):
+    return os.path.join(_root(), 'index', f'{version}.json')
+
+
+def _manifest_path():
+    return os.path.join(_root(), 'manifest.json')
+
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp() creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def _build_lock():
+    """Hold the snapshot root's build lock, waiting for any other builder"""
+    os.makedirs(_root(), exist_ok=True)
+    with open(os.path.join(_root(), '.build.lock'), 'a') as f:
+        if fcntl is not None:
+            # Released when the file is closed
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def _write_file(stem, data):
+    """Write ``data`` as ``<stem>.<hash>.json`` plus compressed siblings"""
+    digest = hashlib.sha256(data).hexdigest()
+    name = f'{stem}.{digest[:HASH_LENGTH]}.json'
+    path = os.path.join(_files_dir(), name)
+
+    if not os.path.exists(path):
+        _write_atomic(f'{path}.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write_atomic(f'{path}.br', brotli.compress(data))
+        # Written last: a present .json means its siblings are complete
+        _write_atomic(path, data)
+
+    return {
+        'name': name,
+        'url': ensure_leading_trailing_slash(settings.QUESTION_SNAPSHOT_URL) + name,
+        'sha256': digest,
+        'size': len(data),
+        'gzip_size': os.path.getsize(f'{path}.gz'),
+    }
+
+
+def load_manifest():
+    """Return the current snapshot manifest, or None if none was built"""
+    try:
+        with open(_manifest_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _load_index(version):
+    try:
+        with open(_index_path(version), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _snapshot_records():
+    """Yield (id, category, encoded record) for every question, by id"""
+    projection = Projection.for_serializer(QuestionListSerializer())
+    rows = projection.values(Question.objects.order_by('id'))
+    for record in projection.iter_representation(rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)):
+        yield record['id'], record['category'], _encode(record)
+
+
+def _json_array(lines):
+    return ('[' + ','.join(lines) + ']').encode()
+
+
+def build_snapshot(split_by_category=False, keep=DEFAULT_KEEP):
+    """
+    Build a snapshot of the current question bank.
+
+    Deltas are written from each of the last ``keep`` versions. Returns
+    ``(manifest, built)``; ``built`` is False when the bank is unchanged
+    since the current snapshot.
+    """
+    with _build_lock():
+        return _build_snapshot(split_by_category, keep)
+
+
+def _build_snapshot(split_by_category, keep):
+    os.makedirs(_files_dir(), exist_ok=True)
+    groups = {}
+    lines_by_id = {}
+    index = {}
+    for question_id, category, line in _snapshot_records():
+        key = str(question_id)
+        index[key] = hashlib.sha256(line.encode()).hexdigest()[:HASH_LENGTH]
+        lines_by_id[key] = line
+        groups.setdefault(category if split_by_category else None, []).append(line)
+
+    version = hashlib.sha256(_encode(index).encode()).hexdigest()[:HASH_LENGTH]
+    previous = load_manifest()
+    if (previous and previous['version'] == version
+            and previous['split_by_category'] == split_by_category):
+        return previous, False
+
+    _write_atomic(_index_path(version), _encode(index).encode())
+
+    files = []
+    for category, lines in groups.items():
+        stem = f'questions-{category.lower()}' if category else 'questions'
+        files.append({'category': category, 'count': len(lines), **_write_file(stem, _json_array(lines))})
+
+    history = [version] + [v for v in (previous or {}).get('history', []) if v != version]
+    history = history[:keep + 1]
+
+    deltas = []
+    for old_version in history[1:]:
+        old_index = _load_index(old_version)
+        if old_index is None:
+            continue
+        upserts = [key for key, digest in index.items() if old_index.get(key) != digest]
+        deletes = [int(key) for key in old_index if key not in index]
+        data = (
+            f'{{"from":"{old_version}","to":"{version}","upserts":'
+            + _json_array(lines_by_id[key] for key in upserts).decode()
+            + f',"deletes":{_encode(deletes)}}}'
+        ).encode()
+        deltas.append({
+            'from': old_version,
+            'upserts': len(upserts),
+            'deletes': len(deletes),
+            **_write_file(f'delta-{old_version}', data),
+        })
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'version': version,
+        'built_at': timezone.now().isoformat(),
+        'count': len(index),
+        'split_by_category': split_by_category,
+        'files': files,
+        'deltas': deltas,
+        'history': history,
+    }
+    _write_atomic(_manifest_path(), _encode(manifest).encode())
+    _prune(manifest, previous)
+    return manifest, True
+
+
+def _prune(manifest, previous):
+    """
+    Remove files no longer referenced. Files of the previous manifest are
+    kept for one more build so in-flight downloads can finish.
+    """
+    referenced = set()
+    for entry in (manifest, previous or {}):
+        for item in entry.get('files', []) + entry.get('deltas', []):
+            referenced.add(item['name'])
+    referenced |= {name + suffix for name in referenced for suffix in COMPRESSED_SUFFIXES}
+
+    for name in os.listdir(_files_dir()):
+        if name not in referenced:
+            os.remove(os.path.join(_files_dir(), name))
+
+    versions = set(manifest['history'])
+    index_dir = os.path.dirname(_index_path(manifest['version']))
+    for name in os.listdir(index_dir):
+        if name.removesuffix('.json') not in versions:
+            os.remove(os.path.join(index_dir, name))
+
+
+class SnapshotWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, also serving snapshot files at QUESTION_SNAPSHOT_URL.
+    Content-hashed files get immutable cache headers, and files built after
+    startup are picked up on their first request.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        # Set before WhiteNoise scans its files, which calls immutable_file_test()
+        self.snapshot_url = ensure_leading_trailing_slash(settings.QUESTION_SNAPSHOT_URL)
+        self.snapshot_dir = os.path.join(os.path.abspath(settings.QUESTION_SNAPSHOT_ROOT), 'files')
+        super().__init__(get_response, settings)
+        if self.autorefresh or os.path.isdir(self.snapshot_dir):
+            self.add_files(self.snapshot_dir, prefix=self.snapshot_url)
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.snapshot_url):
+            return bool(HASHED_NAME_RE.search(url))
+        return super().immutable_file_test(path, url)
+
+    def __call__(self, request):
+        url = request.path_info
+        if (not self.autorefresh and url.startswith(self.snapshot_url)
+                and url not in self.files and HASHED_NAME_RE.search(url)):
+            path = os.path.join(self.snapshot_dir, url[len(self.snapshot_url):])
+            if os.path.dirname(path) == self.snapshot_dir and os.path.isfile(path):
+                self.files[url] = self.get_static_file(path, url)
+        return super().__call__(request)
@@ -1,9 +1,33 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock, skipIf
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from questions.models import Question, UserQuestionHistory, Bookmark
+from questions import snapshots
+from questions.cache import get_or_build
+from questions.counters import flush_stat_deltas
+from questions.management.commands import build_question_snapshot
+from questions.models import (
+    Question, UserQuestionHistory, Bookmark, ReviewState, UserCategoryRating, QuestionStatDelta
+)
+from questions.pagination import QuestionPageNumberPagination
+from questions.search import rebuild_search_terms
+from questions.services import record_attempt
 
 User = get_user_model()
 
@@ -96,6 +120,28 @@ class QuestionListViewTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['count'], 1)
 
+    def test_search_matches_answers_and_options(self):
+        """Test search covers the answer and option fields"""
+        response = self.client.get(self.url, {'search': 'tRNA'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], self.question3.id)
+
+        response = self.client.get(self.url, {'search': 'inertia motion'})
+        self.assertEqual(response.data['count'], 0)
+
+        response = self.client.get(self.url, {'search': 'object motion'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], self.question2.id)
+
+    def test_search_results_include_rank_and_snippet(self):
+        """Test search results carry relevance fields, plain lists do not"""
+        response = self.client.get(self.url, {'search': 'Carbon'})
+        self.assertIn('search_rank', response.data['results'][0])
+        self.assertIn('search_snippet', response.data['results'][0])
+
+        response = self.client.get(self.url)
+        self.assertNotIn('search_rank', response.data['results'][0])
+
     def test_ordering_by_created_at(self):
         """Test ordering questions by created_at"""
         response = self.client.get(self.url, {'ordering': '-created_at'})
@@ -112,6 +158,1213 @@ class QuestionListViewTestCase(TestCase):
         self.assertIn('next', response.data)
         self.assertIn('previous', response.data)
 
+    def test_cursor_pagination(self):
+        """Test opting in to cursor pagination walks every question once"""
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        first_page = [q['id'] for q in response.data['results']]
+        self.assertEqual(first_page, [self.question3.id, self.question2.id])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([q['id'] for q in response.data['results']], [self.question1.id])
+        self.assertIsNone(response.data['next'])
+
+    def test_cursor_pagination_with_filter(self):
+        """Test cursor pagination keeps filters applied across pages"""
+        response = self.client.get(
+            self.url, {'pagination': 'cursor', 'page_size': 1, 'question_type': 'TOSSUP'}
+        )
+        self.assertEqual(response.data['results'][0]['id'], self.question3.id)
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['id'], self.question1.id)
+        self.assertIsNone(response.data['next'])
+
+
+class QuestionShuffleTestCase(TestCase):
+    """Test suite for seeded shuffled ordering on the question list"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        self.client = APIClient()
+        self.url = reverse('questions:question_list')
+        self.questions = [
+            Question.objects.create(
+                question_text=f'Question {i}',
+                category='MATH',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer=str(i),
+            )
+            for i in range(12)
+        ]
+
+    def _ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q['id'] for q in response.data['results']]
+
+    def test_same_seed_same_order(self):
+        """Test a seed always produces the same permutation"""
+        first = self._ids({'shuffle_seed': 'session-1'})
+        self.assertEqual(first, self._ids({'shuffle_seed': 'session-1'}))
+        self.assertEqual(sorted(first), sorted(q.id for q in self.questions))
+
+    def test_different_seeds_differ(self):
+        """Test different seeds rotate the stored random order to different starts"""
+        by_key = list(Question.objects.order_by('shuffle_key', 'id').values_list('id', flat=True))
+        orders = {tuple(self._ids({'shuffle_seed': seed})) for seed in 'abcdefgh'}
+        self.assertGreater(len(orders), 1)
+        for order in orders:
+            start = by_key.index(order[0])
+            self.assertEqual(list(order), by_key[start:] + by_key[:start])
+
+    def test_shuffle_cursor_pages_are_consistent(self):
+        """Test cursor pages of a shuffled list concatenate to the full order"""
+        full = self._ids({'shuffle_seed': 42})
+
+        paged = []
+        response = self.client.get(
+            self.url, {'shuffle_seed': 42, 'pagination': 'cursor', 'page_size': 5}
+        )
+        while True:
+            paged.extend(q['id'] for q in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(paged, full)
+
+    def test_shuffle_pages_read_key_ranges(self):
+        """Test shuffled pages are read as LIMITed shuffle_key ranges, by cursor and by page number"""
+        full = self._ids({'shuffle_seed': 7})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'shuffle_seed': 7, 'pagination': 'cursor', 'page_size': 5})
+        self.assertIn('LIMIT 6', queries[-1]['sql'])
+        self.assertIn('"shuffle_key" >=', queries[-1]['sql'])
+        self.assertIn('"shuffle_key" <', queries[-1]['sql'])
+
+        response = self.client.get(response.data['next'])
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([q['id'] for q in response.data['results']], full[:5])
+
+        with mock.patch.object(QuestionPageNumberPagination, 'page_size', 5):
+            paged = []
+            for page in (1, 2, 3):
+                paged.extend(self._ids({'shuffle_seed': 7, 'page': page}))
+        self.assertEqual(paged, full)
+
+
+class QuestionAutocompleteTestCase(TestCase):
+    """Test suite for fuzzy search and the autocomplete endpoint"""
+
+    def setUp(self):
+        """Set up test client, sample data and the term dictionary"""
+        self.client = APIClient()
+        self.url = reverse('questions:question_autocomplete')
+        self.list_url = reverse('questions:question_list')
+
+        self.question1 = Question.objects.create(
+            question_text='Which organelle is the site of cellular respiration?',
+            category='BIOLOGY',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='Mitochondria',
+        )
+
+        self.question2 = Question.objects.create(
+            question_text='Which organelle contains chlorophyll?',
+            category='BIOLOGY',
+            question_style='SHORT_ANSWER',
+            question_type='BONUS',
+            correct_answer='Chloroplast',
+        )
+
+        self.question3 = Question.objects.create(
+            question_text='Who formulated the uncertainty principle?',
+            category='PHYSICS',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='Werner Heisenberg',
+        )
+
+        rebuild_search_terms()
+
+    def test_autocomplete_prefix(self):
+        """Test suggestions match the prefix, most frequent first"""
+        response = self.client.get(self.url, {'q': 'Org'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0], {'term': 'organelle', 'frequency': 2})
+
+    def test_autocomplete_typo(self):
+        """Test misspelled input still gets a suggestion"""
+        response = self.client.get(self.url, {'q': 'heisenburg'})
+        terms = [r['term'] for r in response.data['results']]
+        self.assertIn('heisenberg', terms)
+
+    def test_autocomplete_empty_query(self):
+        """Test an empty query returns no suggestions"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_autocomplete_limit(self):
+        """Test the limit parameter caps the number of suggestions"""
+        response = self.client.get(self.url, {'q': 'c', 'limit': 1})
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_fuzzy_search(self):
+        """Test fuzzy search mode tolerates misspelled terms"""
+        response = self.client.get(self.list_url, {'search': 'mitocondria'})
+        self.assertEqual(response.data['count'], 0)
+
+        response = self.client.get(self.list_url, {'search': 'mitocondria', 'search_mode': 'fuzzy'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], self.question1.id)
+
+
+class QuestionRandomViewTestCase(TestCase):
+    """Test suite for the random question endpoint"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('questions:question_random')
+
+        self.physics = [
+            Question.objects.create(
+                question_text=f'Physics question {i}',
+                category='PHYSICS',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer=str(i),
+                source='MIT_2025',
+            )
+            for i in range(5)
+        ]
+        self.chemistry = Question.objects.create(
+            question_text='Chemistry question',
+            category='CHEMISTRY',
+            question_style='SHORT_ANSWER',
+            question_type='BONUS',
+            correct_answer='Water',
+        )
+
+    def test_random_single_question(self):
+        """Test the endpoint returns one question by default"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_random_respects_filters(self):
+        """Test sampled questions match the filters and are distinct"""
+        response = self.client.get(self.url, {'category': 'PHYSICS', 'n': 3})
+        ids = [q['id'] for q in response.data['results']]
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(len(set(ids)), 3)
+        self.assertTrue(set(ids) <= {q.id for q in self.physics})
+
+        response = self.client.get(self.url, {'question_type': 'BONUS', 'n': 5})
+        self.assertEqual([q['id'] for q in response.data['results']], [self.chemistry.id])
+
+    def test_random_multiple_values(self):
+        """Test comma-separated filter values and n larger than the pool"""
+        response = self.client.get(self.url, {'category': 'PHYSICS,CHEMISTRY', 'n': 50})
+        self.assertEqual(len(response.data['results']), 6)
+
+    def test_random_sees_new_and_deleted_questions(self):
+        """Test the sampling index is rebuilt after writes"""
+        self.client.get(self.url)
+        question = Question.objects.create(
+            question_text='Math question',
+            category='MATH',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='4',
+        )
+        response = self.client.get(self.url, {'category': 'MATH'})
+        self.assertEqual(response.data['results'][0]['id'], question.id)
+
+        question.delete()
+        response = self.client.get(self.url, {'category': 'MATH'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_random_sees_questions_written_elsewhere(self):
+        """Test the index follows the question table when the generation was not bumped"""
+        self.client.get(self.url)
+        # bulk_create() skips the signals, as a write from another process would
+        question, = Question.objects.bulk_create([Question(
+            question_text='Math question',
+            category='MATH',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='4',
+        )])
+        with mock.patch('questions.sampling.VERSION_CHECK_INTERVAL', 0):
+            response = self.client.get(self.url, {'category': 'MATH'})
+        self.assertEqual(response.data['results'][0]['id'], question.id)
+
+    def test_random_invalid_count(self):
+        """Test a non-integer n is rejected"""
+        response = self.client.get(self.url, {'n': 'many'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class QuestionResponseCacheTestCase(TestCase):
+    """Test suite for cached question list and detail responses"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        cache.clear()
+        self.client = APIClient()
+        self.list_url = reverse('questions:question_list')
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+        self.question = Question.objects.create(
+            question_text='What is the charge of an electron?',
+            category='PHYSICS',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='-1',
+        )
+        self.detail_url = reverse('questions:question_detail', kwargs={'pk': self.question.pk})
+
+    def test_list_served_from_cache(self):
+        """Test a repeated list request only runs the conditional GET aggregate"""
+        first = self.client.get(self.list_url, {'category': 'PHYSICS'})
+        with self.assertNumQueries(1):
+            second = self.client.get(self.list_url, {'category': 'PHYSICS'})
+        self.assertEqual(first.data, second.data)
+
+    def test_query_params_are_part_of_key(self):
+        """Test different filters are cached separately"""
+        self.client.get(self.list_url, {'category': 'PHYSICS'})
+        response = self.client.get(self.list_url, {'category': 'BIOLOGY'})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_question_write_invalidates_list(self):
+        """Test creating, editing and deleting questions invalidate cached lists"""
+        self.client.get(self.list_url)
+        question = Question.objects.create(
+            question_text='What is the charge of a proton?',
+            category='PHYSICS',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='+1',
+        )
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data['count'], 2)
+
+        question.correct_answer = '+1 elementary charge'
+        question.save()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data['results'][0]['correct_answer'], '+1 elementary charge')
+
+        question.delete()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_answer_invalidates_detail(self):
+        """Test recording an answer refreshes the cached question stats"""
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['times_answered'], 0)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse('questions:history_list'), {
+            'question_id': self.question.id,
+            'user_answer': '-1',
+            'is_correct': True,
+        })
+        flush_stat_deltas()
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['times_answered'], 1)
+
+    def test_writes_without_invalidation_refresh_cache(self):
+        """Test rows written where no cache counter is bumped (another process) are not served stale"""
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+
+        # Neither bulk_create() nor update() sends the signals that bump the counters
+        Question.objects.bulk_create([Question(
+            question_text='What is the charge of a neutron?',
+            category='PHYSICS',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='0',
+        )])
+        self.assertEqual(self.client.get(self.list_url).data['count'], 2)
+
+        Question.objects.filter(pk=self.question.pk).update(times_answered=5, stats_updated_at=timezone.now())
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['times_answered'], 5)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_or_build_builds_once(self):
+        """Test a cached value is reused instead of rebuilt"""
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {'value': len(calls)}
+
+        self.assertEqual(get_or_build('test:key', build), {'value': 1})
+        self.assertEqual(get_or_build('test:key', build), {'value': 1})
+        self.assertEqual(len(calls), 1)
+
+    def test_get_or_build_waits_for_lock_holder(self):
+        """Test a worker that loses the rebuild lock uses the holder's result"""
+        cache.add('test:key:lock', 1)
+
+        def holder_finishes(seconds):
+            cache.set('test:key', {'value': 'from holder'})
+
+        def build():
+            self.fail('build should not run while another worker holds the lock')
+
+        with mock.patch('questions.cache.time.sleep', side_effect=holder_finishes):
+            self.assertEqual(get_or_build('test:key', build), {'value': 'from holder'})
+
+
+class QuestionConditionalGetTestCase(TestCase):
+    """Test suite for ETag / Last-Modified support on question reads"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        cache.clear()
+        self.client = APIClient()
+        self.list_url = reverse('questions:question_list')
+
+        self.question = Question.objects.create(
+            question_text='What is the chemical symbol for gold?',
+            category='CHEMISTRY',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='Au',
+        )
+        self.detail_url = reverse('questions:question_detail', kwargs={'pk': self.question.pk})
+
+    def test_list_returns_validators(self):
+        """Test list responses carry an ETag but no Last-Modified"""
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_list_not_modified(self):
+        """Test a matching If-None-Match gets 304 from a single aggregate query"""
+        etag = self.client.get(self.list_url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_with_data_and_params(self):
+        """Test the ETag changes when rows or query params change"""
+        etag = self.client.get(self.list_url)['ETag']
+
+        response = self.client.get(self.list_url, {'page': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.question.delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_cursor_page_etag_covers_only_its_window(self):
+        """Test cursor page validators read the page's rows, not the whole list"""
+        older, oldest = [
+            Question.objects.create(
+                question_text=f'What is the chemical symbol for {name}?', category='CHEMISTRY',
+                question_style='SHORT_ANSWER', question_type='TOSSUP', correct_answer=symbol,
+            )
+            for name, symbol in (('silver', 'Ag'), ('tin', 'Sn'))
+        ]
+        Question.objects.filter(pk=older.pk).update(created_at=timezone.now() - timedelta(days=1))
+        Question.objects.filter(pk=oldest.pk).update(created_at=timezone.now() - timedelta(days=2))
+        Question.objects.create(
+            question_text='What is the chemical symbol for lead?', category='CHEMISTRY',
+            question_style='SHORT_ANSWER', question_type='TOSSUP', correct_answer='Pb',
+        )
+        params = {'pagination': 'cursor', 'page_size': 1}
+        first = self.client.get(self.list_url, params)
+        params['cursor'] = parse_qs(urlparse(first.data['next']).query)['cursor'][0]
+        etag = self.client.get(self.list_url, params)['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertIn('LIMIT 2', queries[0]['sql'])
+
+        # Rows after the page and its one extra row are outside the window
+        oldest.refresh_from_db()
+        oldest.explanation = 'Stannum'
+        oldest.save()
+        self.assertEqual(self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+        self.question.explanation = 'Aurum'
+        self.question.save()
+        self.assertEqual(self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag).status_code,
+                         status.HTTP_200_OK)
+
+    def test_list_ignores_if_modified_since(self):
+        """Test If-Modified-Since alone never gets a 304 for a list that lost rows"""
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        Question.objects.create(
+            question_text='Filtered out', category='PHYSICS', question_style='SHORT_ANSWER',
+            question_type='TOSSUP', correct_answer='x',
+        ).delete()
+        response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_if_modified_since(self):
+        """Test detail If-Modified-Since uses the question's updated_at"""
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_not_modified_until_edited(self):
+        """Test detail validators follow the question's updated_at"""
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.question.explanation = 'Aurum'
+        self.question.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_counter_flush_leaves_updated_at(self):
+        """Test folding answer counters changes the detail ETag but not updated_at"""
+        etag = self.client.get(self.detail_url)['ETag']
+        list_etag = self.client.get(self.list_url)['ETag']
+        updated_at = self.question.updated_at
+
+        user = User.objects.create_user(username='counter', email='counter@example.com', password='pass')
+        record_attempt(UserQuestionHistory.objects.create(
+            user=user, question=self.question, user_answer='Au', is_correct=True
+        ))
+        flush_stat_deltas()
+
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.updated_at, updated_at)
+        self.assertIsNotNone(self.question.stats_updated_at)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['times_answered'], 1)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_missing_question_still_404(self):
+        """Test a stale ETag for a deleted question does not produce 304"""
+        etag = self.client.get(self.detail_url)['ETag']
+        self.question.delete()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class QuestionBulkViewTestCase(TestCase):
+    """Test suite for the bulk question endpoint"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        self.client = APIClient()
+        self.url = reverse('questions:question_bulk')
+        self.questions = [
+            Question.objects.create(
+                question_text=f'Question {i}',
+                category='EARTH_SPACE',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer=str(i),
+            )
+            for i in range(3)
+        ]
+
+    def test_bulk_get_preserves_order(self):
+        """Test results come back in the requested order in one query"""
+        ids = [self.questions[2].id, self.questions[0].id, self.questions[1].id]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([q['id'] for q in response.data['results']], ids)
+        self.assertEqual(response.data['not_found'], [])
+
+    def test_bulk_reports_missing_ids(self):
+        """Test unknown ids are reported and duplicates collapsed"""
+        ids = [self.questions[0].id, 99999, self.questions[0].id]
+        response = self.client.get(self.url, {'ids': ','.join(map(str, ids))})
+        self.assertEqual([q['id'] for q in response.data['results']], [self.questions[0].id])
+        self.assertEqual(response.data['not_found'], [99999])
+
+    def test_bulk_post(self):
+        """Test the POST variant accepts a JSON id list"""
+        ids = [q.id for q in self.questions]
+        response = self.client.post(self.url, {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([q['id'] for q in response.data['results']], ids)
+
+    def test_bulk_invalid_requests(self):
+        """Test missing, malformed and oversized id lists are rejected"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(self.url, {'ids': '1,abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {'ids': list(range(1, 202))}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class QuestionFacetsViewTestCase(TestCase):
+    """Test suite for the question facet counts endpoint"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('questions:question_facets')
+
+        for category, question_type, source in [
+            ('BIOLOGY', 'TOSSUP', 'MIT_2025'),
+            ('BIOLOGY', 'BONUS', 'MIT_2025'),
+            ('PHYSICS', 'TOSSUP', 'REGIONALS_2024'),
+            ('PHYSICS', 'TOSSUP', None),
+        ]:
+            Question.objects.create(
+                question_text=f'{category} {question_type} question',
+                category=category,
+                question_style='SHORT_ANSWER',
+                question_type=question_type,
+                correct_answer='Answer',
+                source=source,
+            )
+
+    def _counts(self, data, field):
+        return {f['value']: f['count'] for f in data['facets'][field]}
+
+    def test_facets_without_filters(self):
+        """Test every facet is counted in a single query"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+
+        categories = self._counts(response.data, 'category')
+        self.assertEqual(categories['BIOLOGY'], 2)
+        self.assertEqual(categories['PHYSICS'], 2)
+        self.assertEqual(categories['MATH'], 0)
+        self.assertEqual(self._counts(response.data, 'source')[None], 1)
+
+    def test_facets_ignore_own_filter(self):
+        """Test a facet's counts apply the other filters but not its own"""
+        response = self.client.get(self.url, {'category': 'BIOLOGY'})
+        self.assertEqual(response.data['count'], 2)
+        # Category counts still show the alternatives
+        self.assertEqual(self._counts(response.data, 'category')['PHYSICS'], 2)
+        # Other facets are narrowed to biology
+        types = self._counts(response.data, 'question_type')
+        self.assertEqual(types, {'TOSSUP': 1, 'BONUS': 1})
+
+        response = self.client.get(self.url, {'category': 'BIOLOGY,PHYSICS', 'question_type': 'TOSSUP'})
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(self._counts(response.data, 'category'), {
+            'BIOLOGY': 1, 'CHEMISTRY': 0, 'PHYSICS': 2, 'EARTH_SPACE': 0,
+            'MATH': 0, 'ENERGY': 0, 'OTHER': 0,
+        })
+
+    def test_facets_respect_search(self):
+        """Test facet counts follow the search query"""
+        response = self.client.get(self.url, {'search': 'BONUS'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(self._counts(response.data, 'category')['BIOLOGY'], 1)
+
+    def test_facets_invalidated_by_writes(self):
+        """Test cached facet counts refresh after a question is added"""
+        self.client.get(self.url)
+        Question.objects.create(
+            question_text='Math question',
+            category='MATH',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='2',
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(self._counts(response.data, 'category')['MATH'], 1)
+
+
+class QuestionExportTestCase(TestCase):
+    """Test suite for the NDJSON question export"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('questions:question_export')
+
+        for i, category in enumerate(['BIOLOGY', 'BIOLOGY', 'PHYSICS']):
+            Question.objects.create(
+                question_text=f'Export question {i}\nwith a line break',
+                category=category,
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer=f'Answer {i}',
+            )
+
+    def _lines(self, response):
+        content = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_all(self):
+        """Test every question is streamed as one JSON line"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self._lines(response)
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0]['question_text'], 'Export question 2\nwith a line break')
+
+    def test_export_honours_list_filters(self):
+        """Test the list endpoint's filters and ?fields= apply to the export"""
+        response = self.client.get(self.url, {'category': 'BIOLOGY', 'fields': 'id,category'})
+        lines = self._lines(response)
+        self.assertEqual(len(lines), 2)
+        self.assertEqual({tuple(line) for line in lines}, {('id', 'category')})
+
+    def test_export_conditional_get(self):
+        """Test unchanged exports answer 304"""
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_export_command(self):
+        """Test the export_questions command writes the same lines"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'questions.ndjson')
+            call_command('export_questions', output=path, category='PHYSICS', stdout=io.StringIO())
+            with open(path, encoding='utf-8') as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([line['category'] for line in lines], ['PHYSICS'])
+
+
+class QuestionChangesTestCase(TestCase):
+    """Test suite for the question change feed"""
+
+    def setUp(self):
+        """Set up test client and sample data; writes settle immediately"""
+        patcher = mock.patch('questions.changes.SETTLE_SECONDS', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = APIClient()
+        self.url = reverse('questions:question_changes')
+        self.questions = [self._create(f'Change question {i}') for i in range(3)]
+
+    def _create(self, text):
+        return Question.objects.create(
+            question_text=text,
+            category='CHEMISTRY',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='Answer',
+        )
+
+    def _sync(self, since=None, **params):
+        if since:
+            params['since'] = since
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_full_sync(self):
+        """Test a sync without a token returns every question as created"""
+        data = self._sync()
+        self.assertEqual(
+            [(c['type'], c['id']) for c in data['changes']],
+            [('created', q.pk) for q in self.questions]
+        )
+        self.assertEqual(data['changes'][0]['question']['question_text'], 'Change question 0')
+        self.assertFalse(data['has_more'])
+        self.assertEqual(self._sync(data['next'])['changes'], [])
+
+    def test_changes_since_token(self):
+        """Test updates, deletions and creations are reported in order"""
+        token = self._sync()['next']
+
+        self.questions[1].correct_answer = 'Updated'
+        self.questions[1].save()
+        deleted_id = self.questions[0].pk
+        self.questions[0].delete()
+        added = self._create('Added question')
+
+        changes = self._sync(token)['changes']
+        self.assertEqual(
+            [(c['type'], c['id']) for c in changes],
+            [('updated', self.questions[1].pk), ('deleted', deleted_id), ('created', added.pk)]
+        )
+        self.assertEqual(changes[0]['question']['correct_answer'], 'Updated')
+        self.assertNotIn('question', changes[1])
+
+    def test_paging(self):
+        """Test small pages walk the feed without gaps"""
+        self.questions[2].delete()
+        token, seen = None, []
+        while True:
+            data = self._sync(token, limit=1)
+            seen += [c['id'] for c in data['changes']]
+            token = data['next']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, [self.questions[0].pk, self.questions[1].pk])
+
+    def test_recent_writes_are_held_back(self):
+        """Test rows still inside the settle window wait for a later request"""
+        token = self._sync()['next']
+        self._create('Fresh question')
+        with mock.patch('questions.changes.SETTLE_SECONDS', 60):
+            self.assertEqual(self._sync(token)['changes'], [])
+        self.assertEqual(len(self._sync(token)['changes']), 1)
+
+    def test_writes_after_open_transaction_are_held_back(self):
+        """Test rows newer than the oldest open write transaction wait for it to finish"""
+        token = self._sync()['next']
+        started = timezone.now()
+        self._create('Written next to a long import')
+        with mock.patch('questions.changes.oldest_write_start', return_value=started):
+            self.assertEqual(self._sync(token)['changes'], [])
+        self.assertEqual(len(self._sync(token)['changes']), 1)
+
+    def test_invalid_token(self):
+        """Test a malformed token returns 400"""
+        response = self.client.get(self.url, {'since': 'not-a-token'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+
+class QuestionSnapshotTestCase(TestCase):
+    """Test suite for offline question-bank snapshots"""
+
+    def setUp(self):
+        """Set up a temporary snapshot root, snapshot serving and sample data"""
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        # The test settings drop WhiteNoise; snapshot files are served by it
+        settings_override = override_settings(
+            QUESTION_SNAPSHOT_ROOT=directory.name,
+            STATIC_ROOT=None,
+            MIDDLEWARE=['questions.snapshots.SnapshotWhiteNoiseMiddleware'] + settings.MIDDLEWARE,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.url = reverse('questions:question_snapshot_manifest')
+        self.questions = [
+            Question.objects.create(
+                question_text=f'Snapshot question {i}',
+                category=category,
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer=f'Answer {i}',
+            )
+            for i, category in enumerate(['BIOLOGY', 'PHYSICS', 'PHYSICS'])
+        ]
+
+    def _build(self, **options):
+        call_command('build_question_snapshot', stdout=io.StringIO(), **options)
+        return self.client.get(self.url).data
+
+    def _download(self, entry):
+        response = self.client.get(entry['url'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_loop_survives_failed_builds(self):
+        """Test --loop reports a failed build and builds again next interval"""
+        real_build = build_question_snapshot.build_snapshot
+        builds = [RuntimeError('disk full'), None]
+
+        def flaky_build(**kwargs):
+            outcome = builds.pop(0)
+            if outcome is not None:
+                raise outcome
+            return real_build(**kwargs)
+
+        err = io.StringIO()
+        with mock.patch.object(build_question_snapshot, 'build_snapshot', flaky_build), \
+                mock.patch.object(build_question_snapshot.time, 'sleep', side_effect=[None, KeyboardInterrupt]):
+            call_command('build_question_snapshot', loop=True, stdout=io.StringIO(), stderr=err)
+        self.assertIn('disk full', err.getvalue())
+        self.assertEqual(self.client.get(self.url).data['count'], 3)
+
+    @skipIf(snapshots.fcntl is None, 'Build lock needs fcntl')
+    def test_builders_wait_for_the_build_lock(self):
+        """Test a second builder waits while another holds the directory's build lock"""
+        started = threading.Event()
+
+        def build(*args):
+            started.set()
+            return {}, False
+
+        with mock.patch.object(snapshots, '_build_snapshot', build):
+            with snapshots._build_lock():
+                thread = threading.Thread(target=snapshots.build_snapshot)
+                thread.start()
+                self.assertFalse(started.wait(0.2))
+            thread.join(5)
+        self.assertTrue(started.is_set())
+
+    def test_writes_use_their_own_temp_files(self):
+        """Test an atomic write leaves another writer's temp file alone"""
+        path = os.path.join(settings.QUESTION_SNAPSHOT_ROOT, 'manifest.json')
+        with open(f'{path}.tmp', 'w') as f:
+            f.write('in progress')
+        snapshots._write_atomic(path, b'{}')
+        with open(f'{path}.tmp') as f:
+            self.assertEqual(f.read(), 'in progress')
+        self.assertEqual(sorted(os.listdir(settings.QUESTION_SNAPSHOT_ROOT)), ['manifest.json', 'manifest.json.tmp'])
+
+    def test_manifest_before_build(self):
+        """Test the manifest is 404 until a snapshot is built"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertIn('error', response.data)
+
+    def test_build_and_download(self):
+        """Test the snapshot file holds every question and is served immutable"""
+        manifest = self._build()
+        self.assertEqual(manifest['count'], 3)
+        self.assertEqual(len(manifest['files']), 1)
+
+        entry = manifest['files'][0]
+        response = self.client.get(entry['url'], HTTP_ACCEPT_ENCODING='gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+        records = self._download(entry)
+        self.assertEqual([r['id'] for r in records], [q.pk for q in self.questions])
+
+    def test_split_by_category(self):
+        """Test --split-by-category writes one file per category"""
+        manifest = self._build(split_by_category=True)
+        counts = {entry['category']: entry['count'] for entry in manifest['files']}
+        self.assertEqual(counts, {'BIOLOGY': 1, 'PHYSICS': 2})
+
+    def test_rebuild_unchanged_keeps_version(self):
+        """Test rebuilding an unchanged bank keeps the same version"""
+        version = self._build()['version']
+        self.assertEqual(self._build()['version'], version)
+
+    def test_delta_since_previous_version(self):
+        """Test deltas carry updated, created and deleted questions"""
+        old_version = self._build()['version']
+
+        self.questions[0].correct_answer = 'Changed'
+        self.questions[0].save()
+        deleted_id = self.questions[1].pk
+        self.questions[1].delete()
+        added = Question.objects.create(
+            question_text='New question',
+            category='MATH',
+            question_style='SHORT_ANSWER',
+            question_type='BONUS',
+            correct_answer='42',
+        )
+        self._build()
+
+        manifest = self.client.get(self.url, {'since': old_version}).data
+        self.assertFalse(manifest['up_to_date'])
+        delta = self._download(manifest['delta'])
+        self.assertEqual(delta['from'], old_version)
+        self.assertEqual(delta['to'], manifest['version'])
+        self.assertEqual([r['id'] for r in delta['upserts']], [self.questions[0].pk, added.pk])
+        self.assertEqual(delta['upserts'][0]['correct_answer'], 'Changed')
+        self.assertEqual(delta['deletes'], [deleted_id])
+
+    def test_manifest_conditional_get(self):
+        """Test an unchanged manifest answers 304"""
+        self._build()
+        response = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class QuestionSparseFieldsetsTestCase(TestCase):
+    """Test suite for ?fields= and ?omit= on question endpoints"""
+
+    def setUp(self):
+        """Set up test client and sample data"""
+        cache.clear()
+        self.client = APIClient()
+        self.list_url = reverse('questions:question_list')
+
+        self.question = Question.objects.create(
+            question_text='What is the powerhouse of the cell?',
+            category='BIOLOGY',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='Mitochondria',
+            explanation='Produces ATP',
+            times_answered=4,
+            times_correct=3,
+        )
+
+    def test_list_fields(self):
+        """Test ?fields= keeps only the requested fields and narrows the SELECT"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {'fields': 'id,category'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'id': self.question.pk, 'category': 'BIOLOGY'}])
+
+        select = queries.captured_queries[-1]['sql']
+        self.assertIn('"category"', select)
+        self.assertNotIn('"question_text"', select)
+
+    def test_list_omit(self):
+        """Test ?omit= drops fields from each result"""
+        response = self.client.get(self.list_url, {'omit': 'question_text,option_1'})
+        result = response.data['results'][0]
+        self.assertNotIn('question_text', result)
+        self.assertNotIn('option_1', result)
+        self.assertEqual(result['category'], 'BIOLOGY')
+
+    def test_list_fields_with_cursor_pagination(self):
+        """Test sparse results still paginate by cursor"""
+        response = self.client.get(self.list_url, {'fields': 'id', 'pagination': 'cursor', 'page_size': 1})
+        self.assertEqual(response.data['results'], [{'id': self.question.pk}])
+
+    def test_detail_fields_with_computed_field(self):
+        """Test computed fields load the columns they depend on"""
+        url = reverse('questions:question_detail', kwargs={'pk': self.question.pk})
+        response = self.client.get(url, {'fields': 'accuracy_rate,correct_answer'})
+        self.assertEqual(response.data, {'accuracy_rate': 75.0, 'correct_answer': 'Mitochondria'})
+
+    def test_unknown_fields_are_rejected(self):
+        """Test unknown field names get a 400 listing them"""
+        response = self.client.get(self.list_url, {'fields': 'id,nope,categroy'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'fields': ['Unknown fields: categroy, nope']})
+
+        url = reverse('questions:question_detail', kwargs={'pk': self.question.pk})
+        response = self.client.get(url, {'omit': 'explanaton'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('explanaton', response.data['omit'][0])
+
+    def test_signed_out_fields_accept_user_state_names(self):
+        """Test user state names are known fields even when signed out"""
+        response = self.client.get(self.list_url, {'fields': 'id,is_bookmarked'})
+        self.assertEqual(response.data['results'], [{'id': self.question.pk}])
+
+    def test_bulk_fields(self):
+        """Test the bulk endpoint honours ?fields="""
+        url = reverse('questions:question_bulk')
+        response = self.client.get(url, {'ids': str(self.question.pk), 'fields': 'id,question_type'})
+        self.assertEqual(response.data['results'], [{'id': self.question.pk, 'question_type': 'TOSSUP'}])
+
+    def test_nested_serializers_are_not_trimmed(self):
+        """Test ?fields= only applies to the top-level serializer"""
+        user = User.objects.create_user(username='sparse', email='sparse@example.com', password='pass12345')
+        UserQuestionHistory.objects.create(user=user, question=self.question, user_answer='x', is_correct=False)
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('questions:history_list'), {'fields': 'id'})
+        self.assertIn('question_text', response.data['results'][0]['question'])
+
+
+class QuestionAnswerHistoryFilterTestCase(TestCase):
+    """Test suite for the unseen / answered_incorrectly list filters"""
+
+    def setUp(self):
+        """Set up test client, a user with some history and sample questions"""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('questions:question_list')
+        self.user = User.objects.create_user(
+            username='filterer',
+            email='filterer@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='other',
+            email='other@example.com',
+            password='testpass123'
+        )
+        self.unseen, self.correct, self.incorrect = [
+            Question.objects.create(
+                question_text=f'Filter question {i}',
+                category='PHYSICS',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+            )
+            for i in range(3)
+        ]
+        UserQuestionHistory.objects.create(user=self.user, question=self.correct, user_answer='Answer', is_correct=True)
+        UserQuestionHistory.objects.create(user=self.user, question=self.incorrect, user_answer='x', is_correct=False)
+        UserQuestionHistory.objects.create(user=self.user, question=self.incorrect, user_answer='Answer', is_correct=True)
+        UserQuestionHistory.objects.create(user=self.other, question=self.unseen, user_answer='x', is_correct=False)
+
+    def _ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {r['id'] for r in response.data['results']}
+
+    def test_unseen(self):
+        """Test ?unseen=true drops questions the user has answered"""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self._ids(unseen='true'), {self.unseen.pk})
+
+    def test_answered_incorrectly(self):
+        """Test ?answered_incorrectly=true keeps questions the user has missed"""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self._ids(answered_incorrectly='true'), {self.incorrect.pk})
+
+    def test_filters_are_per_user_and_not_cached(self):
+        """Test one user's filtered page is never served to another"""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self._ids(unseen='true'), {self.unseen.pk})
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self._ids(unseen='true'), {self.correct.pk, self.incorrect.pk})
+
+    def test_ignored_for_anonymous_users(self):
+        """Test anonymous requests get the unfiltered list"""
+        self.assertEqual(len(self._ids(unseen='true')), 3)
+
+
+class QuestionUserStateTestCase(TestCase):
+    """Test suite for per-user state on question reads"""
+
+    def setUp(self):
+        """Set up test client, a user with a bookmark and some history"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='stateful',
+            email='stateful@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='stateless',
+            email='stateless@example.com',
+            password='testpass123'
+        )
+        self.unseen, self.answered = [
+            Question.objects.create(
+                question_text=f'State question {i}',
+                category='PHYSICS',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+            )
+            for i in range(2)
+        ]
+        Bookmark.objects.create(user=self.user, question=self.answered)
+        UserQuestionHistory.objects.create(user=self.user, question=self.answered, user_answer='Answer', is_correct=True)
+        UserQuestionHistory.objects.create(user=self.user, question=self.answered, user_answer='x', is_correct=False)
+        UserQuestionHistory.objects.create(user=self.other, question=self.unseen, user_answer='x', is_correct=False)
+
+    def _list(self):
+        response = self.client.get(reverse('questions:question_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {r['id']: r for r in response.data['results']}
+
+    def test_list_includes_user_state(self):
+        """Test the list reports bookmark, latest result and attempt count"""
+        self.client.force_authenticate(user=self.user)
+        results = self._list()
+        self.assertEqual(
+            {k: results[self.answered.pk][k] for k in ('is_bookmarked', 'last_attempt_correct', 'attempt_count')},
+            {'is_bookmarked': True, 'last_attempt_correct': False, 'attempt_count': 2}
+        )
+        self.assertEqual(
+            {k: results[self.unseen.pk][k] for k in ('is_bookmarked', 'last_attempt_correct', 'attempt_count')},
+            {'is_bookmarked': False, 'last_attempt_correct': None, 'attempt_count': 0}
+        )
+
+    def test_list_user_state_overlays_cached_page(self):
+        """Test a cached page gets the user state from one query keyed by its ids"""
+        self._list()
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            results = self._list()
+        self.assertEqual(results[self.answered.pk]['attempt_count'], 2)
+        states = [q for q in queries if 'is_bookmarked' in q['sql']]
+        self.assertEqual(len(states), 1)
+        self.assertIn('IN (', states[0]['sql'])
+        self.assertFalse([q for q in queries if 'LIMIT 50' in q['sql'] or 'ORDER BY "questions"' in q['sql']])
+
+    def test_user_state_fields_left_out_skip_state_query(self):
+        """Test ?fields= without state fields runs no state query"""
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('questions:question_list'), {'fields': 'id,category'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'category'})
+        self.assertFalse([q for q in queries if 'user_question_history' in q['sql']])
+
+    def test_user_state_conditional_get(self):
+        """Test signed-in reads get a per-user ETag that changes with their state"""
+        url = reverse('questions:question_detail', args=[self.unseen.pk])
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Bookmark.objects.create(user=self.user, question=self.unseen)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_bookmarked'])
+        self.client.force_authenticate(user=self.other)
+        self.assertNotEqual(self.client.get(url)['ETag'], response['ETag'])
+
+    def test_user_state_without_id_is_annotated(self):
+        """Test ?fields= leaving out the id still renders the user state"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('questions:question_detail', args=[self.answered.pk]),
+                                   {'fields': 'attempt_count'})
+        self.assertEqual(response.data, {'attempt_count': 2})
+
+    def test_detail_includes_user_state(self):
+        """Test the detail view reports the user's state for the question"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('questions:question_detail', args=[self.answered.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_bookmarked'])
+        self.assertFalse(response.data['last_attempt_correct'])
+        self.assertEqual(response.data['attempt_count'], 2)
+
+    def test_user_state_is_per_user_and_not_cached(self):
+        """Test one user's state is never served to another"""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self._list()[self.unseen.pk]['attempt_count'], 0)
+        self.client.force_authenticate(user=self.other)
+        results = self._list()
+        self.assertEqual(results[self.unseen.pk]['attempt_count'], 1)
+        self.assertFalse(results[self.answered.pk]['is_bookmarked'])
+
+    def test_anonymous_requests_omit_user_state(self):
+        """Test anonymous responses have no user state fields"""
+        result = self._list()[self.answered.pk]
+        self.assertNotIn('is_bookmarked', result)
+        self.assertNotIn('attempt_count', result)
+
+    def test_user_state_respects_sparse_fieldsets(self):
+        """Test ?fields= can select the user state fields"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('questions:question_list'), {'fields': 'id,attempt_count'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'attempt_count'})
+
 
 class QuestionDetailViewTestCase(TestCase):
     """Test suite for Question Detail API endpoint"""
@@ -239,10 +1492,67 @@ class UserQuestionHistoryTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(UserQuestionHistory.objects.count(), 1)
 
-        # Verify question stats updated
+        # Stats are queued, then applied by the flush
+        self.assertEqual(QuestionStatDelta.objects.count(), 1)
+        self.assertEqual(flush_stat_deltas(), 1)
         self.question.refresh_from_db()
         self.assertEqual(self.question.times_answered, 1)
         self.assertEqual(self.question.times_correct, 1)
+        self.assertEqual(QuestionStatDelta.objects.count(), 0)
+
+    def test_create_history_updates_user_totals(self):
+        """Test answers are counted on the user's profile totals"""
+        self.client.force_authenticate(user=self.user1)
+        for is_correct in (True, False):
+            self.client.post(self.url, {'question_id': self.question.id, 'user_answer': 'Water', 'is_correct': is_correct})
+
+        self.user1.refresh_from_db()
+        self.assertEqual((self.user1.total_questions_answered, self.user1.correct_answers), (2, 1))
+        response = self.client.get(reverse('users:profile'))
+        self.assertEqual(response.data['accuracy'], 50)
+
+    def test_reconcile_user_stats(self):
+        """Test the reconcile command repairs drifted totals in bulk"""
+        UserQuestionHistory.objects.create(user=self.user1, question=self.question, user_answer='Water', is_correct=True)
+        UserQuestionHistory.objects.create(user=self.user1, question=self.question, user_answer='x', is_correct=False)
+        User.objects.filter(pk=self.user2.pk).update(total_questions_answered=7, correct_answers=3)
+
+        out = io.StringIO()
+        call_command('reconcile_user_stats', dry_run=True, stdout=out)
+        self.assertIn('Would fix answer totals for 2 users', out.getvalue())
+        self.user1.refresh_from_db()
+        self.assertEqual(self.user1.total_questions_answered, 0)
+
+        call_command('reconcile_user_stats', stdout=io.StringIO())
+        self.user1.refresh_from_db()
+        self.user2.refresh_from_db()
+        self.assertEqual((self.user1.total_questions_answered, self.user1.correct_answers), (2, 1))
+        self.assertEqual((self.user2.total_questions_answered, self.user2.correct_answers), (0, 0))
+
+    def test_concurrent_answers_are_all_counted(self):
+        """Test answers recorded from stale question copies all reach the counters"""
+        self.client.force_authenticate(user=self.user1)
+        for is_correct in (True, False, True):
+            response = self.client.post(self.url, {
+                'question_id': self.question.id,
+                'user_answer': 'Water',
+                'is_correct': is_correct,
+            })
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.client.force_authenticate(user=self.user2)
+        self.client.post(self.url, {'question_id': self.question.id, 'user_answer': 'x', 'is_correct': False})
+
+        # Nothing touched the question row while answering
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.times_answered, 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_stat_deltas(), 4)
+        updates = [q for q in queries if q['sql'].startswith('UPDATE "questions"')]
+        self.assertEqual(len(updates), 1)
+        self.question.refresh_from_db()
+        self.assertEqual((self.question.times_answered, self.question.times_correct), (4, 2))
+        self.assertEqual(flush_stat_deltas(), 0)
 
     def test_create_history_unauthenticated(self):
         """Test unauthenticated users cannot create history"""
@@ -257,6 +1567,378 @@ class UserQuestionHistoryTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+class UserQuestionHistoryListTestCase(TestCase):
+    """Test suite for history list queries, filters and pagination"""
+
+    def setUp(self):
+        """Set up test client and a user with history across categories"""
+        self.client = APIClient()
+        self.url = reverse('questions:history_list')
+        self.user = User.objects.create_user(
+            username='historian',
+            email='historian@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.questions = [
+            Question.objects.create(
+                question_text=f'History question {i}',
+                category='MATH' if i % 2 else 'PHYSICS',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+            )
+            for i in range(6)
+        ]
+        self.history = [
+            UserQuestionHistory.objects.create(
+                user=self.user, question=question, user_answer='Answer', is_correct=i % 3 != 0
+            )
+            for i, question in enumerate(self.questions)
+        ]
+        # Spread answers over six days, newest last
+        base = timezone.now() - timedelta(days=6)
+        for i, history in enumerate(self.history):
+            UserQuestionHistory.objects.filter(pk=history.pk).update(answered_at=base + timedelta(days=i))
+
+    def _ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [r['id'] for r in response.data['results']]
+
+    def test_page_query_count_is_constant(self):
+        """Test nested questions are joined instead of loaded per row"""
+        with CaptureQueriesContext(connection) as queries:
+            self._ids()
+        small = len(queries)
+
+        for question in self.questions * 5:
+            UserQuestionHistory.objects.create(user=self.user, question=question, user_answer='x', is_correct=False)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(self._ids()), 36)
+        self.assertEqual(len(queries), small)
+
+    def test_filters(self):
+        """Test category, correctness and answered_at range filters"""
+        ids = [h.pk for h in self.history]
+        self.assertEqual(self._ids(category='MATH'), [ids[5], ids[3], ids[1]])
+        self.assertEqual(self._ids(is_correct='false'), [ids[3], ids[0]])
+        after = (timezone.now() - timedelta(days=2, hours=12)).isoformat()
+        self.assertEqual(self._ids(answered_after=after), [ids[5], ids[4]])
+        self.assertEqual(self._ids(answered_before=after, category='PHYSICS'), [ids[2], ids[0]])
+
+    def test_cursor_pagination(self):
+        """Test ?pagination=cursor walks the history newest first"""
+        response = self.client.get(self.url, {'pagination': 'cursor', 'page_size': 4})
+        self.assertNotIn('count', response.data)
+        ids = [r['id'] for r in response.data['results']]
+        response = self.client.get(response.data['next'])
+        ids += [r['id'] for r in response.data['results']]
+        self.assertEqual(ids, [h.pk for h in reversed(self.history)])
+
+    def test_category_follows_question_edits(self):
+        """Test history rows pick up a question's new category"""
+        question = self.questions[0]
+        question.category = 'BIOLOGY'
+        question.save()
+        self.assertEqual(self._ids(category='BIOLOGY'), [self.history[0].pk])
+
+
+class UserQuestionHistoryBatchTestCase(TestCase):
+    """Test suite for batch answer submission"""
+
+    def setUp(self):
+        """Set up test client, a user and sample questions"""
+        self.client = APIClient()
+        self.url = reverse('questions:history_batch')
+        self.user = User.objects.create_user(
+            username='session',
+            email='session@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.questions = [
+            Question.objects.create(
+                question_text=f'Session question {i}',
+                category='EARTH_SPACE' if i % 2 else 'ENERGY',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+            )
+            for i in range(12)
+        ]
+
+    def _attempts(self, answers):
+        return {'attempts': [
+            {'question_id': question.pk, 'user_answer': 'Answer', 'is_correct': is_correct, 'time_taken': 8}
+            for question, is_correct in answers
+        ]}
+
+    def test_batch_records_attempts(self):
+        """Test a batch saves every attempt and applies all counters"""
+        first, second = self.questions[:2]
+        response = self.client.post(
+            self.url, self._attempts([(first, True), (second, False), (first, True)]), format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(UserQuestionHistory.objects.filter(user=self.user).count(), 3)
+
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.total_questions_answered, self.user.correct_answers), (3, 2))
+        # One queued delta per question
+        self.assertEqual(QuestionStatDelta.objects.count(), 2)
+        flush_stat_deltas()
+        first.refresh_from_db()
+        self.assertEqual((first.times_answered, first.times_correct), (2, 2))
+        self.assertLess(first.rating, 1500)
+
+        # Attempts at the same question are applied in order
+        review = ReviewState.objects.get(user=self.user, question=first)
+        self.assertEqual(review.repetitions, 2)
+        self.assertEqual(
+            set(UserCategoryRating.objects.filter(user=self.user).values_list('category', flat=True)),
+            {'ENERGY', 'EARTH_SPACE'}
+        )
+
+    def test_batch_query_count_is_constant(self):
+        """Test a session costs the same number of statements whatever its length"""
+        def count_queries(questions):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    self.url, self._attempts([(q, True) for q in questions]), format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(count_queries(self.questions[:2]), count_queries(self.questions[2:12]))
+
+    def test_batch_locks_rows_in_pk_order(self):
+        """Test review and rating rows are read for update in primary key order"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, self._attempts([(q, True) for q in self.questions[:4]]), format='json')
+        for table in ('question_review_states', 'user_category_ratings'):
+            with self.subTest(table=table):
+                selects = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and f'FROM "{table}"' in q['sql']]
+                self.assertEqual(len(selects), 1)
+                self.assertTrue(selects[0].endswith(f'ORDER BY "{table}"."id" ASC'))
+
+    def test_unknown_question_rejects_whole_batch(self):
+        """Test one bad attempt saves nothing"""
+        payload = self._attempts([(self.questions[0], True)])
+        payload['attempts'].append({'question_id': 999999, 'user_answer': 'x', 'is_correct': False})
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('999999', str(response.data['attempts']))
+        self.assertEqual(UserQuestionHistory.objects.count(), 0)
+
+    def test_batch_size_limits(self):
+        """Test empty and oversized batches are rejected"""
+        response = self.client.post(self.url, {'attempts': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, self._attempts([(self.questions[0], True)] * 101), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_authentication(self):
+        """Test unauthenticated users cannot submit a batch"""
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, self._attempts([(self.questions[0], True)]), format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class QuestionDueViewTestCase(TestCase):
+    """Test suite for spaced-repetition scheduling and the due queue"""
+
+    def setUp(self):
+        """Set up test client, a user and sample questions"""
+        self.client = APIClient()
+        self.url = reverse('questions:question_due')
+        self.user = User.objects.create_user(
+            username='reviewer',
+            email='reviewer@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.questions = [
+            Question.objects.create(
+                question_text=f'Review question {i}',
+                category='BIOLOGY',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+            )
+            for i in range(3)
+        ]
+
+    def _answer(self, question, is_correct, time_taken=10):
+        response = self.client.post(reverse('questions:history_list'), {
+            'question_id': question.pk,
+            'user_answer': 'Answer' if is_correct else 'Wrong',
+            'is_correct': is_correct,
+            'time_taken': time_taken,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_answers_schedule_reviews(self):
+        """Test correct answers space out reviews and wrong ones come back soon"""
+        self._answer(self.questions[0], True)
+        self._answer(self.questions[1], False)
+
+        right = ReviewState.objects.get(user=self.user, question=self.questions[0])
+        self.assertEqual((right.repetitions, right.interval_days), (1, 1))
+        wrong = ReviewState.objects.get(user=self.user, question=self.questions[1])
+        self.assertEqual((wrong.repetitions, wrong.interval_days), (0, 0))
+        self.assertLess(wrong.due_at, right.due_at)
+
+        self._answer(self.questions[0], True)
+        right.refresh_from_db()
+        self.assertEqual((right.repetitions, right.interval_days), (2, 6))
+
+        self._answer(self.questions[0], False)
+        right.refresh_from_db()
+        self.assertEqual((right.repetitions, right.lapses), (0, 1))
+        self.assertLess(right.ease_factor, 2.5)
+
+    def test_due_queue(self):
+        """Test only due questions are returned, most overdue first"""
+        now = timezone.now()
+        for question, due_in in zip(self.questions, [-1, -3, 2]):
+            ReviewState.objects.create(
+                user=self.user, question=question,
+                due_at=now + timedelta(days=due_in), last_reviewed_at=now,
+            )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r['question']['id'] for r in response.data['results']],
+            [self.questions[1].pk, self.questions[0].pk]
+        )
+        response = self.client.get(self.url, {'n': 1})
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_due_queue_requires_authentication(self):
+        """Test unauthenticated users cannot read a due queue"""
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rebuild_review_states(self):
+        """Test replaying history reproduces the incrementally built states"""
+        self._answer(self.questions[0], True)
+        self._answer(self.questions[0], True, time_taken=3)
+        self._answer(self.questions[1], False)
+        expected = list(ReviewState.objects.order_by('question_id').values_list(
+            'question_id', 'repetitions', 'interval_days', 'ease_factor', 'lapses', 'due_at'
+        ))
+
+        call_command('rebuild_review_states', stdout=io.StringIO())
+        rebuilt = list(ReviewState.objects.order_by('question_id').values_list(
+            'question_id', 'repetitions', 'interval_days', 'ease_factor', 'lapses', 'due_at'
+        ))
+        self.assertEqual(rebuilt, expected)
+
+
+class QuestionRatingTestCase(TestCase):
+    """Test suite for Elo ratings and recommended questions"""
+
+    def setUp(self):
+        """Set up test client, a user and questions spread over ratings"""
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('questions:question_recommended')
+        self.user = User.objects.create_user(
+            username='rated',
+            email='rated@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.questions = [
+            Question.objects.create(
+                question_text=f'Rated question {rating}',
+                category='CHEMISTRY',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+                rating=rating,
+            )
+            for rating in (1100, 1300, 1420, 1500, 1700, 1900)
+        ]
+
+    def _answer(self, question, is_correct):
+        response = self.client.post(reverse('questions:history_list'), {
+            'question_id': question.pk,
+            'user_answer': 'Answer' if is_correct else 'Wrong',
+            'is_correct': is_correct,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_answers_update_ratings(self):
+        """Test a correct answer raises the user's category rating and lowers the question's"""
+        question = self.questions[3]
+        self._answer(question, True)
+        flush_stat_deltas()
+        rating = UserCategoryRating.objects.get(user=self.user, category='CHEMISTRY')
+        self.assertGreater(rating.rating, 1500)
+        self.assertEqual(rating.attempts, 1)
+        question.refresh_from_db()
+        self.assertAlmostEqual(question.rating, 1500 - (rating.rating - 1500))
+
+        self._answer(question, False)
+        rating.refresh_from_db()
+        self.assertLess(rating.rating, 1500)
+        self.assertEqual(rating.attempts, 2)
+
+    def test_recommends_nearest_rating(self):
+        """Test recommendations are the questions rated nearest the user's target"""
+        response = self.client.get(self.url, {'category': 'CHEMISTRY', 'n': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rating'], 1500)
+        # Target for a 60% success rate is about 1430
+        self.assertEqual(
+            [r['id'] for r in response.data['results']],
+            [self.questions[2].pk, self.questions[3].pk]
+        )
+
+    def test_recommendations_skip_correctly_answered(self):
+        """Test questions already answered correctly are not recommended"""
+        self._answer(self.questions[2], True)
+        response = self.client.get(self.url, {'category': 'CHEMISTRY', 'n': 6})
+        self.assertNotIn(self.questions[2].pk, [r['id'] for r in response.data['results']])
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_recommended_requires_category(self):
+        """Test a missing or unknown category is rejected"""
+        response = self.client.get(self.url, {'category': 'ALCHEMY'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+    def test_rating_list(self):
+        """Test the user's category ratings are listed"""
+        self._answer(self.questions[0], True)
+        response = self.client.get(reverse('questions:rating_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['category'] for r in response.data], ['CHEMISTRY'])
+
+    def test_rebuild_ratings_matches_online_updates(self):
+        """Test replaying history reproduces the ratings kept online"""
+        Question.objects.update(rating=1500)
+        for question, is_correct in [(self.questions[1], True), (self.questions[4], False), (self.questions[1], True)]:
+            self._answer(question, is_correct)
+            # Replays apply every answer before the next, like an up-to-date flush
+            flush_stat_deltas()
+        online = UserCategoryRating.objects.get(user=self.user).rating
+        question_ratings = dict(Question.objects.values_list('id', 'rating'))
+
+        UserCategoryRating.objects.all().delete()
+        Question.objects.update(rating=1234)
+        call_command('rebuild_ratings', stdout=io.StringIO())
+        self.assertAlmostEqual(UserCategoryRating.objects.get(user=self.user).rating, online)
+        for pk, rating in Question.objects.values_list('id', 'rating'):
+            self.assertAlmostEqual(rating, question_ratings[pk])
+
+
 class BookmarkTestCase(TestCase):
     """Test suite for Bookmark API endpoints"""
 
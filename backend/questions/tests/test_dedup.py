@@ -0,0 +1,122 @@
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from questions.dedup import (
+    find_similar, index_questions, minhash, near_duplicate_clusters, similarity,
+)
+from questions.models import Question, QuestionLSHBucket, QuestionSignature
+
+User = get_user_model()
+
+ORIGINAL = (
+    'Which of the following organelles is primarily responsible for producing '
+    'ATP through cellular respiration in eukaryotic cells'
+)
+REWORDED = (
+    'Which of the following organelles is mainly responsible for producing '
+    'ATP through cellular respiration in eukaryotic cells'
+)
+UNRELATED = 'What is the SI unit of electric charge and how is it defined in terms of current'
+
+
+class NearDuplicateTestCase(TestCase):
+    """Test suite for MinHash / LSH near-duplicate detection"""
+
+    def _create(self, text, source=None):
+        return Question.objects.create(
+            question_text=text,
+            category='BIOLOGY',
+            question_style='SHORT_ANSWER',
+            question_type='TOSSUP',
+            correct_answer='Answer',
+            source=source,
+        )
+
+    def test_signature_similarity_tracks_jaccard(self):
+        """Test reworded text scores high and unrelated text low"""
+        self.assertGreater(similarity(minhash(ORIGINAL), minhash(REWORDED)), 0.6)
+        self.assertLess(similarity(minhash(ORIGINAL), minhash(UNRELATED)), 0.1)
+        self.assertEqual(minhash(ORIGINAL), minhash(ORIGINAL.upper() + '?'))
+
+    def test_saves_maintain_the_index(self):
+        """Test creating and editing a question updates its signature and buckets"""
+        question = self._create(ORIGINAL)
+        self.assertEqual(QuestionLSHBucket.objects.filter(question=question).count(), 20)
+        before = QuestionSignature.objects.get(question=question).minhash
+
+        question.question_text = UNRELATED
+        question.save()
+        self.assertEqual(QuestionLSHBucket.objects.filter(question=question).count(), 20)
+        self.assertNotEqual(bytes(QuestionSignature.objects.get(question=question).minhash), bytes(before))
+
+    def test_clusters(self):
+        """Test near-duplicates cluster together and distinct questions do not"""
+        original = self._create(ORIGINAL, 'MIT_2025')
+        reworded = self._create(REWORDED, 'REGIONALS_2024')
+        self._create(UNRELATED)
+
+        clusters = near_duplicate_clusters(0.5)
+        self.assertEqual([c['question_ids'] for c in clusters], [[original.pk, reworded.pk]])
+        self.assertEqual(near_duplicate_clusters(0.99), [])
+
+    def test_find_similar(self):
+        """Test looking up an unsaved text against the index"""
+        original = self._create(ORIGINAL)
+        self._create(UNRELATED)
+        self.assertEqual([pk for pk, _ in find_similar(REWORDED, 0.5)], [original.pk])
+        self.assertEqual(find_similar(REWORDED, 0.5, exclude=original.pk), [])
+
+    def test_rebuild_indexes_bulk_created_questions(self):
+        """Test index_questions() covers rows created without signals"""
+        Question.objects.bulk_create([
+            Question(question_text=text, category='BIOLOGY', question_style='SHORT_ANSWER',
+                     question_type='TOSSUP', correct_answer='Answer')
+            for text in (ORIGINAL, REWORDED)
+        ])
+        self.assertEqual(near_duplicate_clusters(0.5), [])
+        self.assertEqual(index_questions(), 2)
+        self.assertEqual(len(near_duplicate_clusters(0.5)), 1)
+
+    def test_find_duplicates_command(self):
+        """Test the command reports each cluster"""
+        self._create(ORIGINAL)
+        self._create(REWORDED)
+        out = io.StringIO()
+        call_command('find_duplicates', threshold=0.5, stdout=out)
+        self.assertIn('Found 1 clusters covering 2 questions', out.getvalue())
+
+    def test_import_skips_near_duplicates(self):
+        """Test import_json --skip-near-duplicates skips reworded questions"""
+        self._create(ORIGINAL)
+        rows = [
+            {'question_text': text, 'category': 'BIOLOGY', 'question_style': 'SHORT_ANSWER',
+             'question_type': 'TOSSUP', 'correct_answer': 'Answer'}
+            for text in (REWORDED, UNRELATED)
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(rows, f)
+        self.addCleanup(os.remove, f.name)
+
+        call_command(
+            'import_json', f.name, skip_near_duplicates=True, similarity=0.5, stdout=io.StringIO()
+        )
+        self.assertEqual(Question.objects.count(), 2)
+        self.assertTrue(Question.objects.filter(question_text=UNRELATED).exists())
+
+    def test_admin_view(self):
+        """Test the admin lists near-duplicate clusters"""
+        original = self._create(ORIGINAL)
+        self._create(REWORDED)
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pass')
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('admin:questions_question_near_duplicates'), {'threshold': '0.5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '1 cluster found')
+        self.assertContains(response, reverse('admin:questions_question_change', args=[original.pk]))
@@ -0,0 +1,140 @@
+import io
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from questions.models import Question, UserQuestionHistory, UserQuestionSummary
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+User = get_user_model()
+
+
+@skipUnless(np, 'numpy is not installed')
+class IRTFitTestCase(SimpleTestCase):
+    """Test the IRT model fit on simulated responses"""
+
+    def _simulate(self, users=400, questions=60, per_user=40, seed=0):
+        from questions.irt import Responses
+        rng = np.random.default_rng(seed)
+        ability = rng.normal(size=users)
+        difficulty = rng.normal(size=questions)
+        discrimination = np.exp(rng.normal(0, 0.3, size=questions))
+        u = np.repeat(np.arange(users), per_user)
+        q = np.concatenate([rng.choice(questions, per_user, replace=False) for _ in range(users)])
+        p = 1 / (1 + np.exp(-discrimination[q] * (ability[u] - difficulty[q])))
+        responses = Responses(u, q + 1000, rng.random(len(u)) < p)
+        return responses, difficulty, discrimination
+
+    def test_recovers_difficulty(self):
+        """Test fitted difficulties track the simulated ones under both models"""
+        from questions.irt import fit
+        responses, difficulty, _ = self._simulate()
+        for model in ('1pl', '2pl'):
+            fitted, _, _, _ = fit(responses, model)
+            self.assertGreater(np.corrcoef(fitted, difficulty[responses.question_ids - 1000])[0, 1], 0.9)
+
+    def test_1pl_has_unit_discrimination(self):
+        """Test the Rasch model leaves discrimination at 1"""
+        from questions.irt import fit
+        responses, _, _ = self._simulate(users=50, questions=10, per_user=10)
+        _, discrimination, _, _ = fit(responses, '1pl')
+        np.testing.assert_allclose(discrimination, 1.0)
+
+    def test_first_attempts(self):
+        """Test only each user's earliest attempt at a question is kept"""
+        from questions.irt import Responses
+        responses = Responses.first_attempts(
+            attempt_ids=[5, 2, 9, 7], user_ids=[1, 1, 1, 2],
+            question_ids=[10, 10, 11, 10], correct=[True, False, True, True],
+        )
+        kept = sorted(zip(
+            responses.user_ids[responses.users], responses.question_ids[responses.questions], responses.correct
+        ))
+        self.assertEqual(kept, [(1, 10, 0.0), (1, 11, 1.0), (2, 10, 1.0)])
+
+
+@skipUnless(np, 'numpy is not installed')
+class EstimateDifficultyCommandTestCase(TestCase):
+    """Test the estimate_difficulty management command"""
+
+    def setUp(self):
+        """Set up three questions and twelve users"""
+        self.easy, self.hard, self.rare = [
+            Question.objects.create(
+                question_text=f'IRT question {i}',
+                category='MATH',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+            )
+            for i in range(3)
+        ]
+        self.users = [
+            User.objects.create_user(username=f'irt{i}', email=f'irt{i}@example.com', password='testpass123')
+            for i in range(12)
+        ]
+
+    def _summarize(self, user, question, first_is_correct, attempts=2, correct=1):
+        now = timezone.now()
+        return UserQuestionSummary.objects.create(
+            user=user, question=question, attempts=attempts, correct=correct,
+            first_answered_at=now, last_answered_at=now,
+            first_is_correct=first_is_correct, last_is_correct=True,
+        )
+
+    def test_writes_estimates(self):
+        """Test harder questions get higher difficulty and sparse ones stay unrated"""
+        easy, hard, rare, users = self.easy, self.hard, self.rare, self.users
+        history = []
+        for i, user in enumerate(users):
+            history.append(UserQuestionHistory(user=user, question=easy, user_answer='a', is_correct=i != 0))
+            history.append(UserQuestionHistory(user=user, question=hard, user_answer='a', is_correct=i < 3))
+        history.append(UserQuestionHistory(user=users[0], question=rare, user_answer='a', is_correct=True))
+        UserQuestionHistory.objects.bulk_create(history)
+
+        out = io.StringIO()
+        call_command('estimate_difficulty', min_responses=5, stdout=out)
+        self.assertIn('Rated 2 questions', out.getvalue())
+
+        easy.refresh_from_db()
+        hard.refresh_from_db()
+        rare.refresh_from_db()
+        self.assertLess(easy.difficulty, hard.difficulty)
+        self.assertIsNotNone(hard.discrimination)
+        self.assertIsNone(rare.difficulty)
+
+    def test_counts_rolled_up_first_attempts(self):
+        """Test summaries stand in for the first attempt of rolled-up pairs"""
+        for i, user in enumerate(self.users):
+            self._summarize(user, self.hard, first_is_correct=i < 3)
+            # Later raw attempts at a rolled-up question are not first attempts
+            UserQuestionHistory.objects.create(user=user, question=self.hard, user_answer='a', is_correct=True)
+            UserQuestionHistory.objects.create(user=user, question=self.easy, user_answer='a', is_correct=i != 0)
+
+        out = io.StringIO()
+        call_command('estimate_difficulty', min_responses=5, stdout=out)
+        self.assertIn('Loaded 24 first attempts', out.getvalue())
+        self.easy.refresh_from_db()
+        self.hard.refresh_from_db()
+        self.assertLess(self.easy.difficulty, self.hard.difficulty)
+
+    def test_unknown_first_attempts_fail_loudly(self):
+        """Test summaries without a first result stop the fit unless skipped"""
+        for i, user in enumerate(self.users):
+            UserQuestionHistory.objects.create(user=user, question=self.easy, user_answer='a', is_correct=i != 0)
+            UserQuestionHistory.objects.create(user=user, question=self.hard, user_answer='a', is_correct=i < 3)
+        self._summarize(self.users[0], self.hard, first_is_correct=None)
+
+        with self.assertRaisesMessage(CommandError, '1 rolled-up (user, question) pairs'):
+            call_command('estimate_difficulty', min_responses=5, stdout=io.StringIO())
+
+        out = io.StringIO()
+        call_command('estimate_difficulty', min_responses=5, skip_unknown_first_attempts=True, stdout=out)
+        self.assertIn('Skipped 1 rolled-up pairs with no recorded first result (1 raw attempts)', out.getvalue())
+        self.assertIn('Loaded 23 first attempts', out.getvalue())
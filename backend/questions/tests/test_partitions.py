@@ -0,0 +1,148 @@
+import datetime
+import io
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from questions.models import Question, UserQuestionHistory, UserQuestionSummary
+from questions.partitions import (
+    add_months, convert_to_partitioned, ensure_partitions, is_partitioned, month_start,
+    monthly_partitions, partition_name, rollup_history,
+)
+
+User = get_user_model()
+
+UTC = datetime.timezone.utc
+
+
+class HistoryRollupTestCase(TestCase):
+    """Test suite for rolling old answer history up into summaries"""
+
+    def setUp(self):
+        """Set up a user with old and recent attempts at two questions"""
+        cache.clear()
+        self.user = User.objects.create_user(username='veteran', email='veteran@example.com', password='pass')
+        self.first, self.second = [
+            Question.objects.create(
+                question_text=f'Rollup question {i}',
+                category='PHYSICS',
+                question_style='SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer='Answer',
+            )
+            for i in range(2)
+        ]
+        self.cutoff = datetime.datetime(2026, 1, 1, tzinfo=UTC)
+        self._answer(self.first, True, datetime.datetime(2025, 3, 1, tzinfo=UTC), time_taken=10)
+        self._answer(self.first, False, datetime.datetime(2025, 6, 1, tzinfo=UTC))
+        self._answer(self.second, True, datetime.datetime(2025, 7, 1, tzinfo=UTC), time_taken=4)
+        self._answer(self.second, True, datetime.datetime(2026, 2, 1, tzinfo=UTC))
+
+    def _answer(self, question, is_correct, answered_at, time_taken=None):
+        history = UserQuestionHistory.objects.create(
+            user=self.user, question=question, user_answer='x', is_correct=is_correct, time_taken=time_taken
+        )
+        # answered_at is auto_now_add
+        UserQuestionHistory.objects.filter(pk=history.pk).update(answered_at=answered_at)
+
+    def test_month_arithmetic(self):
+        """Test month starts, offsets and partition names"""
+        moment = datetime.datetime(2026, 12, 31, 23, 0, tzinfo=UTC)
+        self.assertEqual(month_start(moment), datetime.datetime(2026, 12, 1, tzinfo=UTC))
+        self.assertEqual(add_months(month_start(moment), 1), datetime.datetime(2027, 1, 1, tzinfo=UTC))
+        self.assertEqual(add_months(month_start(moment), -12), datetime.datetime(2025, 12, 1, tzinfo=UTC))
+        self.assertEqual(partition_name(month_start(moment)), 'user_question_history_p2026_12')
+
+    def test_rollup_summarizes_and_removes_old_history(self):
+        """Test history before the cutoff becomes one summary per question"""
+        self.assertEqual(rollup_history(self.cutoff), [(None, 3)])
+        self.assertEqual(UserQuestionHistory.objects.count(), 1)
+
+        first = UserQuestionSummary.objects.get(user=self.user, question=self.first)
+        self.assertEqual((first.attempts, first.correct, first.total_time_taken, first.timed_attempts), (2, 1, 10, 1))
+        self.assertEqual(first.first_answered_at, datetime.datetime(2025, 3, 1, tzinfo=UTC))
+        self.assertEqual(first.last_answered_at, datetime.datetime(2025, 6, 1, tzinfo=UTC))
+        self.assertTrue(first.first_is_correct)
+        self.assertFalse(first.last_is_correct)
+        self.assertEqual(UserQuestionSummary.objects.get(question=self.second).attempts, 1)
+
+    def test_rollups_merge_into_existing_summaries(self):
+        """Test a later rollup adds to the summaries of an earlier one"""
+        rollup_history(datetime.datetime(2025, 4, 1, tzinfo=UTC))
+        self._answer(self.first, True, datetime.datetime(2025, 9, 1, tzinfo=UTC))
+        rollup_history(self.cutoff)
+
+        first = UserQuestionSummary.objects.get(user=self.user, question=self.first)
+        self.assertEqual((first.attempts, first.correct), (3, 2))
+        self.assertEqual(first.first_answered_at, datetime.datetime(2025, 3, 1, tzinfo=UTC))
+        self.assertTrue(first.first_is_correct)
+        self.assertTrue(first.last_is_correct)
+        self.assertEqual(rollup_history(self.cutoff), [])
+
+    def test_reads_include_rolled_up_attempts(self):
+        """Test list filters and user state still count rolled-up attempts"""
+        rollup_history(self.cutoff)
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse('questions:question_list')
+
+        response = client.get(url, {'unseen': 'true'})
+        self.assertEqual(response.data['results'], [])
+        response = client.get(url, {'answered_incorrectly': 'true'})
+        self.assertEqual([r['id'] for r in response.data['results']], [self.first.pk])
+
+        results = {r['id']: r for r in client.get(url).data['results']}
+        self.assertEqual(results[self.first.pk]['attempt_count'], 2)
+        self.assertFalse(results[self.first.pk]['last_attempt_correct'])
+        self.assertEqual(results[self.second.pk]['attempt_count'], 2)
+        self.assertTrue(results[self.second.pk]['last_attempt_correct'])
+
+    def test_reconcile_counts_rolled_up_attempts(self):
+        """Test reconcile_user_stats adds summaries to history totals"""
+        rollup_history(self.cutoff)
+        call_command('reconcile_user_stats', stdout=io.StringIO())
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.total_questions_answered, self.user.correct_answers), (4, 3))
+
+    def test_command_rolls_up(self):
+        """Test --rollup-after rolls up history before the last whole months"""
+        out = io.StringIO()
+        call_command('partition_history', rollup_after=1200, stdout=out)
+        self.assertIn('Rolled up 0 answers', out.getvalue())
+        self.assertEqual(UserQuestionHistory.objects.count(), 4)
+
+        out = io.StringIO()
+        call_command('partition_history', rollup_after=1, stdout=out)
+        self.assertIn('Rolled up 4 answers', out.getvalue())
+        self.assertEqual(UserQuestionSummary.objects.count(), 2)
+
+    def test_command_rejects_convert_without_postgres(self):
+        """Test --convert needs PostgreSQL"""
+        if connection.vendor == 'postgresql':
+            self.skipTest('Runs on other databases')
+        with self.assertRaises(CommandError):
+            call_command('partition_history', convert=True, stdout=io.StringIO())
+
+    @skipUnless(connection.vendor == 'postgresql', 'Partitioning needs PostgreSQL')
+    def test_partitioned_rollup_detaches_partitions(self):
+        """Test converting, creating partitions ahead and detaching rolled-up months"""
+        now = datetime.datetime(2026, 2, 15, tzinfo=UTC)
+        convert_to_partitioned(0, now=now)
+        self.assertTrue(is_partitioned())
+        self.assertEqual(UserQuestionHistory.objects.count(), 4)
+
+        self.assertEqual(ensure_partitions(2, now=now), [
+            'user_question_history_p2026_03', 'user_question_history_p2026_04',
+        ])
+        self.assertEqual(ensure_partitions(2, now=now), [])
+
+        rolled_up = rollup_history(self.cutoff)
+        self.assertEqual(sum(count for _, count in rolled_up), 3)
+        self.assertEqual([name for name, _ in rolled_up][0], 'user_question_history_p2025_03')
+        self.assertEqual(monthly_partitions()[0][0], 'user_question_history_p2026_01')
+        self.assertEqual(UserQuestionHistory.objects.count(), 1)
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from backend.projection import Projection
+from questions.models import Question
+from questions.search import full_text_search
+from questions.serializers import (
+    QuestionSerializer, QuestionListSerializer, QuestionSearchResultSerializer
+)
+from tournaments.models import Tournament, Team, Coach, Player, Room, Round, Game
+from tournaments.serializers import TeamSerializer, GameSerializer
+
+
+class ProjectionParityTestCase(TestCase):
+    """Test projected rows render byte-identically to the DRF serializers"""
+
+    def setUp(self):
+        """Set up questions and a tournament with teams and games"""
+        cache.clear()
+        for i, (category, source) in enumerate([
+            ('BIOLOGY', 'MIT_2025'), ('PHYSICS', None), ('MATH', 'REGIONALS_2024'),
+        ]):
+            Question.objects.create(
+                question_text=f'Question {i} about "quotes" and unicode: é',
+                category=category,
+                question_style='MULTIPLE_CHOICE' if i % 2 else 'SHORT_ANSWER',
+                question_type='TOSSUP',
+                correct_answer=f'Answer {i}',
+                option_1='W', option_2='X', option_3='Y', option_4='Z',
+                source=source,
+            )
+
+        tournament = Tournament.objects.create(name='Parity Open', tournament_date=timezone.now().date())
+        # Names sort in the opposite order to ids
+        teams = [
+            Team.objects.create(tournament=tournament, name=f'Team {"DCBA"[i]}', school=f'School {i}', pool='AB'[i % 2])
+            for i in range(4)
+        ]
+        for team in teams[:3]:
+            Player.objects.create(team=team, name=f'{team.name} player 1')
+            Player.objects.create(team=team, name=f'{team.name} player 2')
+        Coach.objects.create(team=teams[0], name='Coach')
+
+        round_1 = Round.objects.create(tournament=tournament, round_number=1)
+        rooms = [Room.objects.create(tournament=tournament, name=f'Room {i}') for i in range(3)]
+        Game.objects.create(tournament=tournament, round=round_1, room=rooms[0], team1=teams[0], team2=teams[1],
+                            team1_score=200, team2_score=150, is_complete=True,
+                            started_at=timezone.now(), completed_at=timezone.now())
+        Game.objects.create(tournament=tournament, round=round_1, room=rooms[1], team1=teams[2], team2=teams[3],
+                            team1_score=100, team2_score=100, is_complete=True)
+        Game.objects.create(tournament=tournament, round=round_1, room=rooms[2], team1=teams[1], team2=teams[3],
+                            team1_score=0, team2_score=40, pool='B')
+
+    def assertParity(self, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        projected = Projection.for_serializer(serializer_class()).serialize(queryset)
+        self.assertEqual(JSONRenderer().render(projected), expected)
+
+    def test_question_list_parity(self):
+        """Test QuestionListSerializer parity"""
+        self.assertParity(QuestionListSerializer, Question.objects.order_by('id'))
+
+    def test_search_result_parity(self):
+        """Test search results keep their annotations"""
+        queryset = full_text_search(Question.objects.order_by('id'), 'Answer')
+        self.assertParity(QuestionSearchResultSerializer, queryset)
+
+    def test_team_parity(self):
+        """Test TeamSerializer parity, including player and coach counts"""
+        self.assertParity(TeamSerializer, Team.objects.all())
+
+    def test_game_parity(self):
+        """Test GameSerializer parity, including winners, ties and timestamps"""
+        self.assertParity(GameSerializer, Game.objects.all())
+
+    def test_list_endpoint_matches_serializer(self):
+        """Test the question list endpoint returns the serializer's output"""
+        response = APIClient().get(reverse('questions:question_list'))
+        expected = QuestionListSerializer(Question.objects.order_by('-created_at'), many=True).data
+        self.assertEqual(JSONRenderer().render(response.data['results']), JSONRenderer().render(expected))
+
+    def test_unprojectable_field(self):
+        """Test fields without a column or projection hook are rejected"""
+        with self.assertRaises(ImproperlyConfigured):
+            Projection(QuestionSerializer())
+
@@ -1,7 +1,8 @@
 from django.urls import path
 from .views import (
-    QuestionListView, QuestionDetailView,
-    UserQuestionHistoryListCreateView,
+    QuestionListView, QuestionDetailView, QuestionAutocompleteView, QuestionRandomView,
+    QuestionBulkView, QuestionChangesView, QuestionExportView, QuestionFacetsView, QuestionSnapshotManifestView,
+    UserQuestionHistoryListCreateView, UserQuestionHistoryBatchView, QuestionDueView, QuestionRecommendedView, UserRatingListView,
     BookmarkListCreateView, BookmarkDetailView
 )
 
@@ -11,9 +12,20 @@ urlpatterns = [
     # Question endpoints
     path('', QuestionListView.as_view(), name='question_list'),
     path('<int:pk>/', QuestionDetailView.as_view(), name='question_detail'),
+    path('autocomplete/', QuestionAutocompleteView.as_view(), name='question_autocomplete'),
+    path('random/', QuestionRandomView.as_view(), name='question_random'),
+    path('bulk/', QuestionBulkView.as_view(), name='question_bulk'),
+    path('facets/', QuestionFacetsView.as_view(), name='question_facets'),
+    path('export.ndjson', QuestionExportView.as_view(), name='question_export'),
+    path('changes/', QuestionChangesView.as_view(), name='question_changes'),
+    path('snapshot/manifest/', QuestionSnapshotManifestView.as_view(), name='question_snapshot_manifest'),
 
     # User history endpoints
     path('history/', UserQuestionHistoryListCreateView.as_view(), name='history_list'),
+    path('history/batch/', UserQuestionHistoryBatchView.as_view(), name='history_batch'),
+    path('due/', QuestionDueView.as_view(), name='question_due'),
+    path('recommended/', QuestionRecommendedView.as_view(), name='question_recommended'),
+    path('ratings/', UserRatingListView.as_view(), name='rating_list'),
 
     # Bookmark endpoints
     path('bookmarks/', BookmarkListCreateView.as_view(), name='bookmark_list'),
@@ -0,0 +1,62 @@
+"""
+Per-user state rendered alongside questions.
+
+annotate_user_state() adds the requesting user's bookmark and attempt state
+as correlated subqueries, so a page of questions still loads in a single
+statement. The history subqueries are served by history_user_question_idx;
+attempts rolled up out of history come from the user's question summary.
+
+Cached question reads render the shared payload first and then overlay
+the state with user_state_by_id(), one query keyed by the page's ids.
+user_state_version() changes whenever that state may have, so per-user
+ETags can be derived without reading it.
+"""
+
+from django.db.models import Count, Exists, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Bookmark, Question, UserQuestionHistory, UserQuestionSummary
+
+USER_STATE_FIELDS = ['is_bookmarked', 'last_attempt_correct', 'attempt_count']
+
+# Rendered for questions the state query does not return
+EMPTY_USER_STATE = {'is_bookmarked': False, 'last_attempt_correct': None, 'attempt_count': 0}
+
+
+def annotate_user_state(queryset, user, fields=USER_STATE_FIELDS):
+    """Annotate the user state ``fields`` (all of them by default) for ``user``"""
+    attempts = UserQuestionHistory.objects.filter(user=user, question=OuterRef('pk'))
+    summary = UserQuestionSummary.objects.filter(user=user, question=OuterRef('pk'))
+    annotations = {
+        'is_bookmarked': lambda: Exists(Bookmark.objects.filter(user=user, question=OuterRef('pk'))),
+        'last_attempt_correct': lambda: Coalesce(
+            Subquery(attempts.order_by('-answered_at', '-id').values('is_correct')[:1]),
+            Subquery(summary.values('last_is_correct')[:1]),
+        ),
+        'attempt_count': lambda: Coalesce(
+            Subquery(
+                attempts.order_by().values('question')
+                .annotate(count=Count('id')).values('count')[:1],
+                output_field=IntegerField(),
+            ),
+            0,
+        ) + Coalesce(Subquery(summary.values('attempts')[:1], output_field=IntegerField()), 0),
+    }
+    return queryset.annotate(**{name: annotations[name]() for name in fields})
+
+
+def user_state_by_id(user, question_ids, fields=USER_STATE_FIELDS):
+    """Return ``{question_id: {field: value}}`` for ``user``, in one query"""
+    questions = Question.objects.filter(pk__in=question_ids).order_by()
+    rows = annotate_user_state(questions, user, fields).values('pk', *fields)
+    return {row.pop('pk'): row for row in rows}
+
+
+def user_state_version(user):
+    """
+    A value that changes whenever ``user`` answers a question or adds or
+    removes a bookmark, from two aggregates over the user's own rows.
+    """
+    answered = UserQuestionHistory.objects.filter(user=user).aggregate(last=Max('answered_at'))['last']
+    bookmarks = Bookmark.objects.filter(user=user).aggregate(count=Count('id'), last=Max('id'))
+    return (answered, bookmarks['count'], bookmarks['last'])
@@ -1,38 +1,534 @@
-from rest_framework import generics, permissions, filters
+from django.db.models import Max
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Question, UserQuestionHistory, Bookmark
+from backend.conditional import ConditionalGetMixin
+from backend.projection import ProjectionListMixin
+from .cache import CachedResponseMixin
+from .changes import InvalidToken, get_changes
+from .export import NDJSONRenderer, export_ndjson
+from .facets import FACET_FIELDS, facet_counts
+from .filters import (
+    AnswerHistoryFilter, QuestionOrderingFilter, QuestionSearchFilter, UserQuestionHistoryFilter
+)
+from .models import Question, UserQuestionHistory, Bookmark, ReviewState
+from .ratings import get_rating, recommend
+from .pagination import (
+    HistoryCursorPagination, OptionalCursorPaginationMixin, QuestionCursorPagination, QuestionPageNumberPagination
+)
+from .sampling import BUCKET_FIELDS, sample_question_ids
+from .search import autocomplete
+from .snapshots import load_manifest
+from .user_state import (
+    EMPTY_USER_STATE, USER_STATE_FIELDS, annotate_user_state, user_state_by_id, user_state_version
+)
 from .serializers import (
-    QuestionSerializer, QuestionListSerializer,
-    UserQuestionHistorySerializer, BookmarkSerializer
+    QuestionSerializer, QuestionListSerializer, QuestionSearchResultSerializer,
+    QuestionBulkRequestSerializer, ReviewStateSerializer, UserCategoryRatingSerializer,
+    UserQuestionHistorySerializer, UserQuestionHistoryBatchSerializer, BookmarkSerializer
 )
 
 
-class QuestionListView(generics.ListAPIView):
-    """API endpoint for listing questions (without answers for practice mode)"""
+class SparseFieldsetQuerysetMixin:
+    """
+    Selects only the columns the serializer renders, so ?fields= / ?omit=
+    also shrink the query. ``sparse_always_load`` lists columns read
+    outside the serializer (e.g. by cursor pagination).
+    """
+    sparse_always_load = ()
+
+    def get_queryset(self):
+        return self.get_serializer().narrow_queryset(
+            super().get_queryset(), *self.sparse_always_load
+        )
+
+
+def stats_ordering_aggregates(request):
+    """
+    Conditional GET aggregates for question lists: counter folds leave
+    updated_at alone but can reorder ?ordering=times_answered pages
+    """
+    if 'times_answered' in request.query_params.get('ordering', ''):
+        return {'stats_updated_at': Max('stats_updated_at')}
+    return {}
+
+
+def annotated_question_queryset(serializer, user, *always):
+    """
+    Questions narrowed to ``serializer``'s columns, annotated with the user
+    state fields it renders (see questions.user_state)
+    """
+    queryset = serializer.narrow_queryset(Question.objects.all(), *always)
+    fields = [name for name in USER_STATE_FIELDS if name in serializer.fields]
+    if fields:
+        queryset = annotate_user_state(queryset, user, fields)
+    return queryset
+
+
+class UserStateMixin:
+    """
+    Adds the requesting user's bookmark and attempt state to question reads.
+
+    The question payload stays shared: list() and retrieve() cache and
+    validate it as for anonymous requests, then overlay the state fields
+    the request renders with one query keyed by the ids in the response.
+    Views setting ``user_state_overlay = False`` (or requests omitting the
+    id) annotate the queryset instead and skip the response cache. Either
+    way the ETag varies with the user's state; requests that leave out
+    every state field through ?fields= / ?omit= pay for none of it.
+    """
+    user_state_overlay = True
+
+    @cached_property
+    def rendered_fields(self):
+        """Names of the fields an authenticated request renders, state fields included"""
+        if not self.request.user.is_authenticated:
+            return []
+        context = {**super().get_serializer_context(), 'user_state': True}
+        return list(self.get_serializer_class()(context=context).fields)
+
+    @property
+    def user_state_fields(self):
+        return [name for name in USER_STATE_FIELDS if name in self.rendered_fields]
+
+    @property
+    def overlays_user_state(self):
+        return bool(self.user_state_fields) and self.user_state_overlay and 'id' in self.rendered_fields
+
+    @property
+    def annotates_user_state(self):
+        return bool(self.user_state_fields) and not self.overlays_user_state
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.annotates_user_state:
+            queryset = annotate_user_state(queryset, self.request.user, self.user_state_fields)
+        return queryset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'user_state': self.annotates_user_state}
+
+    def should_cache_response(self, request):
+        return super().should_cache_response(request) and not self.annotates_user_state
+
+    def get_conditional_vary(self, request):
+        if self.user_state_fields or AnswerHistoryFilter().is_active(request):
+            return (request.user.pk, user_state_version(request.user))
+        return super().get_conditional_vary(request)
+
+    def with_user_state(self, rows):
+        states = user_state_by_id(self.request.user, [row['id'] for row in rows], self.user_state_fields)
+        return [
+            {**row, **{name: states.get(row['id'], EMPTY_USER_STATE)[name] for name in self.user_state_fields}}
+            for row in rows
+        ]
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if self.overlays_user_state and response.status_code == 200:
+            if isinstance(response.data, list):
+                response.data = self.with_user_state(response.data)
+            else:
+                response.data = {**response.data, 'results': self.with_user_state(response.data['results'])}
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if self.overlays_user_state and response.status_code == 200:
+            response.data = self.with_user_state([response.data])[0]
+        return response
+
+
+class QuestionListView(UserStateMixin, ConditionalGetMixin, CachedResponseMixin, OptionalCursorPaginationMixin,
+                       SparseFieldsetQuerysetMixin, ProjectionListMixin, generics.ListAPIView):
+    """
+    API endpoint for listing questions (without answers for practice mode).
+    ?fields=id,category or ?omit=question_text trims each result.
+    Pass ?pagination=cursor for keyset pagination over (-created_at, id).
+    Pages are built from .values() rows (see backend.projection).
+    ?search= results are ranked by relevance and include a highlighted snippet;
+    add ?search_mode=fuzzy for typo-tolerant matching.
+    ?shuffle_seed= returns a stable shuffled order for practice sessions.
+    Signed-in users can pass ?unseen=true or ?answered_incorrectly=true and
+    get is_bookmarked, last_attempt_correct and attempt_count per question.
+    """
     queryset = Question.objects.all()
     serializer_class = QuestionListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = QuestionPageNumberPagination
+    cursor_pagination_class = QuestionCursorPagination
+    sparse_always_load = ('created_at',)
+    projection_extra_values = ('id', 'created_at')
+    filter_backends = [DjangoFilterBackend, AnswerHistoryFilter, QuestionSearchFilter, QuestionOrderingFilter]
     filterset_fields = ['category', 'question_type', 'question_style', 'source']
-    search_fields = ['question_text']
     ordering_fields = ['created_at', 'times_answered']
     ordering = ['-created_at']
 
+    def get_serializer_class(self):
+        if QuestionSearchFilter().is_active(self.request):
+            return QuestionSearchResultSerializer
+        return super().get_serializer_class()
+
+    def should_cache_response(self, request):
+        # Per-user results must not be shared through the response cache
+        return super().should_cache_response(request) and not AnswerHistoryFilter().is_active(request)
+
+    def get_conditional_aggregates(self):
+        return stats_ordering_aggregates(self.request)
+
+
+class QuestionExportView(UserStateMixin, ConditionalGetMixin, generics.GenericAPIView):
+    """
+    API endpoint streaming the question bank as NDJSON, one question per line.
+    Accepts the same filters, search, ordering and ?fields= as the question list.
+    """
+    queryset = QuestionListView.queryset
+    permission_classes = [permissions.AllowAny]
+    filter_backends = QuestionListView.filter_backends
+    filterset_fields = QuestionListView.filterset_fields
+    ordering_fields = QuestionListView.ordering_fields
+    ordering = QuestionListView.ordering
+    renderer_classes = [NDJSONRenderer]
+    # Streamed in chunks, each one query with the state annotated
+    user_state_overlay = False
+
+    def get_conditional_aggregates(self):
+        return stats_ordering_aggregates(self.request)
+
+    def get_serializer_class(self):
+        if QuestionSearchFilter().is_active(self.request):
+            return QuestionSearchResultSerializer
+        return QuestionListSerializer
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_response(self.export, request, *args, send_last_modified=False, **kwargs)
+
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export_ndjson(queryset, self.get_serializer()),
+            content_type=NDJSONRenderer.media_type,
+        )
+        response['Content-Disposition'] = 'attachment; filename="questions.ndjson"'
+        return response
+
+
+class QuestionFacetsView(CachedResponseMixin, generics.GenericAPIView):
+    """
+    API endpoint for filter counts in the question browser.
+    Accepts the question list's filters (comma-separated for several values)
+    and search; each facet's counts ignore that facet's own filter.
+    """
+    queryset = Question.objects.all()
+    permission_classes = [permissions.AllowAny]
+    filter_backends = [QuestionSearchFilter]
+
+    def get(self, request, *args, **kwargs):
+        return self.get_cached_response(self.facets, request, *args, **kwargs)
+
+    def facets(self, request, *args, **kwargs):
+        selected = {}
+        for field in FACET_FIELDS:
+            value = request.query_params.get(field)
+            if value:
+                selected[field] = {v.strip() for v in value.split(',')}
+
+        total, counts = facet_counts(self.filter_queryset(self.get_queryset()), selected)
+
+        facets = {}
+        for field in FACET_FIELDS:
+            labels = dict(Question._meta.get_field(field).choices)
+            values = list(labels) + [v for v in counts[field] if v not in labels]
+            facets[field] = [
+                {'value': value, 'label': labels.get(value, value), 'count': counts[field][value]}
+                for value in values
+            ]
+        return Response({'count': total, 'facets': facets})
+
+
+class QuestionAutocompleteView(APIView):
+    """
+    API endpoint for search-box suggestions.
+    Served from the precomputed term dictionary, never the questions table.
+    """
+    permission_classes = [permissions.AllowAny]
+    default_limit = 10
+    max_limit = 25
+
+    def get(self, request):
+        prefix = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        return Response({
+            'results': [
+                {'term': term, 'frequency': frequency}
+                for term, frequency in autocomplete(prefix, limit)
+            ]
+        })
+
+
+class QuestionRandomView(APIView):
+    """
+    API endpoint for drawing random questions for practice.
+    Filters accept comma-separated values; ?n= sets how many (default 1).
+    Samples uniformly from an in-memory id index instead of ORDER BY RANDOM().
+    """
+    permission_classes = [permissions.AllowAny]
+    max_count = 50
+
+    def get(self, request):
+        filters = {}
+        for field in BUCKET_FIELDS:
+            value = request.query_params.get(field)
+            if value:
+                filters[field] = {v.strip() for v in value.split(',')}
+
+        try:
+            n = int(request.query_params.get('n', 1))
+        except ValueError:
+            return Response(
+                {'error': 'n must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        n = max(1, min(n, self.max_count))
+
+        question_ids = sample_question_ids(filters, n)
+        context = {'request': request, 'user_state': True}
+        queryset = annotated_question_queryset(QuestionListSerializer(context=context), request.user)
+        questions = queryset.in_bulk(question_ids)
+        # Ids deleted since the index was built are simply dropped
+        sampled = [questions[pk] for pk in question_ids if pk in questions]
+        serializer = QuestionListSerializer(sampled, many=True, context=context)
+        return Response({'results': serializer.data})
+
+
+class QuestionBulkView(APIView):
+    """
+    API endpoint for fetching a known set of questions in one request.
+    GET ?ids=1,2,3 or POST {"ids": [1, 2, 3]} for long lists. Results follow
+    the requested order; unknown ids are listed under not_found.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        ids = []
+        for value in request.query_params.getlist('ids'):
+            ids.extend(v.strip() for v in value.split(',') if v.strip())
+        return self.bulk_response(request, {'ids': ids})
+
+    def post(self, request):
+        return self.bulk_response(request, request.data)
+
+    def bulk_response(self, request, data):
+        serializer = QuestionBulkRequestSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        # Keep the first occurrence of each id
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+
+        context = {'request': request, 'user_state': True}
+        queryset = annotated_question_queryset(QuestionListSerializer(context=context), request.user)
+        questions = queryset.in_bulk(ids)
+        found = [questions[pk] for pk in ids if pk in questions]
+        return Response({
+            'results': QuestionListSerializer(found, many=True, context=context).data,
+            'not_found': [pk for pk in ids if pk not in questions],
+        })
+
+
+class QuestionChangesView(APIView):
+    """
+    API endpoint for delta sync: questions created, updated or deleted since
+    ?since=<token>, oldest first. Omit since for a full sync, then pass the
+    returned next token; keep requesting while has_more is true.
+    """
+    permission_classes = [permissions.AllowAny]
+    default_limit = 500
+    max_limit = 1000
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, self.max_limit))
+
+        try:
+            changes, next_token, has_more = get_changes(request.query_params.get('since') or None, limit)
+        except InvalidToken:
+            return Response(
+                {'error': 'Invalid since token.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'changes': changes, 'next': next_token, 'has_more': has_more})
+
+
+class QuestionSnapshotManifestView(APIView):
+    """
+    API endpoint describing the offline question-bank snapshot: the current
+    version, its content-hashed files and deltas from earlier versions.
+    ?since=<version> also returns the delta a client on that version needs
+    (null when it must download the full files again).
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        manifest = load_manifest()
+        if manifest is None:
+            return Response(
+                {'error': 'No question snapshot has been built yet.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        since = request.query_params.get('since')
+        etag = f'"{manifest["version"]}:{since or ""}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            if since:
+                manifest['up_to_date'] = since == manifest['version']
+                manifest['delta'] = next(
+                    (delta for delta in manifest['deltas'] if delta['from'] == since), None
+                )
+            response = Response(manifest)
+        response['ETag'] = etag
+        return response
+
 
-class QuestionDetailView(generics.RetrieveAPIView):
-    """API endpoint for retrieving a single question with answer"""
+class QuestionDetailView(UserStateMixin, ConditionalGetMixin, CachedResponseMixin, SparseFieldsetQuerysetMixin,
+                         generics.RetrieveAPIView):
+    """
+    API endpoint for retrieving a single question with answer (accepts ?fields= / ?omit=).
+    Signed-in users also get their bookmark and attempt state.
+    """
     queryset = Question.objects.all()
     serializer_class = QuestionSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_conditional_aggregates(self):
+        # times_answered / times_correct change without touching updated_at
+        return {'stats_updated_at': Max('stats_updated_at')}
 
-class UserQuestionHistoryListCreateView(generics.ListCreateAPIView):
-    """API endpoint for viewing and creating user question history"""
+
+class UserQuestionHistoryListCreateView(OptionalCursorPaginationMixin, generics.ListCreateAPIView):
+    """
+    API endpoint for viewing and creating user question history.
+    Filter with ?answered_after= / ?answered_before= (ISO datetimes),
+    ?category= and ?is_correct=; pass ?pagination=cursor for keyset pages.
+    Questions are joined in, so a page is one query (plus the count).
+    """
     serializer_class = UserQuestionHistorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_pagination_class = HistoryCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = UserQuestionHistoryFilter
+
+    def get_queryset(self):
+        question_fields = QuestionListSerializer().get_model_field_names()
+        return UserQuestionHistory.objects.filter(user=self.request.user).select_related('question').only(
+            'id', 'user_id', 'question_id', 'user_answer', 'is_correct', 'time_taken', 'answered_at',
+            *(f'question__{name}' for name in question_fields),
+        ).order_by('-answered_at', '-id')
+
+
+class UserQuestionHistoryBatchView(APIView):
+    """
+    API endpoint for submitting a practice session's answers in one request:
+    POST {"attempts": [{"question_id", "user_answer", "is_correct", "time_taken"}, ...]}
+    (up to 100). All attempts are validated together and saved, or none are.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        context = {'request': request}
+        serializer = UserQuestionHistoryBatchSerializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+        histories = serializer.save()
+        return Response(
+            {'results': UserQuestionHistorySerializer(histories, many=True, context=context).data},
+            status=status.HTTP_201_CREATED
+        )
+
+
+class QuestionDueView(APIView):
+    """
+    API endpoint for the user's spaced-repetition queue: questions whose next
+    review is due, most overdue first. ?n= sets how many (default 10).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    default_count = 10
+    max_count = 50
+
+    def get(self, request):
+        try:
+            n = int(request.query_params.get('n', self.default_count))
+        except ValueError:
+            return Response(
+                {'error': 'n must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        n = max(1, min(n, self.max_count))
+
+        # Range scan over the (user, due_at) index
+        due = ReviewState.objects.filter(
+            user=request.user, due_at__lte=timezone.now()
+        ).select_related('question').order_by('due_at')[:n]
+        return Response({'results': ReviewStateSerializer(due, many=True).data})
+
+
+class QuestionRecommendedView(APIView):
+    """
+    API endpoint for adaptive practice: questions in ?category= whose rating
+    is nearest the user's (aiming at a 60% success rate), skipping ones they
+    already answered correctly. ?n= sets how many (default 10).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    default_count = 10
+    max_count = 50
+
+    def get(self, request):
+        category = request.query_params.get('category')
+        if category not in dict(Question.CATEGORY_CHOICES):
+            return Response(
+                {'error': 'category must be one of: ' + ', '.join(dict(Question.CATEGORY_CHOICES)) + '.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            n = int(request.query_params.get('n', self.default_count))
+        except ValueError:
+            return Response(
+                {'error': 'n must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        n = max(1, min(n, self.max_count))
+
+        context = {'request': request, 'user_state': True}
+        queryset = annotated_question_queryset(QuestionListSerializer(context=context), request.user, 'rating')
+        questions = recommend(request.user, category, n, queryset)
+        return Response({
+            'rating': get_rating(request.user, category),
+            'results': QuestionListSerializer(questions, many=True, context=context).data,
+        })
+
+
+class UserRatingListView(generics.ListAPIView):
+    """API endpoint for the user's rating in each category they have practiced"""
+    serializer_class = UserCategoryRatingSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
 
     def get_queryset(self):
-        return UserQuestionHistory.objects.filter(user=self.request.user)
+        return self.request.user.category_ratings.all()
 
 
 class BookmarkListCreateView(generics.ListCreateAPIView):
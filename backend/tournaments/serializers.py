@@ -1,3 +1,4 @@
+from django.db.models import Count
 from rest_framework import serializers
 from .models import Tournament, Team, Coach, Player, Room, Round, Game
 
@@ -60,6 +61,10 @@ class TeamSerializer(serializers.ModelSerializer):
     class Meta:
         model = Team
         fields = ['id', 'name', 'school', 'pool', 'players_count', 'coaches_count']
+        projection_annotations = {
+            'players_count': Count('players', distinct=True),
+            'coaches_count': Count('coaches', distinct=True),
+        }
 
     def get_players_count(self, obj):
         return obj.players.count()
@@ -105,6 +110,17 @@ class RoundSerializer(serializers.ModelSerializer):
         fields = ['id', 'round_number', 'name', 'packet_name']
 
 
+def game_winner_name(row):
+    """Game.winner's name from a .values() row"""
+    if not row['is_complete']:
+        return None
+    if row['team1_score'] > row['team2_score']:
+        return row['team1__name']
+    if row['team2_score'] > row['team1_score']:
+        return row['team2__name']
+    return None
+
+
 class GameSerializer(serializers.ModelSerializer):
     """Serializer for games."""
     team1_name = serializers.CharField(source='team1.name', read_only=True)
@@ -124,6 +140,11 @@ class GameSerializer(serializers.ModelSerializer):
             'current_tossup', 'is_complete', 'winner_name',
             'started_at', 'completed_at'
         ]
+        projection_computed = {
+            'winner_name': (game_winner_name, [
+                'is_complete', 'team1_score', 'team2_score', 'team1__name', 'team2__name'
+            ]),
+        }
 
     def get_winner_name(self, obj):
         winner = obj.winner
@@ -0,0 +1 @@
+# Tournaments app tests
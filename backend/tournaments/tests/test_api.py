@@ -0,0 +1,111 @@
+import datetime
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from tournaments.models import Tournament, Team, Player, Room, Round, Game
+
+
+class TournamentConditionalActionTestCase(TestCase):
+    """Test suite for conditional GET on the tournament teams/rooms/rounds/games actions"""
+
+    def setUp(self):
+        """Set up test client and a tournament with a scheduled game"""
+        self.client = APIClient()
+        self.tournament = Tournament.objects.create(
+            name='Regionals',
+            division='HIGH_SCHOOL',
+            format='ROUND_ROBIN',
+            tournament_date=datetime.date(2026, 2, 7),
+            location='Springfield',
+            host_organization='Springfield High',
+        )
+        self.team1, self.team2 = [
+            Team.objects.create(tournament=self.tournament, name=f'Team {i}', school=f'School {i}', pool='A')
+            for i in (1, 2)
+        ]
+        self.room = Room.objects.create(tournament=self.tournament, name='Room 101')
+        self.round = Round.objects.create(tournament=self.tournament, round_number=1, name='Round 1')
+        Game.objects.create(
+            tournament=self.tournament, round=self.round, room=self.room,
+            team1=self.team1, team2=self.team2, pool='A',
+        )
+
+    def _url(self, action):
+        return reverse(f'tournament-{action}', args=[self.tournament.pk])
+
+    def _etag(self, action):
+        response = self.client.get(self._url(action))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response['ETag']
+
+    def _status(self, action, etag):
+        return self.client.get(self._url(action), HTTP_IF_NONE_MATCH=etag).status_code
+
+    def test_actions_not_modified(self):
+        """Test each action answers a matching If-None-Match with 304"""
+        for action in ('teams', 'rooms', 'rounds', 'games'):
+            with self.subTest(action=action):
+                response = self.client.get(self._url(action))
+                self.assertEqual(len(response.data), {'teams': 2}.get(action, 1))
+                self.assertNotIn('Last-Modified', response)
+                etag = response['ETag']
+                with self.assertNumQueries(1):
+                    self.assertEqual(self._status(action, etag), status.HTTP_304_NOT_MODIFIED)
+
+    def test_actions_ignore_if_modified_since(self):
+        """Test If-Modified-Since alone never gets a 304 for a list"""
+        last_modified = self.client.get(reverse('tournament-detail', args=[self.tournament.pk]))['Last-Modified']
+        for action in ('teams', 'rooms', 'rounds', 'games'):
+            with self.subTest(action=action):
+                response = self.client.get(self._url(action), HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_teams_etag_follows_players(self):
+        """Test adding a player changes the teams ETag"""
+        etag = self._etag('teams')
+        Player.objects.create(team=self.team1, name='Ada')
+        self.assertEqual(self._status('teams', etag), status.HTTP_200_OK)
+
+    def test_rooms_etag_follows_edits_and_deletes(self):
+        """Test renaming or deleting a room changes the rooms ETag"""
+        etag = self._etag('rooms')
+        self.room.name = 'Room 102'
+        self.room.save()
+        self.assertEqual(self._status('rooms', etag), status.HTTP_200_OK)
+
+        etag = self._etag('rooms')
+        self.room.delete()
+        self.assertEqual(self._status('rooms', etag), status.HTTP_200_OK)
+
+    def test_rounds_etag_follows_deletes(self):
+        """Test clearing the schedule changes the rounds ETag"""
+        etag = self._etag('rounds')
+        self.client.delete(reverse('tournament-clear-schedule', args=[self.tournament.pk]))
+        response = self.client.get(self._url('rounds'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_games_etag_follows_joined_rows(self):
+        """Test renaming a team changes the games ETag"""
+        etag = self._etag('games')
+        self.team2.name = 'Team Two'
+        self.team2.save()
+        self.assertEqual(self._status('games', etag), status.HTTP_200_OK)
+
+    def test_etag_is_per_tournament(self):
+        """Test another tournament's ETag does not match"""
+        etag = self._etag('rooms')
+        other = Tournament.objects.create(
+            name='State', division='HIGH_SCHOOL', format='ROUND_ROBIN',
+            tournament_date=datetime.date(2026, 3, 7), location='Capital', host_organization='State',
+        )
+        Room.objects.create(tournament=other, name='Room 101')
+        response = self.client.get(reverse('tournament-rooms', args=[other.pk]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_tournament_is_404(self):
+        """Test an unknown tournament still gets a 404"""
+        response = self.client.get(reverse('tournament-rooms', args=[self.tournament.pk + 100]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
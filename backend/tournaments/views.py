@@ -2,7 +2,10 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import transaction
+from django.db.models import Count, Max
 from itertools import combinations
+from backend.conditional import ConditionalGetMixin, conditional_action
+from backend.projection import Projection, ProjectionListMixin
 from .models import Tournament, Team, Coach, Player, Room, Round, Game
 from .serializers import (
     TournamentListSerializer, TournamentDetailSerializer,
@@ -11,10 +14,11 @@ from .serializers import (
 )
 
 
-class TournamentViewSet(viewsets.ReadOnlyModelViewSet):
+class TournamentViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing tournaments.
     List and retrieve operations only (read-only for MVP).
+    Read actions support ETag / Last-Modified conditional requests.
     """
     queryset = Tournament.objects.all()
     permission_classes = [permissions.AllowAny]
@@ -23,6 +27,16 @@ class TournamentViewSet(viewsets.ReadOnlyModelViewSet):
         if self.action == 'list':
             return TournamentListSerializer
         return TournamentDetailSerializer
+
+    def get_conditional_aggregates(self):
+        if self.action == 'retrieve':
+            # The detail payload also reports team/room counts and the director
+            return {
+                'teams_count': Count('teams', distinct=True),
+                'rooms_count': Count('rooms', distinct=True),
+                'director_updated_at': Max('tournament_director__updated_at'),
+            }
+        return {}
     
     def get_queryset(self):
         queryset = Tournament.objects.all()
@@ -41,14 +55,23 @@ class TournamentViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
     
     @action(detail=True, methods=['get'])
+    @conditional_action(
+        lambda view, pk: Team.objects.filter(tournament_id=pk),
+        aggregates={
+            'players_count': Count('players', distinct=True),
+            'coaches_count': Count('coaches', distinct=True),
+            'players_updated_at': Max('players__updated_at'),
+            'coaches_updated_at': Max('coaches__updated_at'),
+        },
+    )
     def teams(self, request, pk=None):
         """Get all teams for a tournament."""
         tournament = self.get_object()
-        teams = tournament.teams.all()
-        serializer = TeamSerializer(teams, many=True)
-        return Response(serializer.data)
+        projection = Projection.for_serializer(TeamSerializer())
+        return Response(projection.serialize(tournament.teams.all()))
     
     @action(detail=True, methods=['get'])
+    @conditional_action(lambda view, pk: Room.objects.filter(tournament_id=pk))
     def rooms(self, request, pk=None):
         """Get all rooms for a tournament."""
         tournament = self.get_object()
@@ -57,6 +80,7 @@ class TournamentViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
+    @conditional_action(lambda view, pk: Round.objects.filter(tournament_id=pk))
     def rounds(self, request, pk=None):
         """Get all rounds for a tournament."""
         tournament = self.get_object()
@@ -65,12 +89,21 @@ class TournamentViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
+    @conditional_action(
+        lambda view, pk: Game.objects.filter(tournament_id=pk),
+        aggregates={
+            # Games are serialized with team, room and round names
+            'team1_updated_at': Max('team1__updated_at'),
+            'team2_updated_at': Max('team2__updated_at'),
+            'room_updated_at': Max('room__updated_at'),
+            'round_updated_at': Max('round__updated_at'),
+        },
+    )
     def games(self, request, pk=None):
         """Get all games for a tournament."""
         tournament = self.get_object()
-        games = tournament.games.all()
-        serializer = GameSerializer(games, many=True)
-        return Response(serializer.data)
+        projection = Projection.for_serializer(GameSerializer())
+        return Response(projection.serialize(tournament.games.all()))
 
     @action(detail=True, methods=['delete'])
     def clear_schedule(self, request, pk=None):
@@ -231,7 +264,7 @@ class TournamentViewSet(viewsets.ReadOnlyModelViewSet):
         }, status=status.HTTP_201_CREATED)
 
 
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(ProjectionListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing teams.
     Supports full CRUD operations.
@@ -287,7 +320,7 @@ class RoomViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.AllowAny]
 
 
-class GameViewSet(viewsets.ModelViewSet):
+class GameViewSet(ProjectionListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing games.
     Allows updating room assignments.